@@ -0,0 +1,371 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import fiscal
+
+# Dataset preparation plus KPI and aggregate queries over the processed dataset,
+# with a pluggable execution engine chosen at startup via SALES_DASHBOARD_ENGINE.
+ENGINE_ENV_VAR = "SALES_DASHBOARD_ENGINE"
+DEFAULT_ENGINE = "pandas"
+ENGINES = ("pandas", "duckdb", "polars")
+
+PROBABILITY_BINS = [0, 25, 50, 75, 100]
+PROBABILITY_LABELS = ["0-25%", "26-50%", "51-75%", "76-100%"]
+DEAL_TYPES = ("pipeline", "won", "all")
+QUARTER_STATUSES = ("Committed for the Month", "Upside for the Month", "Closed Won")
+SEARCH_COLUMNS = ['Organization Name', 'Opportunity Name', 'Sales Owner', 'Sales Stage']
+
+# Column whose values drive the YTD status filter and won flag, first match wins
+STATUS_COLUMNS = ['Status', 'Sales Stage']
+DERIVED_COLUMNS = [
+    'Month', 'Year', 'Quarter', 'Probability_Num', 'Is_Won', 'Amount_Lacs', 'Weighted_Amount',
+    'Status_Won',
+] + fiscal.COLUMNS
+
+
+def engine_name():
+    """Engine requested via the environment: 'pandas' (default), 'duckdb' or 'polars'"""
+    return os.environ.get(ENGINE_ENV_VAR, DEFAULT_ENGINE).strip().lower() or DEFAULT_ENGINE
+
+
+def get_engine(df, key=None):
+    """Return the configured engine bound to a processed DataFrame.
+
+    ``key`` identifies the dataset (e.g. its fingerprint) so engines can reuse
+    per-dataset work such as the DuckDB Arrow registration across reruns.
+    """
+    name = engine_name()
+    if name == "duckdb":
+        import duckdb_backend
+        if duckdb_backend.available():
+            return duckdb_backend.DuckDBEngine(df, key)
+    elif name == "polars":
+        import polars_backend
+        if polars_backend.available():
+            return polars_backend.PolarsEngine(df, key)
+    return PandasEngine(df)
+
+
+def process_data(df):
+    """Add the parsed date, probability and amount columns every page relies on"""
+    if engine_name() == "polars":
+        import polars_backend
+        if polars_backend.available():
+            return polars_backend.process_data(df)
+    return process_data_pandas(df)
+
+
+def resolve_column(df, candidates):
+    """First of ``candidates`` present in ``df``, or None"""
+    return next((column for column in candidates if column in df.columns), None)
+
+
+def prepare_dataset(df):
+    """process_data plus the fields only computed once per upload.
+
+    Status_Won flags won deals by the resolved status column, and the
+    fiscal.COLUMNS place each close date in the April-March fiscal calendar.
+    """
+    df = process_data(df)
+    status_column = resolve_column(df, STATUS_COLUMNS)
+    if status_column == 'Sales Stage':
+        status_won = df['Is_Won']
+    elif status_column is not None:
+        status_won = df[status_column].astype('string').str.contains('Won', case=False, na=False).astype(bool)
+    else:
+        status_won = pd.Series(False, index=df.index)
+    return df.assign(Status_Won=status_won, **fiscal.periods(df['Expected Close Date']))
+
+
+def _convert_probability(x):
+    try:
+        if pd.isna(x):
+            return 0
+        if isinstance(x, str):
+            x = x.rstrip('%')
+        return float(x)
+    except:
+        return 0
+
+
+def process_data_pandas(df):
+    """Reference implementation of process_data"""
+    df = df.copy()
+
+    # Convert dates and calculate time-based columns at once
+    df['Expected Close Date'] = pd.to_datetime(df['Expected Close Date'], format='%d-%m-%Y', errors='coerce')
+    df['Month'] = df['Expected Close Date'].dt.strftime('%B')
+    df['Year'] = df['Expected Close Date'].dt.year
+    df['Quarter'] = df['Expected Close Date'].dt.quarter.map({1: 'Q1', 2: 'Q2', 3: 'Q3', 4: 'Q4'})
+
+    # Convert probability and calculate numeric values at once with safe null handling
+    # astype keeps the column numeric when there are no rows to infer it from
+    df['Probability_Num'] = df['Probability'].apply(_convert_probability).astype(float)
+
+    # Pre-calculate common flags and metrics with safe null handling
+    df['Is_Won'] = df['Sales Stage'].str.contains('Won', case=False, na=False)
+    df['Amount_Lacs'] = df['Amount'].fillna(0).div(100000).round(0).astype(int)
+    df['Weighted_Amount'] = (df['Amount_Lacs'] * df['Probability_Num'] / 100).round(0).astype(int)
+
+    return df
+
+
+def probability_bounds(filters):
+    """(min, max) probability for the Sales Team probability filter"""
+    if filters['probability_filter'] == "Custom Range":
+        prob_range = filters['custom_prob_range'].split("-")
+    else:
+        prob_range = filters['probability_filter'].split("-")
+    return float(prob_range[0]), float(prob_range[1].rstrip("%"))
+
+
+def current_month():
+    return pd.Timestamp.now().strftime('%B')
+
+
+def fill_months(timeline):
+    """Insert zero rows for months without deals so the timeline is continuous"""
+    if timeline.empty:
+        return timeline
+    months = pd.period_range(timeline['Month'].min(), timeline['Month'].max(), freq='M')
+    filled = timeline.set_index('Month').reindex(months, fill_value=0)
+    filled.index.name = 'Month'
+    return filled.reset_index()
+
+
+def _round_half_even(values, decimals=0):
+    return np.round(values.astype(float), decimals)
+
+
+class PandasEngine:
+    """Reference implementation of every aggregate, using pandas groupbys"""
+
+    name = "pandas"
+
+    def __init__(self, df):
+        self.df = df
+
+    def closed_won_amount(self):
+        """Total Closed Won amount in Lakhs"""
+        df = self.df
+        return float(df.loc[df['Is_Won'], 'Amount'].sum() / 100000)
+
+    def filter_mask(self, filters):
+        """Boolean row mask for the Sales Team filters (see filter_spec.sales_team)"""
+        import filter_spec
+        return filter_spec.sales_team(filters).mask(self.df)
+
+    def _select(self, selections):
+        import filter_spec
+        spec = filter_spec.FilterSpec()
+        for column, value in selections.items():
+            spec.equals(column, value)
+        return spec.apply(self.df)
+
+    def quarter_summary(self, selections):
+        """Amount per Quarter Summary status after equality ``selections`` ({column: value})"""
+        df = self._select(selections)
+        amounts = df.groupby('Status')['Amount'].sum()
+        return {status: float(amounts.get(status, 0.0)) for status in QUARTER_STATUSES}
+
+    def ytd_summary(self, selections, won_column=None):
+        """Deal counts and amounts behind the YTD KPI cards; ``won_column`` is a boolean won flag"""
+        df = self._select(selections)
+        if won_column:
+            won = df[won_column].fillna(False).astype(bool)
+        else:
+            won = pd.Series(False, index=df.index)
+        return {
+            'deals': len(df),
+            'amount': float(df['Amount'].sum()),
+            'won_deals': int(won.sum()),
+            'won_amount': float(df.loc[won, 'Amount'].sum()),
+        }
+
+    def team_metrics(self):
+        """Per Sales Owner totals used by the Sales Team KPI cards"""
+        df = self.df[self.df['Sales Owner'].notna()]
+        won = df['Is_Won']
+        grouped = pd.DataFrame({
+            'Sales Owner': df['Sales Owner'],
+            'won_amount': df['Amount'].where(won, 0).fillna(0),
+            'won': won.astype(int),
+            'pipeline_lacs': df['Amount_Lacs'].where(~won, 0),
+            'weighted_lacs': df['Weighted_Amount'].where(~won, 0),
+            'pipeline': (~won).astype(int),
+        }).groupby('Sales Owner', sort=True).sum().reset_index()
+
+        metrics = pd.DataFrame({
+            'Sales Owner': grouped['Sales Owner'],
+            'Closed Won': np.trunc(grouped['won_amount'] / 100000).astype(int),
+            'Closed Deals': grouped['won'].astype(int),
+            'Current Pipeline': grouped['pipeline_lacs'].astype(int),
+            'Weighted Projections': grouped['weighted_lacs'].astype(int),
+            'Pipeline Deals': grouped['pipeline'].astype(int),
+        })
+        total_deals = metrics['Closed Deals'] + metrics['Pipeline Deals']
+        metrics['Win Rate'] = np.where(
+            total_deals > 0,
+            _round_half_even(metrics['Closed Deals'] / total_deals.where(total_deals > 0, 1) * 100),
+            0
+        ).astype(int)
+        return metrics
+
+    def member_performance(self):
+        """Team Member Performance table, sorted by current pipeline"""
+        df = self.df[self.df['Sales Owner'].notna()]
+        won = df['Is_Won']
+        amount = df['Amount'].fillna(0)
+        grouped = pd.DataFrame({
+            'Sales Owner': df['Sales Owner'],
+            'won_amount': amount.where(won, 0),
+            'won': won.astype(int),
+            'pipeline_amount': amount.where(~won, 0),
+            'weighted_amount': (amount * df['Probability_Num'] / 100).where(~won, 0),
+            'pipeline': (~won).astype(int),
+        }).groupby('Sales Owner', sort=True).sum().reset_index()
+
+        metrics = pd.DataFrame({
+            'Sales Owner': grouped['Sales Owner'],
+            'Closed Won': _round_half_even(grouped['won_amount'] / 100000, 1),
+            'Closed Deals': grouped['won'].astype(int),
+            'Current Pipeline': _round_half_even(grouped['pipeline_amount'] / 100000, 1),
+            'Weighted Projections': _round_half_even(grouped['weighted_amount'] / 100000, 1),
+            'Pipeline Deals': grouped['pipeline'].astype(int),
+        })
+        total_deals = metrics['Closed Deals'] + metrics['Pipeline Deals']
+        metrics['Win Rate'] = _round_half_even(
+            metrics['Closed Deals'] / total_deals.where(total_deals > 0) * 100, 1
+        ).fillna(0)
+        return metrics.sort_values(
+            ['Current Pipeline', 'Sales Owner'], ascending=[False, True], kind='mergesort'
+        ).reset_index(drop=True)
+
+    def practice_metrics(self, practice=None):
+        """Closed and pipeline totals per Practice, optionally for a single practice"""
+        df = self.df[self.df['Practice'].notna()]
+        if practice is not None:
+            df = df[df['Practice'] == practice]
+        won = df['Is_Won']
+        amount = df['Amount'].fillna(0)
+        grouped = pd.DataFrame({
+            'Practice': df['Practice'],
+            'won_amount': amount.where(won, 0),
+            'won': won.astype(int),
+            'pipeline_amount': amount.where(~won, 0),
+            'pipeline': (~won).astype(int),
+        }).groupby('Practice', sort=True).sum().reset_index()
+
+        metrics = pd.DataFrame({
+            'Practice': grouped['Practice'],
+            'Closed Amount': grouped['won_amount'] / 100000,
+            'Closed Deals': grouped['won'].astype(int),
+            'Total Pipeline': grouped['pipeline_amount'] / 100000,
+            'Pipeline Deals': grouped['pipeline'].astype(int),
+        })
+        return metrics.sort_values(
+            ['Total Pipeline', 'Practice'], ascending=[False, True], kind='mergesort'
+        ).reset_index(drop=True)
+
+    def focus_metrics(self):
+        """Amount, deal counts and share per KritiKal Focus Area"""
+        df = self.df[self.df['KritiKal Focus Areas'].notna()]
+        grouped = pd.DataFrame({
+            'Focus Area': df['KritiKal Focus Areas'],
+            'amount': df['Amount'].fillna(0),
+            'won': df['Is_Won'].astype(int),
+            'deals': 1,
+        }).groupby('Focus Area', sort=True).sum().reset_index()
+
+        metrics = pd.DataFrame({
+            'Focus Area': grouped['Focus Area'],
+            'Total Amount': grouped['amount'] / 100000,
+            'Closed Deals': grouped['won'].astype(int),
+            'Total Deals': grouped['deals'].astype(int),
+        })
+        total = metrics['Total Amount'].sum()
+        metrics['Share %'] = _round_half_even(metrics['Total Amount'] / total * 100, 1) if total else 0.0
+        return metrics.sort_values(
+            ['Total Amount', 'Focus Area'], ascending=[False, True], kind='mergesort'
+        ).reset_index(drop=True)
+
+    def monthly_trend(self, deal_type="pipeline"):
+        """Amount (Lakhs) and deal count per close month for pipeline, won or all deals"""
+        df = self.df[self.df['Expected Close Date'].notna()]
+        if deal_type == "pipeline":
+            df = df[~df['Is_Won']]
+        elif deal_type == "won":
+            df = df[df['Is_Won']]
+        monthly = df.groupby(df['Expected Close Date'].dt.to_period('M')).agg(
+            Amount=('Amount', 'sum'),
+            Deals=('Sales Stage', 'count'),
+        ).reset_index()
+        return pd.DataFrame({
+            'Month': monthly['Expected Close Date'].astype(str),
+            'Amount': monthly['Amount'] / 100000,
+            'Deals': monthly['Deals'].astype(int),
+        })
+
+    def pipeline_summary(self, probability_range, amount_range):
+        """Stage counts, amount per probability band and monthly timeline for the sliders"""
+        df = self.df
+        mask = (
+            df['Probability_Num'].between(probability_range[0], probability_range[1]) &
+            df['Amount'].between(amount_range[0] * 100000, amount_range[1] * 100000)
+        )
+        df = df[mask]
+
+        stages = df['Sales Stage'].value_counts().rename_axis('Sales Stage').reset_index(name='Deals')
+        stages = stages.sort_values(
+            ['Deals', 'Sales Stage'], ascending=[False, True], kind='mergesort'
+        ).reset_index(drop=True)
+
+        bands = pd.cut(df['Probability_Num'], bins=PROBABILITY_BINS, labels=PROBABILITY_LABELS)
+        probability = df.groupby(bands, observed=False)['Amount'].sum().reindex(PROBABILITY_LABELS, fill_value=0)
+        probability = pd.DataFrame({'Band': PROBABILITY_LABELS, 'Amount': probability.to_numpy() / 100000})
+
+        dated = df[df['Expected Close Date'].notna()]
+        timeline = dated.groupby(dated['Expected Close Date'].dt.to_period('M'))['Amount'].sum()
+        timeline = pd.DataFrame({'Month': timeline.index, 'Amount': timeline.to_numpy() / 100000})
+        return stages, probability, fill_months(timeline)
+
+
+def compare_engines(df, other, probability_range=(0, 100), amount_range=None, filters=None):
+    """Run every aggregate on the pandas engine and ``other``; return mismatching names"""
+    reference = PandasEngine(df)
+    if amount_range is None:
+        amounts = df['Amount'].dropna()
+        amount_range = (int(amounts.min() / 100000), int(amounts.max() / 100000)) if len(amounts) else (0, 0)
+
+    checks = {
+        'closed_won_amount': lambda engine: pd.DataFrame({'value': [engine.closed_won_amount()]}),
+        'team_metrics': lambda engine: engine.team_metrics(),
+        'member_performance': lambda engine: engine.member_performance(),
+        'quarter_summary': lambda engine: pd.DataFrame([engine.quarter_summary({})]),
+        'ytd_summary': lambda engine: pd.DataFrame([engine.ytd_summary({}, 'Is_Won')]),
+    }
+    # Pages only ask for the practice and focus aggregates when the upload has those columns
+    if 'Practice' in df.columns:
+        checks['practice_metrics'] = lambda engine: engine.practice_metrics()
+    if 'KritiKal Focus Areas' in df.columns:
+        checks['focus_metrics'] = lambda engine: engine.focus_metrics()
+    if filters is not None:
+        checks['filter_mask'] = lambda engine: pd.DataFrame({'mask': engine.filter_mask(filters)})
+    for deal_type in DEAL_TYPES:
+        checks[f'monthly_trend[{deal_type}]'] = lambda engine, t=deal_type: engine.monthly_trend(t)
+    for i, name in enumerate(['stages', 'probability', 'timeline']):
+        checks[f'pipeline_summary.{name}'] = (
+            lambda engine, i=i: engine.pipeline_summary(probability_range, amount_range)[i]
+        )
+
+    mismatches = []
+    for name, run in checks.items():
+        expected = run(reference).reset_index(drop=True)
+        actual = run(other).reset_index(drop=True)
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_exact=False)
+        except AssertionError:
+            mismatches.append(name)
+    return mismatches
@@ -0,0 +1,85 @@
+"""Summarise the dashboard's performance event log.
+
+Usage:
+    python analyze_perf_log.py [logs/perf_events.jsonl] [--stages]
+
+Reads the log and its rotated backups (.1, .2, ...) and prints p50/p95/p99
+rerun latency per page and per dataset size.
+"""
+import argparse
+import glob
+import json
+import sys
+
+import pandas as pd
+
+from perf_log import DEFAULT_LOG_PATH
+
+SIZE_BUCKETS = [0, 1_000, 10_000, 100_000, 1_000_000, float("inf")]
+SIZE_LABELS = ["<1k", "1k-10k", "10k-100k", "100k-1M", ">=1M"]
+
+
+def load_events(path):
+    """Load every event from the log file and its rotated backups"""
+    events = []
+    for file_name in sorted(glob.glob(path + ".*")) + [path]:
+        try:
+            with open(file_name, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            continue
+    return pd.DataFrame(events)
+
+
+def latency_table(events, by):
+    """p50/p95/p99 of total rerun time grouped by ``by``"""
+    grouped = events.groupby(by, observed=True)['total_ms']
+    table = grouped.quantile([0.5, 0.95, 0.99]).unstack()
+    table.columns = ['p50 (ms)', 'p95 (ms)', 'p99 (ms)']
+    table.insert(0, 'Reruns', grouped.size())
+    return table.round(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default=DEFAULT_LOG_PATH)
+    parser.add_argument("--stages", action="store_true", help="also report per-stage latency")
+    args = parser.parse_args(argv)
+
+    events = load_events(args.path)
+    if events.empty:
+        print(f"No events found in {args.path}")
+        return 1
+
+    events['page'] = events['page'].fillna('(none)')
+    current_rows = events['rows'].apply(lambda rows: (rows or {}).get('df_current', 0))
+    events['dataset_size'] = pd.cut(current_rows, SIZE_BUCKETS, labels=SIZE_LABELS, right=False)
+
+    print(f"{len(events):,} reruns from {events['session'].nunique()} sessions\n")
+    print("Latency per page")
+    print(latency_table(events, 'page').to_string())
+    print("\nLatency per dataset size (current week rows)")
+    print(latency_table(events, 'dataset_size').to_string())
+    print("\nLatency per page and dataset size")
+    print(latency_table(events, ['page', 'dataset_size']).to_string())
+
+    if args.stages:
+        stages = events[['page', 'stages']].copy()
+        stages['stages'] = stages['stages'].apply(lambda s: list((s or {}).items()))
+        stages = stages.explode('stages').dropna(subset=['stages'])
+        stages['stage'] = stages['stages'].str[0]
+        stages['total_ms'] = stages['stages'].str[1].astype(float)
+        print("\nLatency per stage")
+        print(latency_table(stages, 'stage').sort_values('p95 (ms)', ascending=False).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
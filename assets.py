@@ -0,0 +1,85 @@
+"""Stylesheets served as static files instead of inline <style> blocks.
+
+Usage:
+    python assets.py
+
+prints, for each stylesheet, the bytes a rerun sends with the sheet inlined and
+with it linked.
+"""
+import hashlib
+import os
+import threading
+
+import streamlit as st
+
+# Streamlit serves ./static next to the main script at app/static when
+# server.enableStaticServing is on (see .streamlit/config.toml). Each link
+# carries a hash of the file's contents as ?v=, so browsers keep a sheet in
+# their cache until it changes; reruns then send a one-line <link> tag instead
+# of the whole sheet. With static serving off, sheets are inlined as before.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+
+_lock = threading.Lock()
+_versions = {}
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def version(name):
+    """Short hash of a static file's contents, recomputed only when the file changes"""
+    path = os.path.join(STATIC_DIR, name)
+    stamp = _stamp(path)
+    with _lock:
+        cached = _versions.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:10]
+    with _lock:
+        _versions[name] = (stamp, digest)
+    return digest
+
+
+def url(name):
+    return f"{STATIC_URL}/{name}?v={version(name)}"
+
+
+def static_serving():
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def link_tag(name):
+    return f'<link rel="stylesheet" href="{url(name)}">'
+
+
+def inline_tag(name):
+    with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+
+def stylesheet(*names):
+    """Apply static/``names`` to the page in one element: linked when static serving is on, inlined otherwise"""
+    if not names:
+        return
+    tag = link_tag if static_serving() else inline_tag
+    st.markdown("\n".join(tag(name) for name in names), unsafe_allow_html=True)
+
+
+def main():
+    names = sorted(name for name in os.listdir(STATIC_DIR) if name.endswith(".css"))
+    print(f"{'Stylesheet':<24}{'Inline (B)':>12}{'Linked (B)':>12}")
+    for name in names:
+        inline = len(inline_tag(name).encode("utf-8"))
+        linked = len(link_tag(name).encode("utf-8"))
+        print(f"{name:<24}{inline:>12,}{linked:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,19 @@ import streamlit as st
 import pandas as pd
 import hashlib
 from typing import Optional, Dict, Any
+import hmac
 import json
 import os
 import random
+import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import assets
+import lite
+import perf_log
+import rate_limit
 
 def init_session_state():
     """Initialize session state variables"""
@@ -13,21 +22,9 @@ def init_session_state():
         st.session_state.is_logged_in = False
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
-    if 'login_attempts' not in st.session_state:
-        st.session_state.login_attempts = 0
-    if 'last_attempt' not in st.session_state:
-        st.session_state.last_attempt = 0
-    if 'locked_until' not in st.session_state:
-        st.session_state.locked_until = 0
 
 def check_password():
     """Check if the password is correct"""
-    # Check if account is locked
-    if st.session_state.locked_until > time.time():
-        remaining_time = int(st.session_state.locked_until - time.time())
-        st.error(f"Account locked. Please try again in {remaining_time} seconds.")
-        return False
-
     # Get username and password from session state
     username = st.session_state.get('login_username', '')
     password = st.session_state.get('login_password', '')
@@ -37,247 +34,237 @@ def check_password():
         st.error("Please enter both username and password")
         return False
 
-    # Check credentials (for demo purposes, using admin/admin123)
-    if username == "admin" and password == "admin123":
+    # Attempts are limited per username and client across every session (see
+    # rate_limit.py), then checked against users.json on the verification pool
+    try:
+        valid = verify_credentials(username, password)
+    except LoginBusy as e:
+        st.warning(str(e))
+        return False
+
+    if valid:
         st.session_state.is_logged_in = True
         st.session_state.authenticated = True
-        st.session_state.login_attempts = 0
-        st.session_state.last_attempt = 0
-        st.session_state.locked_until = 0
+        st.session_state.username = username
         return True
     else:
-        # Increment login attempts
-        st.session_state.login_attempts += 1
-        st.session_state.last_attempt = time.time()
-        
-        # Check if account should be locked
-        if st.session_state.login_attempts >= 3:
-            st.session_state.locked_until = time.time() + 300  # Lock for 5 minutes
-            st.error("Too many failed attempts. Account locked for 5 minutes.")
-        else:
-            st.error("Invalid username or password")
-        
+        st.error("Invalid username or password")
         return False
 
+USERS_FILE = 'users.json'
+
+
+class UserStore:
+    """users.json held in memory and re-read only when the file's mtime or size changes.
+
+    Lookups are dict lookups; writes go to a temporary file that atomically
+    replaces users.json, so readers never see a half-written file.
+    """
+
+    def __init__(self, path: str = USERS_FILE):
+        self.path = path
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._stamp = None
+        self._lock = threading.RLock()
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def users(self) -> Dict[str, Dict[str, Any]]:
+        """Every user record by username; treat the result as read-only"""
+        stamp = self._file_stamp()
+        if stamp is not None and stamp == self._stamp:
+            return self._users
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp is None:
+                # Create default admin user if file doesn't exist
+                self._write({
+                    "admin": {
+                        "password": hash_password("admin123"),
+                        "role": "admin"
+                    }
+                })
+            elif stamp != self._stamp:
+                try:
+                    with open(self.path, 'r') as f:
+                        self._users = json.load(f)
+                except ValueError:
+                    # A hand-edited file that doesn't parse keeps the last good copy
+                    if not self._users:
+                        raise
+                self._stamp = stamp
+            return self._users
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        return self.users().get(username)
+
+    def _write(self, users: Dict[str, Dict[str, Any]]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix='.users-', suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(users, f, indent=4)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._users = users
+        self._stamp = self._file_stamp()
+
+    def save(self, users: Dict[str, Dict[str, Any]]):
+        """Replace every user record"""
+        with self._lock:
+            self._write(dict(users))
+
+    def set_user(self, username: str, record: Dict[str, Any]):
+        """Add or replace one user record"""
+        with self._lock:
+            users = dict(self.users())
+            users[username] = record
+            self._write(users)
+
+
+@st.cache_resource
+def get_user_store(path: str = USERS_FILE) -> UserStore:
+    """The UserStore shared by every session of this process"""
+    return UserStore(path)
+
+
 # Load users from JSON file
 def load_users():
-    try:
-        with open('users.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Create default admin user if file doesn't exist
-        default_users = {
-            "admin": {
-                "password": hashlib.sha256("admin123".encode()).hexdigest(),
-                "role": "admin"
-            }
-        }
-        with open('users.json', 'w') as f:
-            json.dump(default_users, f, indent=4)
-        return default_users
+    return get_user_store().users()
 
 def verify_password(username, password):
-    users = load_users()
-    if username in users:
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        return hashed_password == users[username]["password"]
+    user = get_user_store().get(username)
+    if user is not None:
+        return hmac.compare_digest(hash_password(password), user["password"])
     return False
 
+VERIFY_WORKERS = 2
+MAX_PENDING_VERIFICATIONS = 32
+VERIFY_TIMEOUT = 10  # seconds
+
+
+class LoginBusy(RuntimeError):
+    """Too many sign-ins are waiting for verification"""
+
+
+class PasswordVerifier:
+    """Runs verify_password on a small worker pool with a bounded queue.
+
+    Password hashing is CPU-bound (and will get slower with a memory-hard
+    KDF); keeping it on VERIFY_WORKERS threads means a burst of sign-ins can't
+    take CPU from script threads rerunning dashboards for signed-in users.
+    """
+
+    def __init__(self, workers=VERIFY_WORKERS, max_pending=MAX_PENDING_VERIFICATIONS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="verify")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {'verified': 0, 'rejected': 0, 'timeouts': 0, 'pending': 0,
+                       'wait_ms': 0.0, 'verify_ms': 0.0, 'max_verify_ms': 0.0}
+
+    def submit(self, username, password) -> Future:
+        """Future of verify_password; raises LoginBusy when the queue is full"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise LoginBusy("Too many sign-ins in progress, please try again in a moment")
+        with self._lock:
+            self._stats['pending'] += 1
+        future = self._executor.submit(self._run, username, password, time.perf_counter())
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        with self._lock:
+            self._stats['pending'] -= 1
+        self._slots.release()
+
+    def _run(self, username, password, queued):
+        started = time.perf_counter()
+        try:
+            return verify_password(username, password)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._stats['verified'] += 1
+                self._stats['wait_ms'] += (started - queued) * 1000
+                self._stats['verify_ms'] += (finished - started) * 1000
+                self._stats['max_verify_ms'] = max(self._stats['max_verify_ms'], (finished - started) * 1000)
+
+    def record_timeout(self):
+        with self._lock:
+            self._stats['timeouts'] += 1
+
+    def stats(self):
+        """Counts plus average queue wait and verification time in milliseconds"""
+        with self._lock:
+            stats = dict(self._stats)
+        verified = stats.pop('verified')
+        wait_ms, verify_ms = stats.pop('wait_ms'), stats.pop('verify_ms')
+        stats.update(
+            verified=verified,
+            avg_wait_ms=wait_ms / verified if verified else 0.0,
+            avg_verify_ms=verify_ms / verified if verified else 0.0,
+        )
+        return stats
+
+
+@st.cache_resource
+def get_verifier() -> PasswordVerifier:
+    """The PasswordVerifier shared by every session of this process"""
+    return PasswordVerifier()
+
+
+perf_log.register_stats("login", "verify", lambda: get_verifier().stats())
+
+
+class TooManyAttempts(LoginBusy):
+    """This username and client have used up their sign-in attempts for now"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Too many sign-in attempts. Please try again in {int(retry_after) + 1} seconds.")
+
+
+def verify_credentials(username, password, timeout=VERIFY_TIMEOUT) -> bool:
+    """verify_password on the shared worker pool, after the shared sign-in rate limit.
+
+    Raises TooManyAttempts before any hashing when the username and client are
+    over the limit, and LoginBusy when sign-ins are backed up.
+    """
+    limiter = rate_limit.get_limiter()
+    client = rate_limit.client_address()
+    retry_after = limiter.attempt(username, client)
+    if retry_after:
+        raise TooManyAttempts(retry_after)
+
+    verifier = get_verifier()
+    future = verifier.submit(username, password)
+    try:
+        valid = future.result(timeout)
+    except FutureTimeout:
+        verifier.record_timeout()
+        raise LoginBusy("Sign-in is taking longer than usual, please try again") from None
+    if valid:
+        limiter.succeeded(username, client)
+    return valid
+
 def show_login_page():
     """Display the login page with username and password fields"""
     # Hide sidebar and main menu
-    st.markdown("""
-        <style>
-            section[data-testid="stSidebar"] {display: none !important;}
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            
-            /* Override Streamlit defaults */
-            .stApp {
-                background: #0B0B1E !important;
-            }
-            
-            .block-container {
-                padding: 0 !important;
-                max-width: 100% !important;
-            }
-
-            /* Custom styles for form elements */
-            [data-testid="stTextInput"] > div > div > input {
-                background-color: rgba(0, 0, 0, 0.5) !important;
-                border: 2px solid #00F5FF !important;
-                border-radius: 25px !important;
-                color: #00F5FF !important;
-                font-size: 1em !important;
-                padding: 12px 25px !important;
-                font-family: 'Orbitron', sans-serif !important;
-                box-shadow: 0 0 10px rgba(0, 245, 255, 0.3) !important;
-                margin-bottom: 15px !important;
-                width: 100% !important;
-            }
-
-            [data-testid="stTextInput"] > div > div > input:focus {
-                border-color: #00F5FF !important;
-                box-shadow: 0 0 20px rgba(0, 245, 255, 0.5) !important;
-            }
-
-            [data-testid="stTextInput"] > div > div > input::placeholder {
-                color: rgba(0, 245, 255, 0.5) !important;
-            }
-
-            [data-testid="stButton"] > button {
-                width: 100% !important;
-                background: linear-gradient(90deg, #00F5FF, #FF00FF) !important;
-                color: white !important;
-                font-weight: 600 !important;
-                padding: 12px !important;
-                font-size: 1.1em !important;
-                border-radius: 25px !important;
-                border: none !important;
-                transition: all 0.3s ease !important;
-                font-family: 'Orbitron', sans-serif !important;
-                text-transform: uppercase !important;
-                letter-spacing: 2px !important;
-                margin-top: 20px !important;
-            }
-
-            [data-testid="stButton"] > button:hover {
-                transform: translateY(-2px) !important;
-                box-shadow: 0 0 30px rgba(0, 245, 255, 0.5) !important;
-            }
-
-            /* Base layout */
-            .main {
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                padding: 20px;
-                font-family: 'Orbitron', sans-serif;
-            }
-
-            /* Container and login box */
-            .container {
-                width: 100%;
-                max-width: 400px;
-                margin: 0 auto;
-                position: relative;
-                z-index: 1;
-            }
-
-            .login-box {
-                background: rgba(0, 0, 0, 0.8);
-                border-radius: 25px;
-                padding: 40px;
-                box-shadow: 0 0 50px rgba(0, 245, 255, 0.3);
-                border: 2px solid #00F5FF;
-            }
-
-            /* Title and subtitle */
-            .login-box h1 {
-                color: #00F5FF;
-                text-align: center;
-                margin-bottom: 10px;
-                font-size: 2.5em;
-                font-weight: 700;
-                text-shadow: 0 0 10px rgba(0, 245, 255, 0.5);
-                font-family: 'Orbitron', sans-serif;
-            }
-
-            .login-box p {
-                color: rgba(0, 245, 255, 0.7);
-                text-align: center;
-                margin-bottom: 30px;
-                font-size: 1.1em;
-            }
-
-            /* Form elements */
-            .form-group {
-                margin-bottom: 20px;
-            }
-
-            .form-group label {
-                display: block;
-                color: #00F5FF;
-                margin-bottom: 8px;
-                font-size: 0.9em;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-
-            /* Remember me and Forgot password */
-            .options {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-top: 20px;
-                color: #00F5FF;
-                font-size: 0.9em;
-            }
-
-            .remember-me {
-                display: flex;
-                align-items: center;
-                gap: 5px;
-            }
-
-            .remember-me input[type="checkbox"] {
-                accent-color: #00F5FF;
-            }
-
-            .forgot-password {
-                color: #00F5FF;
-                text-decoration: none;
-                transition: all 0.3s ease;
-            }
-
-            .forgot-password:hover {
-                text-shadow: 0 0 10px rgba(0, 245, 255, 0.5);
-            }
-
-            /* Particles */
-            .particles {
-                position: fixed;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                z-index: 0;
-                pointer-events: none;
-            }
-
-            .particle {
-                position: fixed;
-                width: 5px;
-                height: 5px;
-                border-radius: 50%;
-                animation: particle-animation 20s infinite linear;
-            }
-
-            @keyframes particle-animation {
-                0% {
-                    transform: translateY(100vh) translateX(0) scale(0);
-                    opacity: 0;
-                }
-                50% {
-                    opacity: 1;
-                }
-                100% {
-                    transform: translateY(-100vh) translateX(100px) scale(1);
-                    opacity: 0;
-                }
-            }
-
-            /* Generate multiple particles with different colors */
-            .particle:nth-child(3n) { background: #00F5FF; }
-            .particle:nth-child(3n+1) { background: #FF00FF; }
-            .particle:nth-child(3n+2) { background: #FFD700; }
-        </style>
-    """, unsafe_allow_html=True)
+    assets.stylesheet("login.css", *lite.stylesheets())
 
-    # Generate particles HTML
+    # Generate particles HTML (none in lite mode)
     particles_html = ""
-    for i in range(30):
+    for i in range(0 if lite.enabled() else 30):
         left = random.randint(0, 100)
         delay = random.randint(0, 20)
         duration = random.randint(15, 25)
@@ -0,0 +1,134 @@
+"""Benchmark the dashboard's compute engines on synthetic data.
+
+Usage:
+    python bench_engines.py [--rows 100000 1000000] [--repeat 5]
+
+Times process_data, the Sales Team filters, team metrics and the YTD/Quarter
+Summary aggregates on every installed engine, and checks each engine's
+results against the pandas engine.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import fiscal
+
+OWNERS = [f"Owner {i}" for i in range(40)]
+PRACTICES = ["AI", "Embedded", "Cloud", "Vision", "IoT", None]
+STAGES = ["Prospecting", "Qualification", "Proposal", "Negotiation", "Closed Won", "Closed Lost"]
+STATUSES = list(analytics.QUARTER_STATUSES) + ["Pipeline"]
+FOCUS_AREAS = ["Retail", "Health", "Automotive", "Defence", None]
+
+FILTERS = {
+    'selected_member': OWNERS[3],
+    'search': 'opp 1',
+    'practices': ['AI', 'Cloud'],
+    'month_filter': 'All Months',
+    'quarter_filter': 2,
+    'year_filter': 'All Years',
+    'probability_filter': '26-50%',
+    'status_filter': 'All Status',
+    'focus_filter': 'All Focus',
+}
+
+
+def make_dataset(rows, seed=0):
+    """Raw workbook-shaped frame with text dates and mixed probability values"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2024-04-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D")
+    probability = rng.choice([10, 25, 33, 50, 75, 90, 100], rows)
+    df = pd.DataFrame({
+        "Organization Name": [f"Org {i % 5000}" for i in range(rows)],
+        "Opportunity Name": [f"Opp {i}" for i in range(rows)],
+        "Geography": rng.choice(["India", "US", "EU", "APAC"], rows),
+        "Expected Close Date": dates.strftime('%d-%m-%Y'),
+        "Probability": [f"{p}%" for p in probability],
+        "Amount": rng.integers(1, 500, rows) * 100000.0 + rng.choice([0, 55000], rows),
+        "Sales Stage": rng.choice(STAGES, rows),
+        "Practice": rng.choice(PRACTICES, rows),
+        "Sales Owner": rng.choice(OWNERS, rows),
+        "Type": rng.choice(["Hunting", "Farming"], rows),
+        "KritiKal Focus Areas": rng.choice(FOCUS_AREAS, rows),
+        "Status": rng.choice(STATUSES, rows),
+    })
+    df.loc[rng.random(rows) < 0.02, "Amount"] = np.nan
+    return df
+
+
+def engines():
+    """(name, process_data, engine factory) for every installed engine"""
+    found = [("pandas", analytics.process_data_pandas, analytics.PandasEngine)]
+    try:
+        import polars_backend
+        if polars_backend.available():
+            found.append(("polars", polars_backend.process_data, polars_backend.PolarsEngine))
+    except ImportError:
+        pass
+    try:
+        import duckdb_backend
+        if duckdb_backend.available():
+            found.append(("duckdb", analytics.process_data_pandas, duckdb_backend.DuckDBEngine))
+    except ImportError:
+        pass
+    return found
+
+
+def timed(func, repeat):
+    """Median wall time in ms over ``repeat`` runs, and the last result"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        raw = make_dataset(rows)
+        reference = analytics.process_data_pandas(raw)
+        # Fiscal periods are added at ingest on top of process_data, whatever the engine
+        periods = fiscal.periods(reference['Expected Close Date'])
+        for name, process, factory in engines():
+            ms, processed = timed(lambda: process(raw), args.repeat)
+            results.append({'Rows': rows, 'Engine': name, 'Stage': 'process_data', 'Median (ms)': ms})
+            pd.testing.assert_frame_equal(reference, processed, check_dtype=False)
+
+            engine = factory(processed.assign(**periods))
+            stages = {
+                'filter_mask': lambda: engine.filter_mask(FILTERS),
+                'team_metrics': engine.team_metrics,
+                'quarter_summary': lambda: engine.quarter_summary({'Fiscal_Quarter': 2}),
+                'ytd_summary': lambda: engine.ytd_summary({'Geography': 'US'}, 'Is_Won'),
+            }
+            for stage, func in stages.items():
+                ms, _ = timed(func, args.repeat)
+                results.append({'Rows': rows, 'Engine': name, 'Stage': stage, 'Median (ms)': ms})
+
+            mismatches = analytics.compare_engines(reference.assign(**periods), engine, filters=FILTERS)
+            if mismatches:
+                print(f"{name} differs from pandas at {rows:,} rows: {', '.join(mismatches)}")
+
+    table = pd.DataFrame(results).pivot_table(
+        index=['Rows', 'Stage'], columns='Engine', values='Median (ms)', sort=False
+    )
+    for name in table.columns:
+        if name != 'pandas':
+            table[f'{name} speedup'] = table['pandas'] / table[name]
+    print(table.round(2).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
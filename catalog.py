@@ -0,0 +1,92 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import fiscal
+
+# Columns behind the filter dropdowns; their catalogs are built together the
+# first time a dataset's catalog is used, other columns on first request.
+DIMENSIONS = [
+    'Sales Owner', 'Practice', 'Geography', 'Type', 'Status', 'Sales Stage',
+    'KritiKal Focus Areas', 'Year', 'Quarter', 'Month', 'Fiscal_Year', 'Fiscal_Quarter',
+]
+
+
+class Dimension:
+    """Sorted distinct values of one column, their row counts and a per-row code array.
+
+    ``codes[i]`` is the position of row i's value in ``values`` (-1 for missing),
+    so later filters and counts can work on small integers instead of the column.
+    """
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, sort=True)
+        self._set(codes, uniques.tolist())
+
+    @classmethod
+    def from_codes(cls, codes, values):
+        """Dimension over codes already factorized against the sorted ``values``"""
+        dimension = cls.__new__(cls)
+        dimension._set(np.asarray(codes), list(values))
+        return dimension
+
+    def _set(self, codes, values):
+        self.codes = codes.astype(np.int32)
+        # Whole-number floats (years parsed next to NaT) read better as ints
+        if values and all(isinstance(v, float) and v.is_integer() for v in values):
+            values = [int(v) for v in values]
+        self.values = values
+        self.counts = np.bincount(self.codes[self.codes >= 0], minlength=len(values))
+        self._positions = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def position(self, value):
+        """Code of ``value``, or -1 if it never occurs"""
+        if self._positions is None:
+            self._positions = {v: i for i, v in enumerate(self.values)}
+        return self._positions.get(value, -1)
+
+    def count(self, value):
+        position = self.position(value)
+        return int(self.counts[position]) if position >= 0 else 0
+
+
+class DimensionCatalog:
+    """Dimension per column of one processed frame, each computed once.
+
+    ``dimensions`` seeds the catalog with Dimensions the caller already has.
+    """
+
+    def __init__(self, df, dimensions=None):
+        self.df = df
+        self._dimensions = dict(dimensions or {})
+        self._lock = threading.Lock()
+        self._built = False
+
+    def _build(self, column):
+        if column not in self.df.columns:
+            # Optional columns absent from the upload: every row is missing (code -1)
+            return Dimension(pd.Series(index=self.df.index, dtype=object))
+        return Dimension(self.df[column])
+
+    def __getitem__(self, column):
+        with self._lock:
+            if not self._built:
+                for name in DIMENSIONS:
+                    self._dimensions.setdefault(name, self._build(name))
+                self._built = True
+            if column not in self._dimensions:
+                self._dimensions[column] = self._build(column)
+            return self._dimensions[column]
+
+    def options(self, column):
+        """Sorted distinct non-null values of ``column``"""
+        return self[column].values
+
+    def months(self):
+        """Month names present in the data, in fiscal-year order"""
+        present = set(self['Month'].values)
+        return [month for month in fiscal.MONTHS if month in present]
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Linked selection on the Overview page: clicking practices in the practice
+# charts filters the Focus Areas and Monthly Pipeline Trend charts. Deals are
+# pre-aggregated once per dataset into a practice x focus area x close month x
+# won table, so a new selection re-aggregates table cells instead of deals.
+UNDATED = np.iinfo(np.int64).min
+
+
+class CrossFilter:
+    """Amount and deal counts per (practice, focus area, close month, won) cell"""
+
+    def __init__(self, df, catalog):
+        self.practices = catalog['Practice'].values
+        self.focus_areas = catalog['KritiKal Focus Areas'].values
+        dates = df['Expected Close Date']
+        # Close month as a pandas monthly period ordinal; UNDATED for missing dates
+        month = np.where(
+            dates.notna(), ((dates.dt.year - 1970) * 12 + dates.dt.month - 1).to_numpy(dtype=float), UNDATED
+        ).astype(np.int64)
+        cells = pd.DataFrame({
+            'practice': catalog['Practice'].codes,
+            'focus': catalog['KritiKal Focus Areas'].codes,
+            'month': month,
+            'won': df['Is_Won'].to_numpy(dtype=bool),
+            'amount': df['Amount'].fillna(0).to_numpy(dtype=float),
+            'deals': 1,
+            'staged': df['Sales Stage'].notna().to_numpy(dtype=int),
+        }).groupby(['practice', 'focus', 'month', 'won'], sort=False).sum().reset_index()
+
+        self.practice = cells['practice'].to_numpy()
+        self.focus = cells['focus'].to_numpy()
+        self.month = cells['month'].to_numpy()
+        self.won = cells['won'].to_numpy()
+        self.amount = cells['amount'].to_numpy()
+        self.deals = cells['deals'].to_numpy()
+        self.staged = cells['staged'].to_numpy()
+
+    def __len__(self):
+        return len(self.amount)
+
+    def _practice_mask(self, practices):
+        if practices is None:
+            return np.ones(len(self), dtype=bool)
+        # The trailing slot is read by deals without a practice (code -1)
+        selected = np.append(np.isin(np.asarray(self.practices, dtype=object), list(practices)), False)
+        return selected[self.practice]
+
+    def focus_metrics(self, practices=None):
+        """PandasEngine.focus_metrics over the deals of ``practices`` (all when None)"""
+        keep = self._practice_mask(practices) & (self.focus >= 0)
+        codes = self.focus[keep]
+        size = len(self.focus_areas)
+        deals = np.bincount(codes, self.deals[keep], minlength=size)
+        metrics = pd.DataFrame({
+            'Focus Area': self.focus_areas,
+            'Total Amount': np.bincount(codes, self.amount[keep], minlength=size) / 100000,
+            'Closed Deals': np.bincount(codes, self.deals[keep] * self.won[keep], minlength=size).astype(int),
+            'Total Deals': deals.astype(int),
+        })[deals > 0]
+        total = metrics['Total Amount'].sum()
+        metrics['Share %'] = np.round(metrics['Total Amount'] / total * 100, 1) if total else 0.0
+        return metrics.sort_values(
+            ['Total Amount', 'Focus Area'], ascending=[False, True], kind='mergesort'
+        ).reset_index(drop=True)
+
+    def monthly_trend(self, deal_type="pipeline", practices=None):
+        """PandasEngine.monthly_trend over the deals of ``practices`` (all when None)"""
+        keep = self._practice_mask(practices) & (self.month != UNDATED)
+        if deal_type == "pipeline":
+            keep &= ~self.won
+        elif deal_type == "won":
+            keep &= self.won
+        months, codes = np.unique(self.month[keep], return_inverse=True)
+        return pd.DataFrame({
+            'Month': [f"{1970 + month // 12}-{month % 12 + 1:02d}" for month in months],
+            'Amount': np.bincount(codes, self.amount[keep], minlength=len(months)) / 100000,
+            'Deals': np.bincount(codes, self.staged[keep], minlength=len(months)).astype(int),
+        })
+
+
+def selected_practices(*events):
+    """Practices clicked in the given plotly_chart selection events, or None when nothing is selected"""
+    practices = []
+    for event in events:
+        for point in (event.selection.points if event else []):
+            if point.get('x') not in practices:
+                practices.append(point.get('x'))
+    return practices or None
+
+
+@st.cache_resource(max_entries=8)
+def get_crossfilter(key, _df, _catalog):
+    """CrossFilter for a processed dataset, built once per dataset ``key``"""
+    return CrossFilter(_df, _catalog)
@@ -0,0 +1,374 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import analytics
+import catalog
+import schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Arrow cache is optional; without it datasets live in process memory only
+    pa = None
+
+# Session-state key holding this session's DatasetHandle
+HANDLE_KEY = "dataset_handle"
+
+# Parsed datasets are written once as Arrow IPC files and memory-mapped, so every
+# Streamlit process on the host shares the same pages and restarts skip parsing.
+# Set SALES_DASHBOARD_CACHE_DIR to "off" to keep datasets in process memory only.
+CACHE_DIR_ENV_VAR = "SALES_DASHBOARD_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(".cache", "datasets")
+MAX_CACHED_DATASETS = 50
+MANIFEST_FILE = "manifest.json"
+# Bumped whenever the cached frames' layout changes (e.g. new derived columns)
+FORMAT_VERSION = 4
+
+
+def fingerprint_upload(data, *parts):
+    """Content fingerprint of an uploaded file plus the options used to parse it"""
+    digest = hashlib.sha1(data)
+    for part in parts:
+        digest.update(b"|" + str(part).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _freeze(df):
+    """Mark the frame's numpy buffers read-only so shared data can't be edited in place.
+
+    Pandas still allows whole columns to be added or replaced, so pages must treat
+    shared frames as immutable and derive new frames instead of assigning columns.
+    """
+    for column in df.columns:
+        values = df[column].to_numpy()
+        base = values
+        while isinstance(getattr(base, "base", None), np.ndarray):
+            base = base.base
+        if isinstance(base, np.ndarray) and base.flags.owndata:
+            base.flags.writeable = False
+    return df
+
+
+def cache_dir():
+    """Directory for the Arrow dataset cache, or None when it is disabled or unavailable"""
+    if pa is None:
+        return None
+    path = os.environ.get(CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR)
+    if path.strip().lower() in ("", "0", "off", "false", "no"):
+        return None
+    return path
+
+
+def _read_arrow(path):
+    """Open an Arrow IPC file via mmap; numeric and date columns stay zero-copy views of the file"""
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    # split_blocks avoids consolidating columns into new 2-D blocks, which would copy them
+    return table.to_pandas(split_blocks=True)
+
+
+def _write_arrow(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _load_cached(directory):
+    """Attach to a dataset another process (or an earlier run) already wrote, if complete.
+
+    Returns (frames, schema mappings) or None.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != FORMAT_VERSION:
+            return None
+        names = manifest["frames"]
+        frames = {name: _read_arrow(os.path.join(directory, f"{name}.arrow")) for name in names}
+        mappings = {name: schema.SchemaMapping.from_dict(manifest["schema"][name]) for name in names}
+        return frames, mappings
+    except (OSError, ValueError, KeyError, TypeError, pa.ArrowException):
+        return None
+
+
+def _store_cached(directory, frames, mappings):
+    """Write frames to the cache; the manifest goes last so readers never see partial data"""
+    os.makedirs(directory, exist_ok=True)
+    for name, df in frames.items():
+        _write_arrow(df, os.path.join(directory, f"{name}.arrow"))
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": FORMAT_VERSION,
+            "frames": list(frames),
+            "schema": {name: mapping.to_dict() for name, mapping in mappings.items()},
+        }, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def _prune_cache(root):
+    """Keep the most recently used datasets on disk"""
+    try:
+        entries = sorted(
+            (os.path.join(root, name) for name in os.listdir(root)),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+    except OSError:
+        return
+    for path in entries[MAX_CACHED_DATASETS:]:
+        # Processes that still have a file mapped keep their pages until they unmap it
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def prepare_frames(frames):
+    """Canonical, processed copies of freshly parsed frames and their schema mappings.
+
+    Frames are renamed to the canonical columns (see schema.normalize) and then
+    processed (see analytics.prepare_dataset); a sheet passed under two names
+    is only processed once.
+    """
+    prepared, mappings, done = {}, {}, {}
+    for name, df in frames.items():
+        if id(df) not in done:
+            canonical, mapping = schema.normalize(df)
+            done[id(df)] = analytics.prepare_dataset(canonical), mapping
+        prepared[name], mappings[name] = done[id(df)]
+    return prepared, mappings
+
+
+def load_frames(fingerprint, loader):
+    """Memory-mapped processed frames and schema mappings for ``fingerprint``.
+
+    The sheets are only parsed, via ``loader()``, on a cache miss.
+    """
+    root = cache_dir()
+    if root is None:
+        return prepare_frames(loader())
+
+    directory = os.path.join(root, fingerprint)
+    cached = _load_cached(directory)
+    if cached is not None:
+        os.utime(directory)
+        return cached
+
+    frames, mappings = prepare_frames(loader())
+    try:
+        _store_cached(directory, frames, mappings)
+        _prune_cache(root)
+    except (OSError, pa.ArrowException):
+        # Frames pandas can't express in Arrow (or a read-only disk) just aren't shared
+        shutil.rmtree(directory, ignore_errors=True)
+        return frames, mappings
+    return _load_cached(directory) or (frames, mappings)
+
+
+class Dataset:
+    """One upload's processed ``current``/``previous`` frames, shared by every page.
+
+    Dates, probabilities, lakhs, won flags and fiscal fields are derived once
+    at ingest (see analytics.prepare_dataset); pages read those columns instead
+    of re-parsing the raw sheet on every rerun.
+    """
+
+    def __init__(self, fingerprint, frames, mappings):
+        self.fingerprint = fingerprint
+        self.frames = frames
+        self.mappings = mappings
+        self.current = frames['current']
+        self.previous = frames['previous']
+        self.practice_column = 'Practice' if 'Practice' in self.current.columns else None
+        self.status_column = analytics.resolve_column(self.current, analytics.STATUS_COLUMNS)
+        by_frame = {}
+        self.catalogs = {
+            name: by_frame.setdefault(id(df), catalog.DimensionCatalog(df)) for name, df in frames.items()
+        }
+
+    def restricted(self, positions, scope_key):
+        """Dataset of the rows at ``positions`` ({frame name: row positions}) of each frame.
+
+        Its fingerprint includes ``scope_key``, so per-dataset caches keep
+        scoped and unscoped results apart.
+        """
+        taken = {}
+        frames = {}
+        for name, df in self.frames.items():
+            # A frame used under both names (one sheet as both weeks) stays shared
+            if id(df) not in taken:
+                taken[id(df)] = df.take(positions[name]).reset_index(drop=True)
+            frames[name] = taken[id(df)]
+        return Dataset(f"{self.fingerprint}@{scope_key}", frames, self.mappings)
+
+    def key(self, name="current"):
+        """Cache key for per-dataset structures built from one of the frames"""
+        return f"{self.fingerprint}:{name}"
+
+    def label(self, column, name="current"):
+        """Header the sheet used for a canonical column, for display"""
+        return self.mappings[name].source(column) or column
+
+    def source(self, name="current"):
+        """A frame with the canonical sheet columns only, without the derived fields"""
+        df = self.frames[name]
+        return df[[column for column in df.columns if column not in analytics.DERIVED_COLUMNS]]
+
+    def catalog(self, name="current"):
+        """DimensionCatalog of one frame (distinct values, counts and codes per column)"""
+        return self.catalogs[name]
+
+    def options(self, column, name="current"):
+        """Sorted distinct non-null values of a column, computed once per dataset"""
+        return self.catalogs[name].options(column)
+
+
+class _Entry:
+    __slots__ = ("frames", "dataset", "refs", "ready", "error")
+
+    def __init__(self):
+        self.frames = None
+        self.dataset = None
+        self.refs = 0
+        self.ready = threading.Event()
+        self.error = None
+
+
+class DatasetStore:
+    """Process-wide, reference-counted datasets shared by every session.
+
+    Entries are keyed by content fingerprint, so identical uploads are parsed
+    once and shared; an entry is dropped when its last handle is released.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def acquire(self, fingerprint, loader):
+        """Return a handle to the dataset, calling ``loader()`` only if it isn't loaded yet"""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            is_loader = entry is None
+            if is_loader:
+                entry = self._entries[fingerprint] = _Entry()
+            entry.refs += 1
+
+        if is_loader:
+            # Parse outside the store lock so other sessions aren't held up
+            try:
+                frames, mappings = load_frames(fingerprint, loader)
+                entry.frames = {name: _freeze(df) for name, df in frames.items()}
+                entry.dataset = Dataset(fingerprint, entry.frames, mappings)
+            except Exception as e:
+                entry.error = e
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            self.release(fingerprint)
+            raise entry.error
+        return DatasetHandle(self, fingerprint)
+
+    def frames(self, fingerprint):
+        entry = self._entries.get(fingerprint)
+        return entry.frames if entry is not None else None
+
+    def dataset(self, fingerprint):
+        entry = self._entries.get(fingerprint)
+        return entry.dataset if entry is not None else None
+
+    def release(self, fingerprint):
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0:
+                del self._entries[fingerprint]
+
+    def stats(self):
+        """Datasets held, total references and shallow memory in MB"""
+        with self._lock:
+            entries = list(self._entries.values())
+        memory = sum(
+            int(df.memory_usage(index=True, deep=False).sum())
+            for entry in entries if entry.frames
+            for df in entry.frames.values()
+        )
+        return {
+            "datasets": len(entries),
+            "references": sum(entry.refs for entry in entries),
+            "memory_mb": round(memory / 2**20, 2),
+        }
+
+
+class DatasetHandle:
+    """What a session keeps in its state instead of its own DataFrame copies.
+
+    The reference is released explicitly when the session loads other data, or
+    when the handle is garbage collected along with an expired session.
+    """
+
+    def __init__(self, store, fingerprint):
+        self.fingerprint = fingerprint
+        self._store = store
+        self._finalizer = weakref.finalize(self, store.release, fingerprint)
+
+    @property
+    def frames(self):
+        return self._store.frames(self.fingerprint)
+
+    @property
+    def dataset(self):
+        return self._store.dataset(self.fingerprint)
+
+    def release(self):
+        self._finalizer()
+
+
+@st.cache_resource
+def get_store():
+    """The single DatasetStore shared by all sessions in this process"""
+    return DatasetStore()
+
+
+def attach(fingerprint, loader):
+    """Point this session at a dataset, releasing whatever it held before"""
+    current = st.session_state.get(HANDLE_KEY)
+    if current is not None and current.fingerprint == fingerprint:
+        return current
+    handle = get_store().acquire(fingerprint, loader)
+    st.session_state[HANDLE_KEY] = handle
+    if current is not None:
+        current.release()
+    return handle
+
+
+def session_frames():
+    """This session's shared processed frames (``current``/``previous``), or None before upload"""
+    handle = st.session_state.get(HANDLE_KEY)
+    return handle.frames if handle is not None else None
+
+
+def session_dataset():
+    """This session's Dataset, or None before upload"""
+    handle = st.session_state.get(HANDLE_KEY)
+    return handle.dataset if handle is not None else None
+
+
+def session_fingerprint():
+    handle = st.session_state.get(HANDLE_KEY)
+    return handle.fingerprint if handle is not None else None
@@ -0,0 +1,213 @@
+import pandas as pd
+import streamlit as st
+
+import analytics
+
+try:
+    import duckdb
+    import pyarrow as pa
+except ImportError:  # DuckDB is optional; analytics falls back to the pandas engine
+    duckdb = None
+
+# Only the columns the aggregate queries read are handed to DuckDB; free-form
+# columns from the workbook may hold mixed types that Arrow can't express.
+QUERY_COLUMNS = [
+    'Sales Owner', 'Practice', 'KritiKal Focus Areas', 'Sales Stage', 'Expected Close Date',
+    'Amount', 'Amount_Lacs', 'Weighted_Amount', 'Probability_Num', 'Is_Won',
+]
+
+
+def available():
+    return duckdb is not None
+
+
+@st.cache_resource
+def _connection():
+    """In-process DuckDB database shared by all sessions; queries run on per-call cursors"""
+    con = duckdb.connect(database=":memory:")
+    # numpy's round(x, 1) is rint(x * 10) / 10; match it so both engines agree on ties
+    con.execute("CREATE MACRO _round1(x) AS round_even(x * 10, 0) / 10")
+    return con
+
+
+def _to_arrow(df):
+    columns = {}
+    for column in QUERY_COLUMNS:
+        if column in df.columns:
+            values = df[column]
+            columns[column] = values.astype('string') if values.dtype == object else values
+        elif column in ('Practice', 'KritiKal Focus Areas'):
+            columns[column] = pd.Series(pd.NA, index=df.index, dtype='string')
+    return pa.Table.from_pandas(pd.DataFrame(columns), preserve_index=False)
+
+
+@st.cache_resource(max_entries=8)
+def _cached_arrow(key, _df):
+    return _to_arrow(_df)
+
+
+class DuckDBEngine(analytics.PandasEngine):
+    """The analytics.PandasEngine aggregates, expressed as DuckDB SQL.
+
+    The processed frame is exposed to DuckDB as an Arrow table (converted once
+    per dataset ``key``) and DuckDB runs each query across all cores. Row
+    filtering and the per-card summaries are inherited from the pandas engine.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, df, key=None):
+        self.df = df
+        self.table = _cached_arrow(key, df) if key is not None else _to_arrow(df)
+
+    def _query(self, sql, params=None):
+        cursor = _connection().cursor()
+        try:
+            cursor.register('deals', self.table)
+            return cursor.execute(sql, params or []).df()
+        finally:
+            cursor.close()
+
+    def closed_won_amount(self):
+        """Total Closed Won amount in Lakhs"""
+        result = self._query("SELECT coalesce(sum(Amount), 0) / 100000 AS value FROM deals WHERE Is_Won")
+        return float(result['value'].iloc[0])
+
+    def team_metrics(self):
+        """Per Sales Owner totals used by the Sales Team KPI cards"""
+        return self._query("""
+            WITH owners AS (
+                SELECT
+                    "Sales Owner",
+                    trunc(coalesce(sum(Amount) FILTER (WHERE Is_Won), 0) / 100000)::BIGINT AS "Closed Won",
+                    count(*) FILTER (WHERE Is_Won) AS "Closed Deals",
+                    coalesce(sum(Amount_Lacs) FILTER (WHERE NOT Is_Won), 0)::BIGINT AS "Current Pipeline",
+                    coalesce(sum(Weighted_Amount) FILTER (WHERE NOT Is_Won), 0)::BIGINT AS "Weighted Projections",
+                    count(*) FILTER (WHERE NOT Is_Won) AS "Pipeline Deals"
+                FROM deals
+                WHERE "Sales Owner" IS NOT NULL
+                GROUP BY "Sales Owner"
+            )
+            SELECT *,
+                coalesce(round_even("Closed Deals"::DOUBLE / nullif("Closed Deals" + "Pipeline Deals", 0) * 100, 0), 0)::BIGINT
+                    AS "Win Rate"
+            FROM owners
+            ORDER BY "Sales Owner"
+        """)
+
+    def member_performance(self):
+        """Team Member Performance table, sorted by current pipeline"""
+        return self._query("""
+            WITH owners AS (
+                SELECT
+                    "Sales Owner",
+                    _round1(coalesce(sum(Amount) FILTER (WHERE Is_Won), 0) / 100000) AS "Closed Won",
+                    count(*) FILTER (WHERE Is_Won) AS "Closed Deals",
+                    _round1(coalesce(sum(Amount) FILTER (WHERE NOT Is_Won), 0) / 100000) AS "Current Pipeline",
+                    _round1(coalesce(sum(coalesce(Amount, 0) * Probability_Num / 100) FILTER (WHERE NOT Is_Won), 0)
+                            / 100000) AS "Weighted Projections",
+                    count(*) FILTER (WHERE NOT Is_Won) AS "Pipeline Deals"
+                FROM deals
+                WHERE "Sales Owner" IS NOT NULL
+                GROUP BY "Sales Owner"
+            )
+            SELECT *,
+                coalesce(_round1("Closed Deals"::DOUBLE / nullif("Closed Deals" + "Pipeline Deals", 0) * 100), 0)
+                    AS "Win Rate"
+            FROM owners
+            ORDER BY "Current Pipeline" DESC, "Sales Owner"
+        """)
+
+    def practice_metrics(self, practice=None):
+        """Closed and pipeline totals per Practice, optionally for a single practice"""
+        return self._query("""
+            SELECT
+                Practice,
+                coalesce(sum(Amount) FILTER (WHERE Is_Won), 0) / 100000 AS "Closed Amount",
+                count(*) FILTER (WHERE Is_Won) AS "Closed Deals",
+                coalesce(sum(Amount) FILTER (WHERE NOT Is_Won), 0) / 100000 AS "Total Pipeline",
+                count(*) FILTER (WHERE NOT Is_Won) AS "Pipeline Deals"
+            FROM deals
+            WHERE Practice IS NOT NULL AND ($1 IS NULL OR Practice = $1)
+            GROUP BY Practice
+            ORDER BY "Total Pipeline" DESC, Practice
+        """, [practice])
+
+    def focus_metrics(self):
+        """Amount, deal counts and share per KritiKal Focus Area"""
+        return self._query("""
+            WITH areas AS (
+                SELECT
+                    "KritiKal Focus Areas" AS "Focus Area",
+                    coalesce(sum(Amount), 0) / 100000 AS "Total Amount",
+                    count(*) FILTER (WHERE Is_Won) AS "Closed Deals",
+                    count(*) AS "Total Deals"
+                FROM deals
+                WHERE "KritiKal Focus Areas" IS NOT NULL
+                GROUP BY "KritiKal Focus Areas"
+            )
+            SELECT *,
+                coalesce(_round1("Total Amount" / nullif(sum("Total Amount") OVER (), 0) * 100), 0) AS "Share %"
+            FROM areas
+            ORDER BY "Total Amount" DESC, "Focus Area"
+        """)
+
+    def monthly_trend(self, deal_type="pipeline"):
+        """Amount (Lakhs) and deal count per close month for pipeline, won or all deals"""
+        if deal_type not in analytics.DEAL_TYPES:
+            raise ValueError(f"Unknown deal type: {deal_type}")
+        return self._query("""
+            SELECT
+                strftime("Expected Close Date", '%Y-%m') AS Month,
+                coalesce(sum(Amount), 0) / 100000 AS Amount,
+                count("Sales Stage") AS Deals
+            FROM deals
+            WHERE "Expected Close Date" IS NOT NULL
+              AND ($1 = 'all' OR Is_Won = ($1 = 'won'))
+            GROUP BY Month
+            ORDER BY Month
+        """, [deal_type])
+
+    def pipeline_summary(self, probability_range, amount_range):
+        """Stage counts, amount per probability band and monthly timeline for the sliders"""
+        where = """
+            FROM deals
+            WHERE Probability_Num BETWEEN $1 AND $2
+              AND Amount BETWEEN $3 AND $4
+        """
+        params = [
+            probability_range[0], probability_range[1],
+            amount_range[0] * 100000, amount_range[1] * 100000,
+        ]
+        stages = self._query(f"""
+            SELECT "Sales Stage", count(*) AS Deals
+            {where} AND "Sales Stage" IS NOT NULL
+            GROUP BY "Sales Stage"
+            ORDER BY Deals DESC, "Sales Stage"
+        """, params)
+
+        bins = analytics.PROBABILITY_BINS
+        cases = " ".join(
+            f"WHEN Probability_Num > {low} AND Probability_Num <= {high} THEN {i}"
+            for i, (low, high) in enumerate(zip(bins[:-1], bins[1:]))
+        )
+        banded = self._query(f"""
+            SELECT CASE {cases} END AS band, coalesce(sum(Amount), 0) / 100000 AS Amount
+            {where}
+            GROUP BY band
+        """, params).dropna(subset=['band'])
+        amounts = banded.set_index(banded['band'].astype(int))['Amount']
+        probability = pd.DataFrame({
+            'Band': analytics.PROBABILITY_LABELS,
+            'Amount': [float(amounts.get(i, 0.0)) for i in range(len(analytics.PROBABILITY_LABELS))],
+        })
+
+        timeline = self._query(f"""
+            SELECT date_trunc('month', "Expected Close Date") AS Month,
+                   coalesce(sum(Amount), 0) / 100000 AS Amount
+            {where} AND "Expected Close Date" IS NOT NULL
+            GROUP BY Month
+            ORDER BY Month
+        """, params)
+        timeline['Month'] = pd.PeriodIndex(pd.to_datetime(timeline['Month']), freq='M')
+        return stages, probability, analytics.fill_months(timeline)
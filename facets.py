@@ -0,0 +1,175 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+import analytics
+import filter_spec
+
+# Faceted counts for the Sales Team filters: for every filter, the rows and
+# amount per option under all the *other* active filters, so each dropdown
+# only offers values that still match something. Filters are evaluated on the
+# dataset's category codes (see catalog.Dimension), never on the text columns.
+DEFAULT_FILTERS = {
+    'selected_member': "All Team Members",
+    'search': "",
+    'practices': [],
+    'month_filter': "All Months",
+    'quarter_filter': "All Quarters",
+    'year_filter': "All Years",
+    'probability_filter': "All Probability",
+    'status_filter': "All Status",
+    'focus_filter': "All Focus",
+}
+# Faceted filters and the column each one selects on
+COLUMNS = {
+    'selected_member': 'Sales Owner',
+    'practices': 'Practice',
+    'month_filter': 'Month',
+    'quarter_filter': 'Fiscal_Quarter',
+    'year_filter': 'Fiscal_Year',
+    'focus_filter': 'KritiKal Focus Areas',
+}
+PROBABILITY_OPTIONS = ["0-25%", "26-50%", "51-75%", "76-100%"]
+STATUS_OPTIONS = ["Committed for the Month", "Upsides for the Month"]
+# Session-state keys of the Sales Team filter widgets
+WIDGET_KEYS = {
+    'selected_member': "team_member_filter",
+    'search': "team_search",
+    'practices': "practice_filter",
+    'month_filter': "team_month_filter",
+    'quarter_filter': "team_quarter_filter",
+    'year_filter': "team_year_filter",
+    'probability_filter': "team_probability_filter",
+    'status_filter': "team_status_filter",
+    'focus_filter': "team_focus_filter",
+}
+MAX_CACHED_MASKS = 64
+
+
+def filters_from_state(state):
+    """The Sales Team filters as of the last interaction, read before the widgets render"""
+    filters = {name: state.get(key, DEFAULT_FILTERS[name]) for name, key in WIDGET_KEYS.items()}
+    if filters['probability_filter'] == "Custom Range":
+        try:
+            min_prob = int(state.get("custom_min_prob_input", "0"))
+            max_prob = int(state.get("custom_max_prob_input", "100"))
+        except ValueError:
+            min_prob, max_prob = 0, 100
+        filters['custom_prob_range'] = f"{min_prob}-{max_prob}%"
+    return filters
+
+
+class Facet:
+    """Rows and amount (Lakhs) per option of one filter under the other filters"""
+
+    def __init__(self, options, rows, amount, total_rows):
+        self.counts = {option: (int(r), float(a)) for option, r, a in zip(options, rows, amount)}
+        self.total_rows = int(total_rows)
+
+    def options(self, ordered, selected=()):
+        """Options in ``ordered`` that match any rows, plus whatever is currently selected"""
+        keep = set(selected)
+        return [option for option in ordered if self.counts.get(option, (0, 0))[0] > 0 or option in keep]
+
+    def label(self, option, text=None):
+        rows, amount = self.counts.get(option, (0, 0.0))
+        return f"{option if text is None else text} ({rows:,} · ₹{amount:,.0f}L)"
+
+
+class FacetIndex:
+    """Category codes and numeric columns of one processed dataset, plus cached filter masks"""
+
+    def __init__(self, df, catalog):
+        self.rows = len(df)
+        # Optional columns missing from the upload get no facet (and no dropdown)
+        self.dimensions = {
+            name: catalog[column] for name, column in COLUMNS.items() if column in df.columns
+        }
+        self.catalog = catalog
+        self.amount = df['Amount'].fillna(0).to_numpy(dtype=float) / 100000
+        self.df = df
+        self._masks = OrderedDict()
+        self._lock = threading.Lock()
+        self._band_codes = None
+        self._status_codes = {}
+        self._totals = {}
+
+    def _compute(self, name, filters):
+        # The spec of this one filter, with every other filter left at its default
+        single = dict(DEFAULT_FILTERS, custom_prob_range=filters.get('custom_prob_range'))
+        single[name] = filters[name]
+        return filter_spec.sales_team(single).mask(self.df, self.catalog)
+
+    def mask(self, name, filters):
+        """Row mask of one active filter, cached by its value"""
+        value = filters[name]
+        # The month is part of the key because the status filters depend on it
+        key = (
+            name, tuple(value) if isinstance(value, list) else value,
+            filters.get('custom_prob_range'), analytics.current_month(),
+        )
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+        mask = self._compute(name, filters)
+        with self._lock:
+            self._masks[key] = mask
+            while len(self._masks) > MAX_CACHED_MASKS:
+                self._masks.popitem(last=False)
+        return mask
+
+    def _others(self, masks, name):
+        """AND of every active mask except ``name``'s; None when nothing else is active"""
+        result = None
+        for other, mask in masks.items():
+            if other != name:
+                result = mask if result is None else result & mask
+        return result
+
+    def _option_codes(self, name):
+        """(options, per-row option codes) for a faceted filter; -1 where no option applies"""
+        if name in self.dimensions:
+            return self.dimensions[name].values, self.dimensions[name].codes
+        if name == 'probability_filter':
+            if self._band_codes is None:
+                bands = [self.mask(name, {name: option}) for option in PROBABILITY_OPTIONS]
+                self._band_codes = np.select(bands, range(len(bands)), -1).astype(np.int32)
+            return PROBABILITY_OPTIONS, self._band_codes
+        month = analytics.current_month()
+        if month not in self._status_codes:
+            statuses = [self.mask(name, {name: option}) for option in STATUS_OPTIONS]
+            self._status_codes = {month: np.select(statuses, range(len(statuses)), -1).astype(np.int32)}
+        return STATUS_OPTIONS, self._status_codes[month]
+
+    def _facet(self, name, keep):
+        options, codes = self._option_codes(name)
+        if keep is None:
+            key = (name, analytics.current_month())
+            if key not in self._totals:
+                self._totals[key] = self._facet(name, np.ones(self.rows, dtype=bool))
+            return self._totals[key]
+        # Shift by one so rows without an option (code -1) land in a dropped slot
+        selected = codes[keep] + 1
+        rows = np.bincount(selected, minlength=len(options) + 1)[1:]
+        amounts = np.bincount(selected, weights=self.amount[keep], minlength=len(options) + 1)[1:]
+        return Facet(options, rows, amounts, len(selected))
+
+    def facets(self, filters):
+        """Facet per filter (except search) under the other active filters"""
+        filters = dict(DEFAULT_FILTERS, **filters)
+        masks = {
+            name: self.mask(name, filters) for name in WIDGET_KEYS
+            if filters[name] and filters[name] != DEFAULT_FILTERS[name]
+        }
+        names = list(self.dimensions) + ['probability_filter', 'status_filter']
+        return {name: self._facet(name, self._others(masks, name)) for name in names}
+
+
+@st.cache_resource(max_entries=8)
+def get_index(key, _df, _catalog):
+    """FacetIndex for a processed dataset, built once per dataset ``key``"""
+    return FacetIndex(_df, _catalog)
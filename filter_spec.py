@@ -0,0 +1,214 @@
+import numpy as np
+
+import analytics
+
+# Declarative row filters shared by every page. A FilterSpec is a list of
+# predicates; evaluating it against a processed frame orders the predicates by
+# how many rows they are estimated to keep (from the dataset's DimensionCatalog),
+# tests each one only on the rows the previous ones kept, stops as soon as
+# nothing is left and returns row positions, so pages take() the rows they need
+# instead of chaining df[...] copies.
+INCLUSIVE = ('both', 'neither', 'left', 'right')
+
+
+class _IsIn:
+    """Rows whose ``column`` is one of ``values``"""
+
+    cost = 0
+
+    def __init__(self, column, values):
+        self.column = column
+        self.values = list(values)
+
+    def _codes(self, dimension):
+        return [p for p in (dimension.position(value) for value in self.values) if p >= 0]
+
+    def estimate(self, df, catalog):
+        if self.column not in df.columns:
+            return 0
+        if catalog is None:
+            return len(df)
+        return int(catalog[self.column].counts[self._codes(catalog[self.column])].sum())
+
+    def evaluate(self, df, catalog, positions):
+        if catalog is None:
+            column = df[self.column] if positions is None else df[self.column].iloc[positions]
+            return column.isin(self.values).to_numpy(dtype=bool)
+        dimension = catalog[self.column]
+        codes = dimension.codes if positions is None else dimension.codes[positions]
+        selected = self._codes(dimension)
+        if len(selected) == 1:
+            return codes == selected[0]
+        # The trailing slot is read by missing values (code -1)
+        lookup = np.zeros(len(dimension) + 1, dtype=bool)
+        lookup[selected] = True
+        return lookup[codes]
+
+
+class _Range:
+    """Rows whose ``column`` lies between ``low`` and ``high`` (either may be None)"""
+
+    cost = 0
+
+    def __init__(self, column, low=None, high=None, inclusive='both'):
+        if inclusive not in INCLUSIVE:
+            raise ValueError(f"inclusive must be one of {', '.join(INCLUSIVE)}")
+        self.column = column
+        self.low = low
+        self.high = high
+        self.inclusive = inclusive
+
+    def _span(self, dimension):
+        """[start, stop) of the sorted dimension values inside the range"""
+        values = np.asarray(dimension.values)
+        start, stop = 0, len(values)
+        if self.low is not None:
+            side = 'left' if self.inclusive in ('both', 'left') else 'right'
+            start = int(np.searchsorted(values, self.low, side=side))
+        if self.high is not None:
+            side = 'right' if self.inclusive in ('both', 'right') else 'left'
+            stop = int(np.searchsorted(values, self.high, side=side))
+        return start, max(start, stop)
+
+    def estimate(self, df, catalog):
+        if self.column not in df.columns:
+            return 0
+        if catalog is None:
+            return len(df)
+        dimension = catalog[self.column]
+        start, stop = self._span(dimension)
+        return int(dimension.counts[start:stop].sum())
+
+    def evaluate(self, df, catalog, positions):
+        if catalog is None:
+            column = df[self.column] if positions is None else df[self.column].iloc[positions]
+            low = -np.inf if self.low is None else self.low
+            high = np.inf if self.high is None else self.high
+            return column.between(low, high, inclusive=self.inclusive).to_numpy(dtype=bool)
+        dimension = catalog[self.column]
+        codes = dimension.codes if positions is None else dimension.codes[positions]
+        start, stop = self._span(dimension)
+        return (codes >= start) & (codes < stop)
+
+
+class _Search:
+    """Rows where any of ``columns`` (all columns when None) contains ``text``, ignoring case"""
+
+    # Can't be estimated and scans strings, so it always runs last on the fewest rows
+    cost = 1
+
+    def __init__(self, text, columns=None):
+        self.text = text.lower()
+        self.columns = columns
+
+    def estimate(self, df, catalog):
+        return len(df)
+
+    def evaluate(self, df, catalog, positions):
+        columns = [c for c in (self.columns or df.columns) if c in df.columns]
+        rows = df if positions is None else df.iloc[positions]
+        found = np.zeros(len(rows), dtype=bool)
+        for column in columns:
+            found |= rows[column].astype(str).str.lower().str.contains(
+                self.text, na=False, regex=False
+            ).to_numpy(dtype=bool)
+        return found
+
+
+class FilterSpec:
+    """AND of row predicates, built with the chainable methods below"""
+
+    def __init__(self, predicates=None):
+        self.predicates = list(predicates or [])
+
+    def __len__(self):
+        return len(self.predicates)
+
+    def equals(self, column, value):
+        self.predicates.append(_IsIn(column, [value]))
+        return self
+
+    def isin(self, column, values):
+        self.predicates.append(_IsIn(column, values))
+        return self
+
+    def between(self, column, low=None, high=None, inclusive='both'):
+        self.predicates.append(_Range(column, low, high, inclusive))
+        return self
+
+    def fiscal_year(self, year):
+        """April-March fiscal year, named after the calendar year it starts in"""
+        return self.equals('Fiscal_Year', year)
+
+    def fiscal_quarter(self, quarter):
+        """Fiscal quarter number, 1 for April-June"""
+        return self.equals('Fiscal_Quarter', quarter)
+
+    def search(self, text, columns=None):
+        if text:
+            self.predicates.append(_Search(text, columns))
+        return self
+
+    def plan(self, df, catalog=None):
+        """(predicate, estimated rows) in evaluation order: cheap and selective first"""
+        estimates = [(predicate, predicate.estimate(df, catalog)) for predicate in self.predicates]
+        return sorted(estimates, key=lambda item: (item[0].cost, item[1]))
+
+    def positions(self, df, catalog=None):
+        """Sorted positions of the rows matching every predicate.
+
+        ``catalog`` is the frame's DimensionCatalog; with it predicates run on
+        category codes, without it on the column values.
+        """
+        positions = None
+        for predicate, estimate in self.plan(df, catalog):
+            if estimate == 0:
+                return np.empty(0, dtype=np.intp)
+            keep = predicate.evaluate(df, catalog, positions)
+            positions = np.flatnonzero(keep) if positions is None else positions[keep]
+            if len(positions) == 0:
+                break
+        return np.arange(len(df)) if positions is None else positions
+
+    def mask(self, df, catalog=None):
+        """Boolean row mask of the matching rows"""
+        if not self.predicates:
+            return np.ones(len(df), dtype=bool)
+        mask = np.zeros(len(df), dtype=bool)
+        mask[self.positions(df, catalog)] = True
+        return mask
+
+    def apply(self, df, catalog=None):
+        """The matching rows of ``df``; ``df`` itself when there are no predicates"""
+        if not self.predicates:
+            return df
+        return df.take(self.positions(df, catalog))
+
+
+def sales_team(filters):
+    """FilterSpec for the Sales Team page filters"""
+    spec = FilterSpec()
+    if filters.get('selected_member', "All Team Members") != "All Team Members":
+        spec.equals('Sales Owner', filters['selected_member'])
+    spec.search(filters.get('search'), analytics.SEARCH_COLUMNS)
+    if filters.get('practices'):
+        spec.isin('Practice', filters['practices'])
+    if filters.get('month_filter', "All Months") != "All Months":
+        spec.equals('Month', filters['month_filter'])
+    if filters.get('quarter_filter', "All Quarters") != "All Quarters":
+        spec.fiscal_quarter(filters['quarter_filter'])
+    if filters.get('year_filter', "All Years") != "All Years":
+        spec.fiscal_year(filters['year_filter'])
+    if filters.get('probability_filter', "All Probability") != "All Probability":
+        spec.between('Probability_Num', *analytics.probability_bounds(filters))
+    status = filters.get('status_filter', "All Status")
+    if status == "Committed for the Month":
+        spec.equals('Month', analytics.current_month()).between('Probability_Num', 75, inclusive='neither')
+    elif status == "Upsides for the Month":
+        spec.equals('Month', analytics.current_month()).between('Probability_Num', 25, 75)
+    elif status != "All Status":
+        spec.equals('Sales Stage', status)
+    if filters.get('focus_filter', "All Focus") != "All Focus":
+        spec.equals('KritiKal Focus Areas', filters['focus_filter'])
+    return spec
+
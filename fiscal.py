@@ -0,0 +1,63 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+# April-March fiscal calendar. Fiscal years are named after the calendar year
+# they start in (FY 2024-25 is 2024). Every period is derived once at ingest as
+# a small nullable integer column, so period filters compare integers instead
+# of re-deriving months and quarters from timestamps on each render.
+START_MONTH = 4  # April
+COLUMNS = ['Fiscal_Year', 'Fiscal_Quarter', 'Fiscal_Month', 'Fiscal_Week']
+MONTHS = calendar.month_name[START_MONTH:] + calendar.month_name[1:START_MONTH]
+QUARTERS = [1, 2, 3, 4]
+
+
+def periods(dates):
+    """Fiscal year, quarter (1-4), month (1-12, April first) and week of quarter (1-14) per date"""
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    missing = np.isnat(values)
+    months = np.where(missing, 0, values.astype('datetime64[M]').astype(np.int64))
+    # Months since the first fiscal year starting in the 1970 epoch
+    since = months - (START_MONTH - 1)
+    month = since % 12 + 1
+    quarter = (month - 1) // 3 + 1
+    quarter_start = (months - (month - 1) % 3).astype('datetime64[M]').astype('datetime64[D]')
+    days = np.where(missing, 0, (values.astype('datetime64[D]') - quarter_start).astype(np.int64))
+    columns = {
+        'Fiscal_Year': (since // 12 + 1970, np.int16),
+        'Fiscal_Quarter': (quarter, np.int8),
+        'Fiscal_Month': (month, np.int8),
+        'Fiscal_Week': (days // 7 + 1, np.int8),
+    }
+    return {
+        name: pd.Series(pd.arrays.IntegerArray(column.astype(dtype), missing.copy()), index=dates.index)
+        for name, (column, dtype) in columns.items()
+    }
+
+
+def year_and_quarter(months):
+    """Fiscal (year, quarter) arrays for months counted as ``year * 12 + month - 1``"""
+    since = np.asarray(months) - (START_MONTH - 1)
+    return since // 12, since % 12 // 3 + 1
+
+
+def month_index(name):
+    """Fiscal month number (1-12) of a month name"""
+    return MONTHS.index(name) + 1
+
+
+def year_label(year):
+    return f"FY {int(year)}-{(int(year) + 1) % 100:02d}"
+
+
+def quarter_label(quarter):
+    first = MONTHS[(int(quarter) - 1) * 3]
+    last = MONTHS[(int(quarter) - 1) * 3 + 2]
+    return f"Q{int(quarter)} ({first[:3]}-{last[:3]})"
+
+
+def year_bounds(year):
+    """[start, end) timestamps of a fiscal year"""
+    start = pd.Timestamp(int(year), START_MONTH, 1)
+    return start, start + pd.DateOffset(years=1)
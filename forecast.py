@@ -0,0 +1,220 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import fiscal
+
+# Monte Carlo bookings forecast: every open deal closes independently with
+# probability Probability_Num / 100. Scenarios are simulated in chunks so the
+# (scenarios x deals) draw matrix never exceeds CHUNK_CELLS entries. Per-group
+# bookings are not kept per scenario: each chunk is added to a histogram of
+# HISTOGRAM_BINS bins per group, so memory depends on the groups only, and the
+# group percentiles are read from it to within 1/HISTOGRAM_BINS of the group's
+# pipeline. Portfolio totals are kept per scenario and their percentiles are exact.
+DEFAULT_SCENARIOS = 10000
+DEFAULT_SEED = 42
+CHUNK_CELLS = 4_000_000
+HISTOGRAM_BINS = 1024
+PERCENTILES = (10, 50, 90)
+DIMENSIONS = ('Sales Owner', 'Practice', 'Fiscal Quarter')
+UNASSIGNED = 'Unassigned'
+MAX_CACHED_FORECASTS = 16
+WORKERS = 2
+
+
+def _quarter_labels(df):
+    """April-March fiscal quarter of each close date, such as FY 2024-25 Q1 (Apr-Jun)"""
+    year = df['Fiscal_Year']
+    quarter = df['Fiscal_Quarter']
+    known = (year.notna() & quarter.notna()).to_numpy()
+    labels = np.full(len(df), UNASSIGNED, dtype=object)
+    labels[known] = [
+        f"{fiscal.year_label(y)} {fiscal.quarter_label(q)}" for y, q in zip(year[known], quarter[known])
+    ]
+    return labels
+
+
+def open_deals(df):
+    """Deals still in the pipeline with a positive amount and probability"""
+    probability = df['Probability_Num'].clip(0, 100) / 100
+    mask = ~df['Is_Won'] & df['Amount'].notna() & (df['Amount'] > 0) & (probability > 0)
+    deals = df.loc[mask]
+    return pd.DataFrame({
+        'Amount': deals['Amount'].to_numpy(dtype=float),
+        'Probability': probability[mask].to_numpy(dtype=float),
+        'Sales Owner': deals['Sales Owner'].fillna(UNASSIGNED).astype(str).to_numpy(),
+        'Practice': (deals['Practice'].fillna(UNASSIGNED).astype(str).to_numpy()
+                     if 'Practice' in deals.columns else UNASSIGNED),
+        'Fiscal Quarter': _quarter_labels(deals),
+    })
+
+
+class _Cells:
+    """Deals sorted by (Sales Owner, Practice, Fiscal Quarter) cell.
+
+    Each chunk is reduced once to per-cell totals with np.add.reduceat over
+    contiguous columns; the per-dimension totals then come from a small
+    (cells x groups) indicator matmul instead of re-gathering every draw.
+    """
+
+    def __init__(self, deals):
+        codes = {}
+        self.groups = {}
+        for dimension in DIMENSIONS:
+            codes[dimension], self.groups[dimension] = pd.factorize(deals[dimension].to_numpy(), sort=True)
+        cell_codes, cells = pd.factorize(pd.MultiIndex.from_arrays([codes[d] for d in DIMENSIONS]))
+        self.order = np.argsort(cell_codes, kind='stable')
+        self.starts = np.searchsorted(cell_codes[self.order], np.arange(len(cells)))
+        self.indicators = {}
+        for position, dimension in enumerate(DIMENSIONS):
+            indicator = np.zeros((len(cells), len(self.groups[dimension])))
+            indicator[np.arange(len(cells)), cells.get_level_values(position)] = 1.0
+            self.indicators[dimension] = indicator
+
+
+class GroupHistogram:
+    """Counts of simulated bookings per group in HISTOGRAM_BINS bins up to the group's pipeline.
+
+    Bin 0 holds exactly zero (nothing booked); bin k holds bookings in
+    ((k - 1) * width, k * width].
+    """
+
+    def __init__(self, pipeline, bins=HISTOGRAM_BINS):
+        self.bins = bins
+        self.width = np.maximum(np.asarray(pipeline, dtype=float), 1e-9) / bins
+        self.counts = np.zeros((len(self.width), bins + 1), dtype=np.int64)
+        self._offsets = np.arange(len(self.width)) * (bins + 1)
+
+    def add(self, values):
+        """Count a (scenarios, groups) block of simulated bookings"""
+        slots = np.clip(np.ceil(values / self.width), 0, self.bins).astype(np.int64) + self._offsets
+        self.counts += np.bincount(slots.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """(len(percentiles), groups) bookings, interpolated within the bin holding each rank"""
+        groups = np.arange(len(self.width))
+        cumulative = self.counts.cumsum(axis=1)
+        scenarios = cumulative[:, -1]
+        result = np.zeros((len(percentiles), len(groups)))
+        for i, p in enumerate(percentiles):
+            # Zero-based position of the percentile among the sorted scenarios, as np.percentile
+            rank = p / 100 * np.maximum(scenarios - 1, 0)
+            slot = np.minimum((cumulative <= rank[:, None]).sum(axis=1), self.bins)
+            inside = self.counts[groups, slot]
+            before = cumulative[groups, slot] - inside
+            fraction = np.clip((rank - before + 0.5) / np.maximum(inside, 1), 0, 1)
+            result[i] = np.where(slot == 0, 0.0, (slot - 1 + fraction) * self.width)
+        return result
+
+
+def simulate(deals, scenarios=DEFAULT_SCENARIOS, seed=DEFAULT_SEED, progress=None):
+    """Simulated bookings: (totals per scenario (S,), {dimension: (groups, GroupHistogram)})"""
+    cells = _Cells(deals)
+    amount = deals['Amount'].to_numpy()[cells.order]
+    # float32 uniforms are cheaper to draw; 2**-24 resolution is far below any deal probability step
+    probability = deals['Probability'].to_numpy()[cells.order].astype(np.float32)
+
+    totals = np.zeros(scenarios)
+    cell_pipeline = np.add.reduceat(amount, cells.starts) if len(deals) else np.zeros(0)
+    by_group = {
+        d: (cells.groups[d], GroupHistogram(cell_pipeline @ cells.indicators[d])) for d in DIMENSIONS
+    }
+    if len(deals) == 0:
+        return totals, by_group
+
+    chunk = max(1, CHUNK_CELLS // len(deals))
+    for index, start in enumerate(range(0, scenarios, chunk)):
+        stop = min(start + chunk, scenarios)
+        # Seeding each chunk from (seed, chunk number) makes a run reproducible for a given dataset
+        rng = np.random.default_rng([seed, index])
+        booked = (rng.random((stop - start, len(deals)), dtype=np.float32) < probability) * amount
+        cell_totals = np.add.reduceat(booked, cells.starts, axis=1)
+        totals[start:stop] = cell_totals.sum(axis=1)
+        for dimension, indicator in cells.indicators.items():
+            by_group[dimension][1].add(cell_totals @ indicator)
+        if progress is not None:
+            progress(stop / scenarios)
+    return totals, by_group
+
+
+def summarize(deals, totals, by_group):
+    """P10/P50/P90 bookings (in Lakhs) per group next to the deterministic weighted projection"""
+    weighted = deals['Amount'] * deals['Probability']
+    result = {}
+    for dimension, (groups, histogram) in by_group.items():
+        quantiles = histogram.percentiles(PERCENTILES)
+        stats = deals.assign(Weighted=weighted).groupby(dimension).agg(
+            Deals=('Amount', 'size'), Pipeline=('Amount', 'sum'), Weighted=('Weighted', 'sum')
+        ).reindex(groups)
+        table = pd.DataFrame({
+            dimension: np.asarray(groups),
+            'Open Deals': stats['Deals'].to_numpy(dtype=int),
+            'Pipeline': stats['Pipeline'].to_numpy() / 100000,
+            'Weighted': stats['Weighted'].to_numpy() / 100000,
+        })
+        for p, values in zip(PERCENTILES, quantiles):
+            table[f'P{p}'] = values / 100000
+        result[dimension] = table.sort_values('P50', ascending=False, kind='mergesort').reset_index(drop=True)
+
+    total = {'Open Deals': len(deals), 'Pipeline': float(deals['Amount'].sum()) / 100000,
+             'Weighted': float(weighted.sum()) / 100000}
+    for p, value in zip(PERCENTILES, np.percentile(totals, PERCENTILES)):
+        total[f'P{p}'] = float(value) / 100000
+    result['Total'] = total
+    return result
+
+
+class Forecast:
+    """A simulation running (or finished) on the worker pool"""
+
+    def __init__(self, df, scenarios, seed):
+        self.scenarios = scenarios
+        self.seed = seed
+        self.progress = 0.0
+        self.future = _executor().submit(self._run, df)
+
+    def _set_progress(self, value):
+        self.progress = value
+
+    def _run(self, df):
+        deals = open_deals(df)
+        totals, by_group = simulate(deals, self.scenarios, self.seed, self._set_progress)
+        return summarize(deals, totals, by_group)
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+@st.cache_resource
+def _executor():
+    """Worker threads shared by all sessions, so simulations never run on a script thread"""
+    return ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="forecast")
+
+
+@st.cache_resource
+def _forecasts():
+    return OrderedDict(), threading.Lock()
+
+
+def get_forecast(fingerprint, df, scenarios=DEFAULT_SCENARIOS, seed=DEFAULT_SEED):
+    """Forecast for a dataset, started on first request and cached by fingerprint and parameters"""
+    cache, lock = _forecasts()
+    key = (fingerprint, int(scenarios), int(seed))
+    with lock:
+        forecast = cache.get(key)
+        if forecast is not None and forecast.done() and forecast.future.exception() is not None:
+            forecast = None  # retry failed runs
+        if forecast is None:
+            forecast = cache[key] = Forecast(df, int(scenarios), int(seed))
+            while len(cache) > MAX_CACHED_FORECASTS:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+    return forecast
@@ -0,0 +1,91 @@
+import streamlit as st
+
+# Lite rendering for meeting-room TVs and thin clients. static/lite.css turns
+# off animations, transitions, blurs and shadows across the page; pages swap
+# their glassmorphism templates for plain ones, draw sparklines as inline SVG
+# instead of Plotly figures and skip particle effects. Lite mode covers the
+# login pages and the dashboard PAGES, whose metric cards render through
+# ``cards`` as one grid. The other pages are charts, tables and inputs with
+# nothing to swap, so they render the same in both modes and skip lite.css.
+# Turn it on with ?lite=1 or the sidebar toggle, which keeps the query
+# parameter in step so the URL can be bookmarked on the device.
+QUERY_PARAM = "lite"
+PAGES = ("Dashboard (Quarter Summary)", "Overview", "Sales Team", "YTD Dashboard")
+SESSION_KEY = "lite_mode"
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def _query_flag():
+    try:
+        return str(st.query_params.get(QUERY_PARAM, "")).lower() in _TRUTHY
+    except Exception:
+        return False
+
+
+def enabled():
+    """True when this session renders the lite templates"""
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = _query_flag()
+    return st.session_state[SESSION_KEY]
+
+
+def _sync_query_param():
+    if st.session_state[SESSION_KEY]:
+        st.query_params[QUERY_PARAM] = "1"
+    elif QUERY_PARAM in st.query_params:
+        del st.query_params[QUERY_PARAM]
+
+
+def toggle():
+    """Sidebar switch for lite mode"""
+    enabled()
+    st.sidebar.toggle(
+        "Lite mode", key=SESSION_KEY, on_change=_sync_query_param,
+        help="Plain cards without animation or blur on the Dashboard, Overview, Sales Team and YTD pages",
+    )
+
+
+def stylesheets(page=None):
+    """Sheets to pass to assets.stylesheet alongside a page's own: lite.css when lite mode is on.
+
+    ``page`` names a dashboard page, which gets lite.css only if it is in PAGES.
+    """
+    return ["lite.css"] if enabled() and (page is None or page in PAGES) else []
+
+
+def sparkline_svg(values, width=160, height=40, color="white"):
+    """Inline SVG line through ``values``, drawn by the browser without a Plotly figure"""
+    values = [float(value) for value in values]
+    low, high = min(values), max(values)
+    step = width / max(len(values) - 1, 1)
+    pad = 4
+    points = []
+    for i, value in enumerate(values):
+        level = (value - low) / (high - low) if high > low else 0.5
+        points.append((i * step, pad + (height - 2 * pad) * (1 - level)))
+    line = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+    dots = "".join(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3" fill="{color}"/>' for x, y in points)
+    return (
+        f'<svg class="lite-sparkline" viewBox="0 0 {width} {height}" width="100%" height="{height}" '
+        f'preserveAspectRatio="none"><polyline points="{line}" fill="none" stroke="{color}" '
+        f'stroke-width="2"/>{dots}</svg>'
+    )
+
+
+def card(title, value, color, delta=None, positive=True, description="", sparkline=None):
+    """One plain metric card; ``delta`` is a formatted change and ``sparkline`` the values drawn under it"""
+    parts = [f"<div class='lite-card' style='background: {color};'>", f"<h3>{title}</h3>",
+             f"<div class='value'>{value}</div>"]
+    if delta is not None:
+        parts.append(f"<div class='delta' style='color: {'#BBF7D0' if positive else '#FECACA'};'>{delta}</div>")
+    if description:
+        parts.append(f"<div class='description'>{description}</div>")
+    if sparkline is not None:
+        parts.append(sparkline_svg(sparkline))
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def cards(items):
+    """Cards from ``card`` as one grid, rendered by a single st.markdown"""
+    return f"<div class='lite-cards'>{''.join(items)}</div>"
@@ -0,0 +1,88 @@
+"""Compare what each page sends in normal and lite mode.
+
+Usage:
+    python lite_report.py [--rows 5000] [--pages "YTD Dashboard" ...]
+
+Renders the dashboard pages lite mode covers (lite.PAGES) and the login pages
+with Streamlit's AppTest on synthetic data, once normally and once with lite
+mode on, and prints the number of Streamlit elements (blocks included) and the
+bytes of their protos for each. Other pages render the same in both modes.
+"""
+import argparse
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+import bench_engines
+import dataset_store
+import lite
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PAGES = list(lite.PAGES)
+LOGIN_SCRIPTS = {"Login (views.py)": "views.py", "Login (futuristic_login.py)": "futuristic_login.py"}
+
+
+def make_dataset(rows, seed=0):
+    """bench_engines' synthetic workbook plus the people columns the Sales Team page shows"""
+    df = bench_engines.make_dataset(rows, seed)
+    df["Pre-sales Technical Lead"] = [f"Lead {i % 7}" for i in range(rows)]
+    df["Business Owner"] = [f"Business Owner {i % 5}" for i in range(rows)]
+    return df
+
+
+def payload(app):
+    """(elements, bytes) of everything rendered in the main area and the sidebar"""
+    elements = size = 0
+    nodes = list(app.main.children.values()) + list(app.sidebar.children.values())
+    while nodes:
+        node = nodes.pop()
+        elements += 1
+        proto = getattr(node, 'proto', None)
+        if proto is not None:
+            size += proto.ByteSize()
+        nodes.extend(getattr(node, 'children', {}).values())
+    return elements, size
+
+
+def render(script, lite_mode, page=None, handle=None):
+    app = AppTest.from_file(os.path.join(HERE, script), default_timeout=120)
+    app.session_state[lite.SESSION_KEY] = lite_mode
+    if handle is not None:
+        # Dashboard pages need a signed-in user; the default admin sees every deal
+        app.session_state["authenticated"] = True
+        app.session_state["username"] = "admin"
+        app.session_state[dataset_store.HANDLE_KEY] = handle
+    app.run()
+    if page is not None:
+        app.sidebar.radio[0].set_value(page).run()
+    if app.exception:
+        raise RuntimeError(f"{page or script}: {app.exception[0].value}")
+    return payload(app)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--pages", nargs="+", default=PAGES + list(LOGIN_SCRIPTS))
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SALES_DASHBOARD_PERF_LOG", "off")
+    handle = dataset_store.get_store().acquire(
+        f"lite-report-{args.rows}",
+        lambda: {"current": make_dataset(args.rows, 0), "previous": make_dataset(int(args.rows * 0.9), 1)},
+    )
+
+    print(f"{'Page':<30}{'Elements':>10}{'Lite':>8}{'Bytes':>12}{'Lite':>12}{'Saved':>8}")
+    for page in args.pages:
+        if page in LOGIN_SCRIPTS:
+            normal, reduced = (render(LOGIN_SCRIPTS[page], mode) for mode in (False, True))
+        else:
+            normal, reduced = (render("sales_dashboard.py", mode, page, handle) for mode in (False, True))
+        saved = 1 - reduced[1] / normal[1] if normal[1] else 0
+        print(f"{page:<30}{normal[0]:>10}{reduced[0]:>8}{normal[1]:>12,}{reduced[1]:>12,}{saved:>8.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
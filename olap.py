@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import fiscal
+
+# Pivot cube: each processed dataset is aggregated once, in a single group-by
+# over the catalog's category codes, into measure sums per occupied combination
+# of DIMENSIONS. Any two-dimensional slice is then a bincount over cube cells
+# rather than a groupby over deals.
+DIMENSIONS = {
+    'Sales Owner': 'Sales Owner',
+    'Practice': 'Practice',
+    'KritiKal Focus Areas': 'Focus Area',
+    'Geography': 'Geography',
+    'Sales Stage': 'Sales Stage',
+    'Type': 'Type',
+    'Fiscal_Year': 'Fiscal Year',
+    'Fiscal_Month': 'Fiscal Month',
+}
+MEASURES = ['Amount (₹L)', 'Weighted Amount (₹L)', 'Deals', 'Won Deals']
+BLANK = "(blank)"
+TOTAL = "Total"
+
+
+def _labels(column, values):
+    if column == 'Fiscal_Year':
+        return [fiscal.year_label(value) for value in values]
+    if column == 'Fiscal_Month':
+        return [fiscal.MONTHS[value - 1] for value in values]
+    return [str(value) for value in values]
+
+
+def _cell_keys(codes, sizes):
+    """One int64 key per row combining the per-dimension codes, and the cell per row"""
+    if np.prod([float(size) for size in sizes]) < 2 ** 62:
+        key = np.zeros(len(codes[0]), dtype=np.int64)
+        for column, size in zip(codes, sizes):
+            key = key * size + column
+        return pd.factorize(key)[0]
+    return pd.factorize(pd.MultiIndex.from_arrays(codes))[0]
+
+
+class Cube:
+    """Measure sums per occupied dimension combination, with per-cell dimension codes"""
+
+    def __init__(self, df, catalog):
+        self.rows = len(df)
+        # Optional columns missing from the upload are left out of the cube
+        self.dimensions = [column for column in DIMENSIONS if column in df.columns]
+        self.labels = {}
+        row_codes = []
+        for column in self.dimensions:
+            dimension = catalog[column]
+            # Missing values (code -1) go to a trailing "(blank)" label
+            self.labels[column] = _labels(column, dimension.values) + [BLANK]
+            row_codes.append(np.where(dimension.codes < 0, len(dimension), dimension.codes))
+        cells = _cell_keys(row_codes, [len(labels) for labels in self.labels.values()])
+        size = int(cells.max()) + 1 if len(cells) else 0
+
+        # First row of each cell gives the cell's codes
+        first = np.full(size, len(cells), dtype=np.int64)
+        np.minimum.at(first, cells, np.arange(len(cells)))
+        self.codes = {column: codes[first] for column, codes in zip(self.dimensions, row_codes)}
+
+        amount = df['Amount'].fillna(0).to_numpy(dtype=float) / 100000
+        probability = df['Probability_Num'].to_numpy(dtype=float)
+        self.measures = {
+            'Amount (₹L)': np.bincount(cells, weights=amount, minlength=size),
+            'Weighted Amount (₹L)': np.bincount(cells, weights=amount * probability / 100, minlength=size),
+            'Deals': np.bincount(cells, minlength=size).astype(float),
+            'Won Deals': np.bincount(cells, weights=df['Is_Won'].to_numpy(dtype=float), minlength=size),
+        }
+
+    def __len__(self):
+        return len(self.measures['Deals'])
+
+    def options(self, column):
+        """Labels of a dimension that occur in the data"""
+        counts = np.bincount(self.codes[column], minlength=len(self.labels[column]))
+        return [label for label, count in zip(self.labels[column], counts) if count]
+
+    def cell_mask(self, slices=None):
+        """Cells whose labels are in ``slices`` ({dimension: [labels]}); None for every cell"""
+        mask = None
+        for column, selected in (slices or {}).items():
+            if not selected:
+                continue
+            lookup = np.isin(np.asarray(self.labels[column], dtype=object), list(selected))
+            mask = lookup[self.codes[column]] if mask is None else mask & lookup[self.codes[column]]
+        return mask
+
+    def pivot(self, rows, columns=None, measure='Amount (₹L)', slices=None):
+        """``measure`` per ``rows`` label (x ``columns`` label) with Total row and column"""
+        keep = self.cell_mask(slices)
+        select = slice(None) if keep is None else keep
+        row_codes = self.codes[rows][select]
+        if columns is None or columns == rows:
+            width, column_codes, column_labels = 1, 0, [measure]
+        else:
+            width, column_codes, column_labels = len(self.labels[columns]), self.codes[columns][select], self.labels[columns]
+        key = row_codes * width + column_codes
+        height = len(self.labels[rows])
+        grid = np.bincount(key, weights=self.measures[measure][select], minlength=height * width).reshape(height, width)
+        deals = np.bincount(key, weights=self.measures['Deals'][select], minlength=height * width).reshape(height, width)
+
+        used_rows = deals.sum(axis=1) > 0
+        used_columns = deals.sum(axis=0) > 0
+        table = pd.DataFrame(
+            grid[used_rows][:, used_columns],
+            index=pd.Index(np.asarray(self.labels[rows], dtype=object)[used_rows], name=DIMENSIONS[rows]),
+            columns=np.asarray(column_labels, dtype=object)[used_columns],
+        )
+        if width > 1:
+            table[TOTAL] = table.sum(axis=1)
+        table.loc[TOTAL] = table.sum(axis=0)
+        return table
+
+
+@st.cache_resource(max_entries=8)
+def get_cube(key, _df, _catalog):
+    """Cube for a processed dataset, built once per dataset ``key``"""
+    return Cube(_df, _catalog)
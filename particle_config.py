@@ -1,3 +1,6 @@
+import json
+
+
 class ParticleConfig:
     """Configuration class for particle effects in the login page."""
     
@@ -98,102 +101,286 @@ class ParticleConfig:
             """
     
     @classmethod
-    def get_particle_script(cls):
-        """Generate JavaScript for particle creation and management."""
-        return f"""
-        <script>
-            class ParticleSystem {{
-                constructor() {{
-                    this.container = document.getElementById('particles');
-                    this.particles = [];
-                    this.maxParticles = {cls.MAX_PARTICLES};
-                    this.fpsLimit = {cls.FPS_LIMIT};
-                    this.lastFrameTime = 0;
-                    this.frameInterval = 1000 / this.fpsLimit;
-                }}
+    def get_particle_script(cls, harness=False):
+        """Generate the HTML/JavaScript for the canvas particle renderer.
 
-                createParticle() {{
-                    if (this.particles.length >= this.maxParticles) return;
-
-                    const particle = document.createElement('div');
-                    particle.className = 'particle';
-                    
-                    const x = Math.random() * window.innerWidth;
-                    const y = Math.random() * window.innerHeight;
-                    const size = Math.random() * ({cls.PARTICLE_MAX_SIZE} - {cls.PARTICLE_MIN_SIZE}) + {cls.PARTICLE_MIN_SIZE};
-                    const duration = Math.random() * ({cls.ANIMATION_DURATION_MAX} - {cls.ANIMATION_DURATION_MIN}) + {cls.ANIMATION_DURATION_MIN};
-                    
-                    particle.style.cssText = `{cls.get_particle_style(x, y, size, duration)}`;
-                    
-                    if ({str(cls.INTERACTIVE).lower()}) {{
-                        this._addInteractivity(particle);
-                    }}
-                    
-                    this.container.appendChild(particle);
-                    this.particles.push(particle);
-                    
-                    // Remove particle after animation
-                    setTimeout(() => {{
-                        particle.remove();
-                        this.particles = this.particles.filter(p => p !== particle);
-                    }}, duration * 1000);
-                }}
+        Render it with ``streamlit.components.v1.html``; the canvas is drawn over
+        the Streamlit page when the component frame can reach it. With
+        ``harness`` set, frames and JavaScript CPU time per second are shown in
+        the component and kept in ``window.__particleStats``.
+        """
+        config = {
+            'count': min(cls.PARTICLE_COUNT, cls.MAX_PARTICLES),
+            'maxParticles': cls.MAX_PARTICLES,
+            'minSize': cls.PARTICLE_MIN_SIZE,
+            'maxSize': cls.PARTICLE_MAX_SIZE,
+            'color': cls.PARTICLE_COLOR,
+            'hoverColor': cls.PARTICLE_COLOR.replace("0.3", "0.6"),
+            'shape': cls.PARTICLE_SHAPE,
+            'durationMin': cls.ANIMATION_DURATION_MIN,
+            'durationMax': cls.ANIMATION_DURATION_MAX,
+            'animation': cls.ANIMATION_TYPE,
+            'rangeX': cls.MOVEMENT_RANGE_X,
+            'rangeY': str(cls.MOVEMENT_RANGE_Y),
+            'hover': cls.INTERACTIVE and cls.HOVER_EFFECT,
+            'click': cls.INTERACTIVE and cls.CLICK_EFFECT,
+            'fpsLimit': cls.FPS_LIMIT,
+            'useRaf': cls.USE_REQUEST_ANIMATION_FRAME,
+            'harness': harness,
+        }
+        return _CANVAS_SCRIPT.replace("__CONFIG__", json.dumps(config))
 
-                _addInteractivity(particle) {{
-                    if ({str(cls.HOVER_EFFECT).lower()}) {{
-                        particle.addEventListener('mouseenter', () => {{
-                            particle.style.transform = 'scale(2)';
-                            particle.style.background = '{cls.PARTICLE_COLOR.replace("0.3", "0.6")}';
-                        }});
-                        
-                        particle.addEventListener('mouseleave', () => {{
-                            particle.style.transform = 'scale(1)';
-                            particle.style.background = '{cls.PARTICLE_COLOR}';
-                        }});
-                    }}
 
-                    if ({str(cls.CLICK_EFFECT).lower()}) {{
-                        particle.addEventListener('click', () => {{
-                            particle.style.animation = 'none';
-                            particle.style.transform = 'scale(3)';
-                            particle.style.opacity = '0';
-                            setTimeout(() => particle.remove(), 500);
-                        }});
-                    }}
-                }}
+# One canvas and one Float32Array of MAX_PARTICLES slots; a particle whose life
+# ends (or that is clicked) is respawned in its slot, so frames allocate nothing
+# and never touch the DOM. Drawing is batched into one path per opacity level.
+_CANVAS_SCRIPT = """
+<script>
+(function () {
+    const config = __CONFIG__;
 
-                update() {{
-                    const now = performance.now();
-                    const delta = now - this.lastFrameTime;
+    // Draw over the Streamlit page when the component frame can reach it
+    let host = window;
+    try {
+        if (window.parent.document.body) host = window.parent;
+    } catch (e) {}
+    const doc = host.document;
+    if (host.__particleSystem) host.__particleSystem.stop();
 
-                    if (delta >= this.frameInterval) {{
-                        this.lastFrameTime = now - (delta % this.frameInterval);
-                        
-                        if (this.particles.length < this.maxParticles) {{
-                            this.createParticle();
-                        }}
-                    }}
+    // Per-particle slots in the buffer
+    const STRIDE = 7, X = 0, Y = 1, VX = 2, VY = 3, SIZE = 4, AGE = 5, LIFE = 6;
+    const ALPHA_LEVELS = 4;
+    const POINTER_RADIUS = 30;
 
-                    if ({str(cls.USE_REQUEST_ANIMATION_FRAME).lower()}) {{
-                        requestAnimationFrame(() => this.update());
-                    }}
-                }}
+    class ParticleSystem {
+        constructor() {
+            this.canvas = doc.getElementById('particle-canvas') || doc.createElement('canvas');
+            this.canvas.id = 'particle-canvas';
+            this.canvas.style.cssText = 'position: fixed; top: 0; left: 0; width: 100%; height: 100%; z-index: -1; pointer-events: none;';
+            if (!this.canvas.parentNode) doc.body.appendChild(this.canvas);
+            this.ctx = this.canvas.getContext('2d');
+            this.count = Math.min(config.count, config.maxParticles);
+            this.buffer = new Float32Array(config.maxParticles * STRIDE);
+            // Where each particle is drawn this frame
+            this.px = new Float32Array(config.maxParticles);
+            this.py = new Float32Array(config.maxParticles);
+            this.alpha = new Float32Array(config.maxParticles);
+            this.frameInterval = 1000 / config.fpsLimit;
+            this.lastFrame = 0;
+            this.lastStep = 0;
+            this.handle = null;
+            this.pointer = null;
+            this.motion = host.matchMedia ? host.matchMedia('(prefers-reduced-motion: reduce)') : null;
+            this.stats = {frames: 0, cpuMs: 0, since: performance.now()};
+            this.listeners = [];
+        }
 
-                start() {{
-                    // Create initial particles
-                    for (let i = 0; i < {cls.PARTICLE_COUNT}; i++) {{
-                        this.createParticle();
-                    }}
-                    
-                    // Start update loop
-                    this.update();
-                }}
-            }}
-
-            // Initialize particle system
-            document.addEventListener('DOMContentLoaded', () => {{
-                const particleSystem = new ParticleSystem();
-                particleSystem.start();
-            }});
-        </script>
-        """ 
+        listen(target, type, handler) {
+            target.addEventListener(type, handler);
+            this.listeners.push([target, type, handler]);
+        }
+
+        reducedMotion() {
+            return this.motion !== null && this.motion.matches;
+        }
+
+        resize() {
+            const ratio = Math.min(host.devicePixelRatio || 1, 2);
+            this.width = host.innerWidth;
+            this.height = host.innerHeight;
+            this.canvas.width = this.width * ratio;
+            this.canvas.height = this.height * ratio;
+            this.ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+            const range = parseFloat(config.rangeY);
+            this.rangeY = config.rangeY.endsWith('vh') ? range * this.height / 100 : range;
+        }
+
+        spawn(i, age) {
+            const b = this.buffer, o = i * STRIDE;
+            const life = (Math.random() * (config.durationMax - config.durationMin) + config.durationMin) * 1000;
+            b[o + X] = Math.random() * this.width;
+            b[o + Y] = Math.random() * this.height;
+            b[o + SIZE] = Math.random() * (config.maxSize - config.minSize) + config.minSize;
+            b[o + LIFE] = life;
+            b[o + AGE] = age * life;
+            b[o + VX] = config.animation === 'float' ? config.rangeX / life : 0;
+            b[o + VY] = config.animation === 'float' ? -this.rangeY / life : 0;
+        }
+
+        step(dt) {
+            const b = this.buffer;
+            for (let i = 0; i < this.count; i++) {
+                const o = i * STRIDE;
+                b[o + AGE] += dt;
+                if (b[o + AGE] >= b[o + LIFE]) this.spawn(i, 0);
+            }
+        }
+
+        // Drawn position and opacity of every particle at its current age
+        layout() {
+            const b = this.buffer;
+            for (let i = 0; i < this.count; i++) {
+                const o = i * STRIDE;
+                const t = b[o + AGE] / b[o + LIFE];
+                let x = b[o + X] + b[o + VX] * b[o + AGE];
+                let y = b[o + Y] + b[o + VY] * b[o + AGE];
+                let alpha = 1;
+                if (config.animation === 'float') {
+                    alpha = t < 0.1 ? t / 0.1 : t > 0.9 ? (1 - t) / 0.1 : 1;
+                } else if (config.animation === 'bounce') {
+                    y -= 20 * Math.sin(Math.PI * t);
+                } else if (config.animation === 'wave') {
+                    x += 20 * Math.sin(Math.PI * t);
+                }
+                this.px[i] = x;
+                this.py[i] = y;
+                this.alpha[i] = alpha;
+            }
+        }
+
+        near(i) {
+            return this.pointer !== null && Math.abs(this.px[i] - this.pointer.x) < POINTER_RADIUS && Math.abs(this.py[i] - this.pointer.y) < POINTER_RADIUS;
+        }
+
+        shape(x, y, r) {
+            const ctx = this.ctx;
+            if (config.shape === 'square') {
+                ctx.rect(x - r, y - r, 2 * r, 2 * r);
+            } else if (config.shape === 'triangle') {
+                ctx.moveTo(x, y - r);
+                ctx.lineTo(x + r, y + r);
+                ctx.lineTo(x - r, y + r);
+                ctx.closePath();
+            } else {
+                ctx.moveTo(x + r, y);
+                ctx.arc(x, y, r, 0, 2 * Math.PI);
+            }
+        }
+
+        draw() {
+            const ctx = this.ctx, b = this.buffer;
+            this.layout();
+            ctx.clearRect(0, 0, this.width, this.height);
+            ctx.fillStyle = config.color;
+            for (let level = 1; level <= ALPHA_LEVELS; level++) {
+                ctx.beginPath();
+                for (let i = 0; i < this.count; i++) {
+                    if (Math.ceil(this.alpha[i] * ALPHA_LEVELS) !== level || (config.hover && this.near(i))) continue;
+                    this.shape(this.px[i], this.py[i], b[i * STRIDE + SIZE] / 2);
+                }
+                ctx.globalAlpha = level / ALPHA_LEVELS;
+                ctx.fill();
+            }
+            if (config.hover && this.pointer !== null) {
+                // Particles under the pointer are drawn twice the size in the hover color
+                ctx.beginPath();
+                for (let i = 0; i < this.count; i++) {
+                    if (this.near(i)) this.shape(this.px[i], this.py[i], b[i * STRIDE + SIZE]);
+                }
+                ctx.globalAlpha = 1;
+                ctx.fillStyle = config.hoverColor;
+                ctx.fill();
+            }
+        }
+
+        pop(x, y) {
+            this.pointer = {x: x, y: y};
+            for (let i = 0; i < this.count; i++) {
+                if (this.near(i)) this.spawn(i, 0);
+            }
+        }
+
+        frame(now) {
+            this.handle = null;
+            const delta = now - this.lastFrame;
+            if (delta >= this.frameInterval) {
+                const started = performance.now();
+                this.lastFrame = now - (delta % this.frameInterval);
+                // Clamp the step so a long stall doesn't fast-forward every particle
+                this.step(Math.min(now - this.lastStep, 100));
+                this.lastStep = now;
+                this.draw();
+                this.record(performance.now() - started);
+            }
+            this.schedule();
+        }
+
+        schedule() {
+            if (this.handle !== null || doc.hidden || this.reducedMotion()) return;
+            if (config.useRaf) {
+                this.handle = host.requestAnimationFrame((now) => this.frame(now));
+            } else {
+                this.handle = host.setTimeout(() => this.frame(performance.now()), this.frameInterval);
+            }
+        }
+
+        cancel() {
+            if (this.handle === null) return;
+            if (config.useRaf) host.cancelAnimationFrame(this.handle);
+            else host.clearTimeout(this.handle);
+            this.handle = null;
+        }
+
+        resume() {
+            this.lastStep = performance.now();
+            this.schedule();
+        }
+
+        record(cpuMs) {
+            const stats = this.stats;
+            stats.frames += 1;
+            stats.cpuMs += cpuMs;
+            const elapsed = performance.now() - stats.since;
+            if (elapsed < 1000) return;
+            const report = {
+                fps: Math.round(stats.frames * 1000 / elapsed),
+                cpuMsPerSecond: Math.round(stats.cpuMs * 1000 / elapsed * 100) / 100,
+                particles: this.count,
+            };
+            host.__particleStats = report;
+            if (config.harness) {
+                const out = document.getElementById('particle-stats');
+                if (out) out.textContent = `${report.fps} frames/s, ${report.cpuMsPerSecond} ms CPU/s, ${report.particles} particles`;
+            }
+            this.stats = {frames: 0, cpuMs: 0, since: performance.now()};
+        }
+
+        start() {
+            this.resize();
+            for (let i = 0; i < this.count; i++) this.spawn(i, Math.random());
+            this.listen(host, 'resize', () => {
+                this.resize();
+                if (this.handle === null) this.draw();
+            });
+            // Hidden tabs and reduced motion stop the loop entirely instead of idling it
+            this.listen(doc, 'visibilitychange', () => (doc.hidden ? this.cancel() : this.resume()));
+            if (this.motion !== null) {
+                this.listen(this.motion, 'change', () => (this.reducedMotion() ? (this.cancel(), this.draw()) : this.resume()));
+            }
+            if (config.hover) {
+                this.listen(doc, 'pointermove', (e) => { this.pointer = {x: e.clientX, y: e.clientY}; });
+                this.listen(doc, 'pointerleave', () => { this.pointer = null; });
+            }
+            if (config.click) this.listen(doc, 'click', (e) => this.pop(e.clientX, e.clientY));
+            this.draw();
+            this.resume();
+        }
+
+        stop() {
+            this.cancel();
+            for (const [target, type, handler] of this.listeners) target.removeEventListener(type, handler);
+            this.listeners = [];
+        }
+    }
+
+    if (config.harness) {
+        const out = document.createElement('pre');
+        out.id = 'particle-stats';
+        out.textContent = 'Measuring...';
+        document.body.appendChild(out);
+    }
+    host.__particleSystem = new ParticleSystem();
+    host.__particleSystem.start();
+})();
+</script>
+"""
@@ -0,0 +1,41 @@
+"""Measure the canvas particle renderer in the browser.
+
+Usage:
+    streamlit run particle_harness.py
+
+Draws ParticleConfig's particles with the settings chosen in the sidebar and
+reports the frames drawn and the JavaScript CPU time spent drawing them per
+second. Open it on the machine you want to measure; the figures come from
+that browser, not from the server.
+"""
+import streamlit as st
+from streamlit.components.v1 import html
+
+from particle_config import ParticleConfig
+
+st.set_page_config(page_title="Particle Harness", layout="wide")
+st.title("Particle renderer harness")
+
+with st.sidebar:
+    count = st.slider("Particles", 10, 2000, ParticleConfig.PARTICLE_COUNT, step=10)
+    max_particles = st.slider("MAX_PARTICLES", 10, 2000, ParticleConfig.MAX_PARTICLES, step=10)
+    fps_limit = st.select_slider("FPS_LIMIT", [15, 24, 30, 60, 120], ParticleConfig.FPS_LIMIT)
+    animation = st.selectbox("Animation", ["float", "bounce", "wave"])
+    shape = st.selectbox("Shape", ["circle", "square", "triangle"])
+    use_raf = st.checkbox("requestAnimationFrame", ParticleConfig.USE_REQUEST_ANIMATION_FRAME)
+
+# A subclass keeps the settings to this run instead of changing ParticleConfig for every session
+config = type("HarnessConfig", (ParticleConfig,), {
+    'PARTICLE_COUNT': count,
+    'MAX_PARTICLES': max_particles,
+    'FPS_LIMIT': fps_limit,
+    'ANIMATION_TYPE': animation,
+    'PARTICLE_SHAPE': shape,
+    'USE_REQUEST_ANIMATION_FRAME': use_raf,
+})
+
+st.caption(
+    "Frames and CPU time are measured once per second. Drawing stops while the tab is hidden "
+    "or the system asks for reduced motion, so the figures stop updating then."
+)
+html(config.get_particle_script(harness=True), height=60)
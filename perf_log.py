@@ -0,0 +1,154 @@
+import atexit
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+import streamlit as st
+
+import dataset_store
+
+# JSON-lines performance events, one per rerun of main(), including reruns
+# ended by st.rerun() or an exception. The log is opt-in: it stays off unless
+# SALES_DASHBOARD_PERF_LOG is set, to 1/on for DEFAULT_LOG_PATH or to a file path.
+# Other modules add their counters to each event with register_stats, so this
+# module imports none of them.
+PERF_LOG_ENV_VAR = "SALES_DASHBOARD_PERF_LOG"
+DEFAULT_LOG_PATH = os.path.join("logs", "perf_events.jsonl")
+MAX_LOG_BYTES = 10 * 2**20
+BACKUP_COUNT = 5
+QUEUE_SIZE = 10000
+_DISABLED = ("", "0", "off", "false", "no")
+_DEFAULT = ("1", "on", "true", "yes")
+
+_lock = threading.Lock()
+_logger = None
+_listener = None
+_stats = {}
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops events instead of blocking when the queue is full"""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # The event is already a JSON string; skip QueueHandler's formatting
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+def log_path():
+    """Return the configured log path, or None when the event log is disabled"""
+    path = os.environ.get(PERF_LOG_ENV_VAR, "").strip()
+    if path.lower() in _DISABLED:
+        return None
+    if path.lower() in _DEFAULT:
+        return DEFAULT_LOG_PATH
+    return path
+
+
+def enabled():
+    return log_path() is not None
+
+
+def _get_logger():
+    """Create the process-wide queue-backed logger on first use"""
+    global _logger, _listener
+    if _logger is not None:
+        return _logger
+    with _lock:
+        if _logger is None:
+            path = log_path()
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
+            )
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+            events = queue.Queue(maxsize=QUEUE_SIZE)
+            _listener = logging.handlers.QueueListener(events, file_handler)
+            _listener.start()
+            atexit.register(_listener.stop)
+
+            logger = logging.getLogger("sales_dashboard.perf")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(_DroppingQueueHandler(events))
+            _logger = logger
+    return _logger
+
+
+def register_stats(group, name, stats):
+    """Add ``stats()`` to every event as event[group][name]; called only while the log is on"""
+    with _lock:
+        _stats.setdefault(group, {})[name] = stats
+
+
+def _registered_stats():
+    with _lock:
+        groups = {group: dict(entries) for group, entries in _stats.items()}
+    return {group: {name: stats() for name, stats in entries.items()} for group, entries in groups.items()}
+
+
+def hash_value(value):
+    """Stable short hash of a JSON-serialisable value (used for filter values)"""
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def session_memory_mb(frames):
+    """Shallow memory of the dataset this session references (shared with other sessions)"""
+    total = sum(int(df.memory_usage(index=True, deep=False).sum()) for df in frames.values())
+    return round(total / 2**20, 2)
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return hash_value(ctx.session_id) if ctx else None
+    except Exception:
+        return None
+
+
+def log_rerun(run):
+    """Queue one event describing the rerun recorded in ``run``"""
+    if run is None or not enabled():
+        return
+
+    frames = dataset_store.session_frames() or {}
+    rows = {f"df_{name}": len(df) for name, df in frames.items()}
+
+    stages = {}
+    for record in run.sections:
+        stages[record.name] = round(stages.get(record.name, 0) + record.wall_ms, 2)
+
+    event = {
+        "ts": round(time.time(), 3),
+        "session": _session_id(),
+        "page": run.page,
+        "dataset": dataset_store.session_fingerprint(),
+        "rows": rows,
+        "filters": hash_value(run.meta["filters"]) if "filters" in run.meta else None,
+        "outcome": run.meta.get("outcome", "ok"),
+        "total_ms": round(run.elapsed_ms(), 2),
+        "stages": stages,
+        "session_mem_mb": session_memory_mb(frames),
+        "store": dataset_store.get_store().stats(),
+    }
+    event.update(_registered_stats())
+    if _DroppingQueueHandler.dropped:
+        event["dropped_events"] = _DroppingQueueHandler.dropped
+    _get_logger().info(json.dumps(event, default=str))
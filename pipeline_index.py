@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import analytics
+
+# The Pipeline Analysis sliders move in 5% probability steps and whole-lakh
+# amount steps. Each value is bucketed on a half-step grid: a value exactly on
+# a slider step gets an even key, a value between two steps the odd key in
+# between, so every inclusive slider range maps to a contiguous key range and
+# range sums over the buckets equal the row-level `between` filters exactly.
+PROBABILITY_STEP = 5
+AMOUNT_STEP = 100000
+PROBABILITY_KEYS = 2 * 100 // PROBABILITY_STEP + 3  # plus one sentinel key below 0 and one above 100
+
+# Largest prefix-sum tensor (in cells) built before falling back to scanning rows
+MAX_INDEX_CELLS = 8_000_000
+
+# Timeline selector windows, in months from today
+TIMELINE_MONTHS = {"Next Quarter": 3, "Next 6 Months": 6, "Next Year": 12}
+
+
+def _half_step_keys(values, step):
+    scaled = values / step
+    lower = np.floor(scaled)
+    return np.where(scaled == lower, 2 * lower, 2 * lower + 1).astype(np.int64)
+
+
+def _prefix_sums(cells):
+    """Zero-padded 2-D prefix sums over the last two axes"""
+    padded = np.zeros(cells.shape[:-2] + (cells.shape[-2] + 1, cells.shape[-1] + 1), dtype=cells.dtype)
+    padded[..., 1:, 1:] = cells.cumsum(axis=-2).cumsum(axis=-1)
+    return padded
+
+
+class PipelineIndex:
+    """Prefix sums over (probability bucket, amount bucket) per stage and close month.
+
+    Built once per dataset; each slider change is then answered with four
+    lookups per stage/month instead of a pass over every row. The rows are
+    also kept sorted by Expected Close Date, so a Timeline window resolves to
+    a contiguous row range with searchsorted and only that range is scanned.
+    """
+
+    def __init__(self, df):
+        df = df[df['Amount'].notna()]
+        amount = df['Amount'].to_numpy(dtype=float)
+        self.amount_bounds = (
+            (int(amount.min() / AMOUNT_STEP), int(amount.max() / AMOUNT_STEP)) if len(amount) else (0, 0)
+        )
+
+        probability = df['Probability_Num'].to_numpy(dtype=float)
+        # Out-of-range (and missing) probabilities land in the sentinel keys, which no slider range covers
+        prob_keys = np.clip(
+            _half_step_keys(np.nan_to_num(probability, nan=-1.0), PROBABILITY_STEP) + 1, 0, PROBABILITY_KEYS - 1
+        )
+
+        # Amount keys are compressed to the values that actually occur
+        self.amount_keys, amount_codes = np.unique(_half_step_keys(amount, AMOUNT_STEP), return_inverse=True)
+        cells = (PROBABILITY_KEYS, len(self.amount_keys))
+        flat = prob_keys * cells[1] + amount_codes
+
+        stage_codes, self.stages = pd.factorize(df['Sales Stage'], sort=True)
+        dates = df['Expected Close Date']
+        dated = dates.notna().to_numpy()
+        month_numbers = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=float)
+        self.first_month = int(np.nanmin(month_numbers)) if dated.any() else 0
+        month_codes = np.where(dated, month_numbers - self.first_month, 0).astype(np.int64)
+        months = int(month_codes[dated].max()) + 1 if dated.any() else 0
+
+        # Row arrays sorted by close date (undated rows last) for Timeline windows
+        close = dates.to_numpy(dtype='datetime64[ns]')
+        order = np.argsort(np.where(dated, close.view(np.int64), np.iinfo(np.int64).max), kind='stable')
+        self.dated_rows = int(dated.sum())
+        self.close_dates = close[order[:self.dated_rows]]
+        self.sorted_probability = probability[order]
+        self.sorted_amount = amount[order]
+        self.sorted_stages = stage_codes[order]
+        self.sorted_months = np.where(dated, month_codes, -1)[order]
+        self.months = months
+
+        self.size = (len(self.stages) + 2 * months + 1) * (cells[0] + 1) * (cells[1] + 1)
+        if self.size > MAX_INDEX_CELLS:
+            self.stage_counts = self.month_counts = self.month_amounts = self.amounts = None
+            return
+
+        n_cells = cells[0] * cells[1]
+        staged = stage_codes >= 0
+        self.stage_counts = _prefix_sums(np.bincount(
+            stage_codes[staged] * n_cells + flat[staged], minlength=len(self.stages) * n_cells
+        ).reshape((len(self.stages),) + cells))
+        self.month_counts = _prefix_sums(np.bincount(
+            month_codes[dated] * n_cells + flat[dated], minlength=months * n_cells
+        ).reshape((months,) + cells))
+        self.month_amounts = _prefix_sums(np.bincount(
+            month_codes[dated] * n_cells + flat[dated], weights=amount[dated], minlength=months * n_cells
+        ).reshape((months,) + cells))
+        self.amounts = _prefix_sums(np.bincount(flat, weights=amount, minlength=n_cells).reshape(cells))
+
+    @property
+    def built(self):
+        return self.amounts is not None
+
+    def supports(self, probability_range):
+        """True when the probability bounds fall on the slider grid the index is exact for"""
+        return self.built and all(bound % PROBABILITY_STEP == 0 for bound in probability_range)
+
+    def _probability_slice(self, low, high):
+        # +1 for the sentinel key below 0; key 2 * bound / step is the bound itself
+        return 2 * int(low) // PROBABILITY_STEP + 1, 2 * int(high) // PROBABILITY_STEP + 2
+
+    def _amount_slice(self, low, high):
+        return (
+            int(np.searchsorted(self.amount_keys, 2 * int(low), side='left')),
+            int(np.searchsorted(self.amount_keys, 2 * int(high), side='right')),
+        )
+
+    @staticmethod
+    def _range_sum(prefix, rows, cols):
+        (r0, r1), (c0, c1) = rows, cols
+        return prefix[..., r1, c1] - prefix[..., r0, c1] - prefix[..., r1, c0] + prefix[..., r0, c0]
+
+    def window(self, timeline, today=None):
+        """Row range of the date-sorted arrays for a Timeline option; None means every row"""
+        months = TIMELINE_MONTHS.get(timeline)
+        if months is None:
+            return None
+        start = (today or pd.Timestamp.now()).normalize()
+        end = start + pd.DateOffset(months=months)
+        bounds = np.array([start, end], dtype='datetime64[ns]')
+        first, last = np.searchsorted(self.close_dates, bounds, side='left')
+        return int(first), int(last)
+
+    def query(self, probability_range, amount_range, rows=None):
+        """Same (stages, probability, timeline) frames as the engines' pipeline_summary.
+
+        ``rows`` restricts the query to a range from window(); the range is
+        scanned, while unrestricted queries on the 5% grid use the prefix sums.
+        """
+        if rows is None and self.supports(probability_range):
+            return self._lookup(probability_range, amount_range)
+        if rows is None:
+            rows = (0, len(self.sorted_amount))
+        return self._scan(probability_range, amount_range, rows)
+
+    def _scan(self, probability_range, amount_range, rows):
+        r0, r1 = rows
+        probability = self.sorted_probability[r0:r1]
+        amount = self.sorted_amount[r0:r1]
+        keep = (
+            (probability >= probability_range[0]) & (probability <= probability_range[1]) &
+            (amount >= amount_range[0] * AMOUNT_STEP) & (amount <= amount_range[1] * AMOUNT_STEP)
+        )
+        stage_codes = self.sorted_stages[r0:r1][keep]
+        counts = np.bincount(stage_codes[stage_codes >= 0], minlength=len(self.stages))
+
+        # pd.cut semantics: bands (0, 25], (25, 50], ... and nothing outside (0, 100]
+        band_codes = np.searchsorted(analytics.PROBABILITY_BINS, probability[keep], side='left') - 1
+        in_band = (band_codes >= 0) & (band_codes < len(analytics.PROBABILITY_LABELS))
+        bands = np.bincount(
+            band_codes[in_band], weights=amount[keep][in_band], minlength=len(analytics.PROBABILITY_LABELS)
+        )
+
+        month_codes = self.sorted_months[r0:r1][keep]
+        dated = month_codes >= 0
+        month_counts = np.bincount(month_codes[dated], minlength=self.months)
+        month_amounts = np.bincount(month_codes[dated], weights=amount[keep][dated], minlength=self.months)
+        return self._frames(counts, bands, month_counts, month_amounts)
+
+    def _lookup(self, probability_range, amount_range):
+        rows = self._probability_slice(*probability_range)
+        cols = self._amount_slice(*amount_range)
+
+        counts = self._range_sum(self.stage_counts, rows, cols)
+        bands = []
+        for low, high in zip(analytics.PROBABILITY_BINS[:-1], analytics.PROBABILITY_BINS[1:]):
+            # Band (low, high] excludes its lower bound, i.e. starts one key above it
+            band_rows = self._probability_slice(low, high)
+            band_rows = (max(rows[0], band_rows[0] + 1), min(rows[1], band_rows[1]))
+            bands.append(self._range_sum(self.amounts, band_rows, cols) if band_rows[0] < band_rows[1] else 0.0)
+        month_counts = self._range_sum(self.month_counts, rows, cols)
+        month_amounts = self._range_sum(self.month_amounts, rows, cols)
+        return self._frames(counts, bands, month_counts, month_amounts)
+
+    def _frames(self, counts, bands, month_counts, month_amounts):
+        stages = pd.DataFrame({'Sales Stage': np.asarray(self.stages), 'Deals': counts.astype(int)})
+        stages = stages[stages['Deals'] > 0].sort_values(
+            ['Deals', 'Sales Stage'], ascending=[False, True], kind='mergesort'
+        ).reset_index(drop=True)
+
+        probability = pd.DataFrame({
+            'Band': analytics.PROBABILITY_LABELS,
+            'Amount': np.asarray(bands, dtype=float) / AMOUNT_STEP,
+        })
+
+        present = np.flatnonzero(month_counts)
+        if len(present):
+            codes = np.arange(present[0], present[-1] + 1)
+            months = pd.PeriodIndex.from_ordinals(codes + self.first_month - 1970 * 12, freq='M')
+            timeline = pd.DataFrame({'Month': months, 'Amount': month_amounts[codes] / AMOUNT_STEP})
+        else:
+            timeline = pd.DataFrame({'Month': pd.PeriodIndex([], freq='M'), 'Amount': np.array([], dtype=float)})
+        return stages, probability, timeline
+
+
+@st.cache_resource(max_entries=8)
+def get_index(key, _df):
+    """PipelineIndex for a processed dataset, built once per dataset ``key``"""
+    return PipelineIndex(_df)
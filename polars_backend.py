@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import analytics
+import filter_spec
+
+try:
+    import polars as pl
+except ImportError:  # Polars is optional; analytics falls back to the pandas engine
+    pl = None
+
+DATE_FORMAT = '%d-%m-%Y'
+
+
+def available():
+    return pl is not None
+
+
+def _to_polars(series):
+    """Polars copy of a pandas column; numeric and Arrow-backed columns convert without copying"""
+    try:
+        return pl.from_pandas(series)
+    except Exception:
+        # Excel columns can mix numbers, strings and dates; treat them as text
+        return pl.from_pandas(series.astype('string'))
+
+
+def _frame(df, columns):
+    return pl.DataFrame([_to_polars(df[column]).alias(column) for column in columns if column in df.columns])
+
+
+def _to_pandas(frame, index):
+    """Hand a collected result back to pandas through Arrow (zero-copy for numeric columns)"""
+    result = frame.to_arrow().to_pandas(split_blocks=True)
+    result.index = index
+    return result
+
+
+def _dates(series):
+    """Close dates as a polars expression input, parsed like pd.to_datetime(format=DATE_FORMAT)"""
+    if series.dtype == object:
+        values = series.dropna()
+        if not values.map(lambda x: isinstance(x, str)).all():
+            # Mixed Excel dates and text: let pandas coerce, then hand over the datetimes
+            return pl.from_pandas(pd.to_datetime(series, format=DATE_FORMAT, errors='coerce'))
+    return _to_polars(series)
+
+
+def process_data(df):
+    """Polars implementation of analytics.process_data_pandas"""
+    frame = pl.DataFrame([
+        _dates(df['Expected Close Date']).alias('date'),
+        _to_polars(df['Probability']).alias('probability'),
+        _to_polars(df['Sales Stage']).alias('stage'),
+        _to_polars(df['Amount']).alias('amount'),
+    ])
+
+    date = pl.col('date')
+    if frame.schema['date'] == pl.String:
+        date = date.str.strptime(pl.Datetime('us'), DATE_FORMAT, strict=False)
+    elif frame.schema['date'] == pl.Date:
+        date = date.cast(pl.Datetime('us'))
+
+    probability = pl.col('probability')
+    if frame.schema['probability'].is_numeric():
+        probability = probability.cast(pl.Float64)
+    else:
+        probability = (
+            probability.cast(pl.String).str.strip_chars_end('%').str.strip_chars()
+            .cast(pl.Float64, strict=False)
+        )
+
+    amount_lacs = (pl.col('amount').cast(pl.Float64).fill_null(0) / 100000).round(0, mode='half_to_even')
+
+    processed = (
+        frame.lazy()
+        .select(
+            date.alias('Expected Close Date'),
+            probability.fill_null(0).alias('Probability_Num'),
+            pl.col('stage').cast(pl.String).str.contains('(?i)won').fill_null(False).alias('Is_Won'),
+            amount_lacs.cast(pl.Int64).alias('Amount_Lacs'),
+        )
+        .with_columns(
+            pl.col('Expected Close Date').dt.strftime('%B').alias('Month'),
+            pl.col('Expected Close Date').dt.year().alias('Year'),
+            (pl.lit('Q') + pl.col('Expected Close Date').dt.quarter().cast(pl.String)).alias('Quarter'),
+            (pl.col('Amount_Lacs') * pl.col('Probability_Num') / 100)
+            .round(0, mode='half_to_even').cast(pl.Int64).alias('Weighted_Amount'),
+        )
+        .select(
+            'Expected Close Date', 'Month', 'Year', 'Quarter',
+            'Probability_Num', 'Is_Won', 'Amount_Lacs', 'Weighted_Amount',
+        )
+        .collect()
+    )
+
+    derived = _to_pandas(processed, df.index)
+    return df.assign(**{column: derived[column] for column in derived.columns})
+
+
+def _compile(predicate, columns):
+    """Polars expression for one filter_spec predicate; None when it can't match any row.
+
+    Mirrors the predicates' own evaluation: a missing column keeps no rows, and
+    search looks for the lower-cased text in the columns that exist.
+    """
+    if isinstance(predicate, filter_spec._Search):
+        searched = [column for column in (predicate.columns or columns) if column in columns]
+        if not searched:
+            return None
+        return pl.any_horizontal([
+            pl.col(column).cast(pl.String).str.to_lowercase()
+            .str.contains(predicate.text, literal=True).fill_null(False)
+            for column in searched
+        ])
+    if predicate.column not in columns:
+        return None
+    column = pl.col(predicate.column)
+    if isinstance(predicate, filter_spec._IsIn):
+        return column.is_in(predicate.values)
+    condition = pl.lit(True)
+    if predicate.low is not None:
+        condition &= column >= predicate.low if predicate.inclusive in ('both', 'left') else column > predicate.low
+    if predicate.high is not None:
+        condition &= column <= predicate.high if predicate.inclusive in ('both', 'right') else column < predicate.high
+    return condition
+
+
+@st.cache_resource(max_entries=8)
+def _cached_frame(key, _df):
+    return _frame(_df, _df.columns)
+
+
+class PolarsEngine(analytics.PandasEngine):
+    """Row filtering, team metrics and the YTD/Quarter Summary aggregates on Polars lazy frames.
+
+    Queries only read the columns they reference (projection pushdown) and run
+    on all cores; the remaining aggregates are inherited from the pandas engine.
+    """
+
+    name = "polars"
+
+    def __init__(self, df, key=None):
+        self.df = df
+        self._frame = _cached_frame(key, df) if key is not None else None
+        self._columns = {}
+
+    def _lazy(self, *columns):
+        if self._frame is not None:
+            return self._frame.lazy().select(columns)
+        # Without a dataset key, convert each column once per engine
+        for column in columns:
+            if column not in self._columns:
+                self._columns[column] = _to_polars(self.df[column]).alias(column)
+        return pl.DataFrame([self._columns[column] for column in columns]).lazy()
+
+    def team_metrics(self):
+        """Per Sales Owner totals used by the Sales Team KPI cards"""
+        won = pl.col('Is_Won')
+        total = pl.col('Closed Deals') + pl.col('Pipeline Deals')
+        metrics = (
+            self._lazy('Sales Owner', 'Amount', 'Is_Won', 'Amount_Lacs', 'Weighted_Amount')
+            .filter(pl.col('Sales Owner').is_not_null())
+            .group_by('Sales Owner')
+            .agg(
+                (pl.col('Amount').filter(won).sum() / 100000).cast(pl.Int64).alias('Closed Won'),
+                won.sum().cast(pl.Int64).alias('Closed Deals'),
+                pl.col('Amount_Lacs').filter(~won).sum().cast(pl.Int64).alias('Current Pipeline'),
+                pl.col('Weighted_Amount').filter(~won).sum().cast(pl.Int64).alias('Weighted Projections'),
+                (~won).sum().cast(pl.Int64).alias('Pipeline Deals'),
+            )
+            .with_columns(
+                pl.when(total > 0)
+                .then((pl.col('Closed Deals') / total * 100).round(0, mode='half_to_even'))
+                .otherwise(0)
+                .cast(pl.Int64)
+                .alias('Win Rate')
+            )
+            .sort('Sales Owner')
+            .collect()
+        )
+        return metrics.to_arrow().to_pandas(split_blocks=True)
+
+    def filter_mask(self, filters):
+        """Boolean row mask for the Sales Team filters (see filter_spec.sales_team)"""
+        return self.spec_mask(filter_spec.sales_team(filters))
+
+    def spec_mask(self, spec):
+        """Boolean row mask of a filter_spec.FilterSpec, evaluated as one Polars expression"""
+        if not spec.predicates:
+            return np.ones(len(self.df), dtype=bool)
+        conditions = [_compile(predicate, self.df.columns) for predicate in spec.predicates]
+        if any(condition is None for condition in conditions):
+            return np.zeros(len(self.df), dtype=bool)
+        mask = pl.all_horizontal(conditions).fill_null(False).alias('mask')
+        columns = sorted(set().union(*(condition.meta.root_names() for condition in conditions)))
+        return self._lazy(*columns).select(mask).collect()['mask'].to_numpy()
+
+    def _selected(self, selections, *columns):
+        lazy = self._lazy(*dict.fromkeys(list(selections) + list(columns)))
+        for column, value in selections.items():
+            lazy = lazy.filter(pl.col(column) == value)
+        return lazy
+
+    def quarter_summary(self, selections):
+        """Amount per Quarter Summary status after equality ``selections`` ({column: value})"""
+        amounts = (
+            self._selected(selections, 'Status', 'Amount')
+            .filter(pl.col('Status').is_in(analytics.QUARTER_STATUSES))
+            .group_by('Status')
+            .agg(pl.col('Amount').sum())
+            .collect()
+        )
+        totals = dict(zip(amounts['Status'].to_list(), amounts['Amount'].to_list()))
+        return {status: float(totals.get(status) or 0.0) for status in analytics.QUARTER_STATUSES}
+
+    def ytd_summary(self, selections, won_column=None):
+        """Deal counts and amounts behind the YTD KPI cards; ``won_column`` is a boolean won flag"""
+        if won_column:
+            won = pl.col(won_column).fill_null(False)
+            lazy = self._selected(selections, 'Amount', won_column)
+        else:
+            won = pl.lit(False)
+            lazy = self._selected(selections, 'Amount')
+        summary = lazy.select(
+            pl.len().alias('deals'),
+            pl.col('Amount').sum().alias('amount'),
+            won.sum().alias('won_deals'),
+            pl.col('Amount').filter(won).sum().alias('won_amount'),
+        ).collect().row(0, named=True)
+        return {
+            'deals': int(summary['deals']),
+            'amount': float(summary['amount'] or 0.0),
+            'won_deals': int(summary['won_deals']),
+            'won_amount': float(summary['won_amount'] or 0.0),
+        }
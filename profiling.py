@@ -0,0 +1,198 @@
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# Profiling is opt-in: add ?profile=1 to the URL or set SALES_DASHBOARD_PROFILE=1
+PROFILE_ENV_VAR = "SALES_DASHBOARD_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+_TRUTHY = ("1", "true", "yes", "on")
+
+# Each Streamlit session reruns its script on its own thread, so the active
+# run is tracked per thread rather than in module globals.
+_local = threading.local()
+
+
+class SectionRecord:
+    """Timing and memory figures for one profiled section of a rerun"""
+
+    __slots__ = ("name", "depth", "wall_ms", "alloc_mb", "peak_mb", "rows", "cache",
+                 "_start", "_mem_start", "_peak_seen")
+
+    def __init__(self, name, depth, rows=None):
+        self.name = name
+        self.depth = depth
+        self.wall_ms = 0.0
+        self.alloc_mb = None
+        self.peak_mb = None
+        self.rows = rows
+        self.cache = None
+        self._start = 0.0
+        self._mem_start = 0
+        self._peak_seen = 0
+
+
+class RunProfile:
+    """All sections recorded during a single rerun of the script"""
+
+    def __init__(self, page=None, trace_memory=True, show_panel=True):
+        self.page = page
+        self.trace_memory = trace_memory
+        self.show_panel = show_panel
+        self.sections = []
+        self.stack = []
+        self.meta = {}
+        self.started = time.perf_counter()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+
+def profiling_enabled():
+    """Return True when profiling was requested via env var or query param"""
+    if os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in _TRUTHY:
+        return True
+    try:
+        return str(st.query_params.get(PROFILE_QUERY_PARAM, "")).lower() in _TRUTHY
+    except Exception:
+        return False
+
+
+def start_run(page=None, record_timings=False):
+    """Begin profiling a rerun.
+
+    With profiling disabled this is a no-op unless ``record_timings`` is set,
+    in which case section wall times are still collected (without tracemalloc
+    or the sidebar panel) for the performance event log.
+    """
+    enabled = profiling_enabled()
+    if not enabled and not record_timings:
+        _local.run = None
+        return None
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _local.run = RunProfile(page, trace_memory=enabled, show_panel=enabled)
+    return _local.run
+
+
+def current_run():
+    """Return the active RunProfile for this thread, if any"""
+    return getattr(_local, "run", None)
+
+
+def annotate(**values):
+    """Attach metadata such as the active filters to the current rerun"""
+    run = current_run()
+    if run is not None:
+        run.meta.update(values)
+
+
+@contextmanager
+def section(name, rows=None):
+    """Time a block of code and record it against the current rerun.
+
+    Memory figures come from tracemalloc, which is process-wide: with several
+    sessions rerunning at once they include the other sessions' allocations.
+    """
+    run = current_run()
+    if run is None:
+        yield None
+        return
+
+    record = SectionRecord(name, len(run.stack), rows)
+    run.sections.append(record)
+    if run.trace_memory and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        # Hand the peak reached so far to the enclosing sections before resetting it
+        for parent in run.stack:
+            parent._peak_seen = max(parent._peak_seen, peak)
+        tracemalloc.reset_peak()
+        record._mem_start = current
+        record._peak_seen = current
+    run.stack.append(record)
+    record._start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.wall_ms = (time.perf_counter() - record._start) * 1000
+        run.stack.pop()
+        if run.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, record._peak_seen)
+            record.alloc_mb = (current - record._mem_start) / 2**20
+            record.peak_mb = (peak - record._mem_start) / 2**20
+            for parent in run.stack:
+                parent._peak_seen = max(parent._peak_seen, peak)
+            tracemalloc.reset_peak()
+
+
+def _row_count(args, kwargs):
+    for value in list(args) + list(kwargs.values()):
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return None
+
+
+def profiled_cache(name=None, **cache_kwargs):
+    """Drop-in replacement for ``st.cache_data`` that records hits and misses.
+
+    The wrapped function only executes on a cache miss, so it flags the miss on
+    the active section; anything else is reported as a hit.
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            run = current_run()
+            if run is not None and run.stack:
+                run.stack[-1].cache = "miss"
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(**cache_kwargs)(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_run() is None:
+                return cached(*args, **kwargs)
+            with section(label, rows=_row_count(args, kwargs)) as record:
+                result = cached(*args, **kwargs)
+                if record.cache is None:
+                    record.cache = "hit"
+            return result
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorator
+
+
+def render_panel():
+    """Show the current rerun's sections in a sidebar panel"""
+    run = current_run()
+    if run is None or not run.show_panel:
+        return
+
+    total_ms = run.elapsed_ms()
+    rows = []
+    for record in run.sections:
+        rows.append({
+            "Section": " " * record.depth + record.name,
+            "Wall (ms)": round(record.wall_ms, 1),
+            "Alloc (MB)": None if record.alloc_mb is None else round(record.alloc_mb, 2),
+            "Peak (MB)": None if record.peak_mb is None else round(record.peak_mb, 2),
+            "Rows": record.rows,
+            "Cache": record.cache or "",
+        })
+
+    with st.sidebar.expander("⏱️ Profiler", expanded=True):
+        st.caption(f"Rerun of {run.page or 'page'}: {total_ms:,.0f} ms")
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No sections recorded")
@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import streamlit as st
+
+import perf_log
+
+# Sign-in rate limiting shared by every session of the process. Each (username,
+# client address) pair gets a token bucket holding CAPACITY attempts that refills
+# one attempt every REFILL_SECONDS; an attempt with an empty bucket is rejected
+# before any password hashing. Buckets live in memory, or in a SQLite file when
+# SALES_DASHBOARD_RATE_LIMIT_DB is set, so they survive restarts and are shared
+# by every server process using that file.
+RATE_LIMIT_DB_ENV_VAR = "SALES_DASHBOARD_RATE_LIMIT_DB"
+CAPACITY = 3
+REFILL_SECONDS = 100  # an empty bucket is full again after 5 minutes
+MAX_MEMORY_BUCKETS = 10000
+PRUNE_EVERY = 1000
+
+
+def _refill(tokens, updated, now, capacity, refill_seconds):
+    return min(capacity, tokens + (now - updated) / refill_seconds)
+
+
+class MemoryBuckets:
+    """Token buckets in a process-wide LRU dictionary"""
+
+    backend = "memory"
+
+    def __init__(self, capacity=CAPACITY, refill_seconds=REFILL_SECONDS, max_buckets=MAX_MEMORY_BUCKETS):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, key, now):
+        """Seconds until ``key`` may try again; 0 when a token was taken"""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = _refill(tokens, updated, now, self.capacity, self.refill_seconds)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) * self.refill_seconds
+            self._buckets[key] = (tokens - 1 if not wait else tokens, now)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class SQLiteBuckets:
+    """Token buckets in a SQLite table, shared by every process using ``path``"""
+
+    backend = "sqlite"
+
+    def __init__(self, path, capacity=CAPACITY, refill_seconds=REFILL_SECONDS):
+        self.path = path
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self._takes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS login_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the store safe across script threads
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    def __len__(self):
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM login_buckets").fetchone()[0]
+
+    def take(self, key, now):
+        """Seconds until ``key`` may try again; 0 when a token was taken"""
+        with self._connect() as db:
+            # IMMEDIATE takes the write lock up front so concurrent takes can't both spend the last token
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT tokens, updated FROM login_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (self.capacity, now)
+            tokens = _refill(tokens, updated, now, self.capacity, self.refill_seconds)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) * self.refill_seconds
+            db.execute(
+                "INSERT OR REPLACE INTO login_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens - 1 if not wait else tokens, now),
+            )
+            self._takes += 1
+            if self._takes % PRUNE_EVERY == 0:
+                # Buckets untouched for a full refill are full again; drop them
+                db.execute(
+                    "DELETE FROM login_buckets WHERE updated < ?",
+                    (now - self.capacity * self.refill_seconds,),
+                )
+        return wait
+
+    def reset(self, key):
+        with self._connect() as db:
+            db.execute("DELETE FROM login_buckets WHERE key = ?", (key,))
+
+
+class RateLimiter:
+    """Sign-in attempts per (username, client) with allowed/limited counters"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts = {'allowed': 0, 'limited': 0}
+
+    @staticmethod
+    def _key(username, client):
+        return f"{username}\x00{client or ''}"
+
+    def attempt(self, username, client=None):
+        """Seconds the caller must wait before trying again; 0 when the attempt may proceed"""
+        wait = self.buckets.take(self._key(username, client), time.time())
+        with self._lock:
+            self._counts['limited' if wait else 'allowed'] += 1
+        return wait
+
+    def succeeded(self, username, client=None):
+        """Refill the bucket after a successful sign-in"""
+        self.buckets.reset(self._key(username, client))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts)
+        stats.update(backend=self.buckets.backend, buckets=len(self.buckets))
+        return stats
+
+
+def client_address():
+    """The connecting client's address, or None outside a browser session.
+
+    X-Forwarded-For is not trusted: a client could rotate it to get fresh
+    buckets. Behind a proxy every client shares the proxy's address, so the
+    limit still applies per username.
+    """
+    try:
+        address = st.context.ip_address
+    except Exception:
+        return None
+    return address if isinstance(address, str) else None
+
+
+@st.cache_resource
+def get_limiter() -> RateLimiter:
+    """The RateLimiter shared by every session of this process"""
+    path = os.environ.get(RATE_LIMIT_DB_ENV_VAR)
+    return RateLimiter(SQLiteBuckets(path) if path else MemoryBuckets())
+
+
+perf_log.register_stats("login", "rate_limit", lambda: get_limiter().stats())
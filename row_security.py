@@ -0,0 +1,130 @@
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+import auth
+import dataset_store
+
+# Row-level security for signed-in users (see auth.load_users). A user sees the
+# deals whose Sales Owner is their own name or one of their team's, plus every
+# deal of the practices they head; FULL_ACCESS_ROLES see everything, sessions
+# that haven't signed in see nothing. Permitted rows are computed once per
+# dataset and scope as position arrays over the shared frames, and only those
+# arrays are cached. The scoped Dataset taken from them, with its own cache key,
+# lives as long as a session holds it and is shared by sessions whose scopes
+# are identical, so every page's filters and cached aggregates run on the
+# permitted rows only without the copies outliving their sessions.
+FULL_ACCESS_ROLES = ('admin',)
+MAX_CACHED_POSITIONS = 32
+# Session-state key holding this session's scoped Dataset
+SCOPED_KEY = "scoped_dataset"
+
+
+class Scope:
+    """Sales Owners and Practices whose deals a user may see, or ``everything``"""
+
+    def __init__(self, owners=(), practices=(), everything=False):
+        self.owners = frozenset(owners)
+        self.practices = frozenset(practices)
+        self.everything = everything
+
+    @property
+    def key(self):
+        """Identifier shared by every user with the same scope"""
+        if self.everything:
+            return "all"
+        text = json.dumps([sorted(map(str, self.owners)), sorted(map(str, self.practices))])
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+    def positions(self, catalog):
+        """Sorted positions of the permitted rows of the frame behind ``catalog``"""
+        allowed = None
+        for column, values in (('Sales Owner', self.owners), ('Practice', self.practices)):
+            dimension = catalog[column]
+            # The trailing slot is read by rows without a value (code -1)
+            lookup = np.append(np.isin(np.asarray(dimension.values, dtype=object), list(values)), False)
+            rows = lookup[dimension.codes]
+            allowed = rows if allowed is None else allowed | rows
+        return np.flatnonzero(allowed)
+
+
+EVERYTHING = Scope(everything=True)
+
+
+def user_scope(username, users=None):
+    """Scope of a user record; unknown users see nothing"""
+    users = auth.load_users() if users is None else users
+    user = users.get(username)
+    if user is None:
+        return Scope()
+    if user.get('role') in FULL_ACCESS_ROLES:
+        return EVERYTHING
+    owners = [user.get('sales_owner', username)] + list(user.get('team', []))
+    return Scope(owners, user.get('practices', []))
+
+
+def session_scope():
+    """This session's scope; sessions that haven't signed in see nothing"""
+    if not auth.is_authenticated():
+        return Scope()
+    return user_scope(auth.get_current_user())
+
+
+@st.cache_resource
+def _scoped_cache():
+    """(LRU of permitted positions, live scoped Datasets, lock), keyed by (fingerprint, scope key)"""
+    return OrderedDict(), weakref.WeakValueDictionary(), threading.Lock()
+
+
+def positions(dataset, scope):
+    """{frame name: permitted row positions} of ``dataset``, computed once per dataset and scope"""
+    cache, _, lock = _scoped_cache()
+    key = (dataset.fingerprint, scope.key)
+    with lock:
+        permitted = cache.get(key)
+        if permitted is not None:
+            cache.move_to_end(key)
+            return permitted
+    permitted = {name: scope.positions(dataset.catalog(name)) for name in dataset.frames}
+    with lock:
+        cache[key] = permitted
+        while len(cache) > MAX_CACHED_POSITIONS:
+            cache.popitem(last=False)
+    return permitted
+
+
+def restrict(dataset, scope):
+    """``dataset`` limited to the rows ``scope`` permits, shared while any session holds it"""
+    if dataset is None or scope.everything:
+        return dataset
+    _, live, lock = _scoped_cache()
+    key = (dataset.fingerprint, scope.key)
+    with lock:
+        scoped = live.get(key)
+    if scoped is None:
+        scoped = dataset.restricted(positions(dataset, scope), scope.key)
+        with lock:
+            scoped = live.setdefault(key, scoped)
+    return scoped
+
+
+def has_rows(dataset):
+    """False for a scoped dataset in which the user may see no deal at all"""
+    return any(len(df) for df in dataset.frames.values())
+
+
+def session_dataset():
+    """This session's Dataset limited to the signed-in user's rows, or None before upload"""
+    shared = dataset_store.session_dataset()
+    dataset = restrict(shared, session_scope())
+    # The session keeps its scoped frames alive; they are freed with the last
+    # session using them, or when this one moves to other data or another scope
+    held = dataset if dataset is not shared else None
+    if st.session_state.get(SCOPED_KEY) is not held:
+        st.session_state[SCOPED_KEY] = held
+    return dataset
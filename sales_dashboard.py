@@ -5,7 +5,24 @@ import plotly.graph_objects as go
 from datetime import datetime
 import numpy as np
 import io
+import time
 from functools import lru_cache
+import assets
+import auth
+import lite
+import profiling
+import perf_log
+import dataset_store
+import row_security
+import analytics
+import pipeline_index
+import crossfilter
+import forecast
+import olap
+import scenario
+import facets
+import fiscal
+import filter_spec
 
 # This must be the first Streamlit command
 st.set_page_config(
@@ -69,496 +86,22 @@ if 'selected_team_member' not in st.session_state:
 if 'sales_target' not in st.session_state:
     st.session_state.sales_target = 0.0  # Default target in Lakhs
 
-# Custom CSS for modern styling
-st.markdown("""
-<style>
-    /* Modern theme colors */
-    :root {
-        --primary-color: #4A90E2;
-        --background-color: #1E1E1E;
-        --secondary-background-color: #252526;
-        --text-color: #FFFFFF;
-        --font-family: 'Segoe UI', sans-serif;
-    }
-
-    /* Main container styling */
-    .main {
-        background-color: var(--background-color);
-        color: var(--text-color);
-        font-family: var(--font-family);
-    }
-
-    /* Card styling */
-    .stCard {
-        background-color: var(--secondary-background-color);
-        border-radius: 10px;
-        padding: 15px;
-        margin: 30px 0;
-        border: 1px solid rgba(255, 255, 255, 0.1);
-    }
-
-    /* Number formatting */
-    .big-number {
-        font-size: 2.8em;
-        font-weight: 700;
-        color: #2ecc71;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.2);
-        letter-spacing: -1px;
-    }
-
-    .metric-value {
-        font-size: 2em;
-        font-weight: 600;
-        color: #4A90E2;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
-    }
-
-    .metric-label {
-        font-size: 1.2em;
-        color: #333;
-        margin-bottom: 5px;
-        font-weight: 500;
-    }
-
-    /* Section headers */
-    .section-header {
-        font-size: 1.8em;
-        font-weight: 700;
-        color: #2c3e50;
-        margin: 30px 0;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
-    }
-
-    /* Chart text styling */
-    .js-plotly-plot .plotly .main-svg {
-        font-size: 14px;
-        font-weight: 500;
-    }
-
-    /* Table styling */
-    .dataframe {
-        font-size: 1.2em;
-        background-color: white;
-        border-radius: 8px;
-        padding: 15px;
-    }
-
-    .dataframe th {
-        background-color: #4A90E2;
-        color: white;
-        font-weight: 700;
-        padding: 15px;
-        font-size: 1.1em;
-    }
-
-    .dataframe td {
-        padding: 12px;
-        border-bottom: 1px solid #eee;
-        font-weight: 500;
-    }
-
-    /* Upload container styling */
-    .upload-container {
-        background-color: rgba(74, 144, 226, 0.1);
-        border-radius: 10px;
-        padding: 30px;
-        margin: 20px 0;
-        border: 2px dashed rgba(74, 144, 226, 0.3);
-        text-align: center;
-    }
-
-    /* Button styling */
-    .stButton>button {
-        background-color: var(--primary-color);
-        color: white;
-        border-radius: 5px;
-        padding: 10px 20px;
-        border: none;
-        transition: all 0.3s ease;
-    }
-
-    .stButton>button:hover {
-        background-color: #357ABD;
-        transform: translateY(-2px);
-    }
-
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-
-    /* Custom header */
-    .custom-header {
-        background: linear-gradient(90deg, #4A90E2 0%, #357ABD 100%);
-        padding: 20px;
-        border-radius: 10px;
-        margin-bottom: 20px;
-        color: white;
-        text-align: center;
-    }
-
-    /* Info box */
-    .info-box {
-        background-color: rgba(74, 144, 226, 0.1);
-        border-left: 4px solid #4A90E2;
-        padding: 15px;
-        border-radius: 4px;
-        margin: 10px 0;
-    }
-
-    /* Container styling */
-    .container {
-        margin: 30px 0;
-        padding: 15px;
-    }
-
-    /* Graph container */
-    .graph-container {
-        margin: 30px 0;
-        padding: 15px;
-        background: white;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-
-    /* Metric container */
-    .metric-container {
-        display: flex;
-        justify-content: space-between;
-        margin: 20px 0;
-        gap: 20px;
-    }
-    
-    .card {
-        background: white;
-        padding: 20px;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        flex: 1;
-        text-align: center;
-    }
-    
-    .metric-label {
-        color: #666;
-        font-size: 14px;
-        font-weight: 600;
-        margin-bottom: 8px;
-    }
-    
-    .metric-value {
-        font-size: 24px;
-        font-weight: 700;
-        color: #2a5298;
-    }
-    
-    .delta-positive {
-        color: #2ecc71;
-    }
-    
-    .delta-negative {
-        color: #e74c3c;
-    }
-
-    /* Section divider */
-    .section-divider {
-        margin: 30px 0;
-        border-top: 1px solid #eee;
-    }
-
-    /* Custom styling for number input */
-    [data-testid="stNumberInput"] {
-        position: relative;
-        background: transparent !important;
-    }
-    [data-testid="stNumberInput"] > div > div > input {
-        color: white !important;
-        font-size: 1.8em !important;
-        font-weight: 800 !important;
-        text-align: center !important;
-        background: transparent !important;
-        border: none !important;
-        padding: 0 !important;
-    }
-    /* Hide the increment/decrement buttons */
-    [data-testid="stNumberInput"] > div > div > div {
-        display: none !important;
-    }
-    /* Container styling */
-    div[data-testid="column"] > div > div > div > div > div {
-        background: linear-gradient(135deg, #FF6B6B 0%, #FF8E8E 100%);
-        padding: 20px;
-        border-radius: 10px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        text-align: center;
-    }
-
-    /* Hide increment buttons */
-    [data-testid="stNumberInput"] input[type="number"] {
-        -moz-appearance: textfield;
-    }
-    [data-testid="stNumberInput"] input[type="number"]::-webkit-outer-spin-button,
-    [data-testid="stNumberInput"] input[type="number"]::-webkit-inner-spin-button {
-        -webkit-appearance: none;
-        margin: 0;
-    }
-    
-    /* Style the input field */
-    [data-testid="stNumberInput"] {
-        background: transparent;
-    }
-    
-    /* Style the display value */
-    .target-value {
-        font-family: 'Segoe UI', sans-serif;
-        font-size: 2.5em;
-        font-weight: 800;
-        color: #FF6B6B;
-        text-align: center;
-        padding: 20px;
-        margin: 10px 0;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
-    }
-
-    /* Modern Quarterly Dashboard Styles */
-    .quarterly-dashboard {
-        background: linear-gradient(135deg, #f0f4ff 0%, #ffffff 100%);
-        padding: 2rem;
-        border-radius: 20px;
-        box-shadow: 0 8px 32px 0 rgba(31, 38, 135, 0.15);
-        margin: 2rem 0;
-    }
-
-    .metric-card {
-        background: rgba(255, 255, 255, 0.95);
-        backdrop-filter: blur(8px);
-        -webkit-backdrop-filter: blur(8px);
-        border: 1px solid rgba(255, 255, 255, 0.18);
-        border-radius: 16px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 8px 32px 0 rgba(31, 38, 135, 0.1);
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-
-    .metric-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 12px 36px 0 rgba(31, 38, 135, 0.15);
-    }
-
-    .metric-header {
-        display: flex;
-        align-items: center;
-        margin-bottom: 1rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid rgba(74, 144, 226, 0.1);
-    }
-
-    .metric-icon {
-        font-size: 1.5rem;
-        margin-right: 0.75rem;
-        color: #4a90e2;
-    }
-
-    .metric-title {
-        font-family: 'Inter', sans-serif;
-        font-size: 1.2rem;
-        font-weight: 600;
-        color: #1e1e2f;
-        margin: 0;
-    }
-
-    .metric-content {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-
-    .metric-values {
-        flex: 1;
-    }
-
-    .metric-current {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #1e1e2f;
-        margin: 0.5rem 0;
-    }
-
-    .metric-previous {
-        font-size: 1.1rem;
-        color: #6b7280;
-        margin: 0.25rem 0;
-    }
-
-    .metric-delta {
-        background: rgba(255, 255, 255, 0.9);
-        padding: 0.75rem 1rem;
-        border-radius: 12px;
-        text-align: center;
-        min-width: 120px;
-    }
-
-    .delta-positive {
-        color: #00c896;
-    }
-
-    .delta-negative {
-        color: #ff5b5b;
-    }
-
-    .delta-value {
-        font-size: 1.5rem;
-        font-weight: 600;
-        margin: 0;
-    }
-
-    .delta-label {
-        font-size: 0.9rem;
-        color: #6b7280;
-        margin: 0;
-    }
-
-    /* Filter section styling */
-    .filter-section {
-        background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-        padding: 1.5rem;
-        border-radius: 16px;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.05);
-        margin-bottom: 2rem;
-    }
-
-    .filter-title {
-        color: #1e1e2f;
-        font-size: 1.2rem;
-        font-weight: 600;
-        margin-bottom: 1rem;
-    }
-
-    /* Selectbox styling */
-    .stSelectbox {
-        background: white;
-        border-radius: 12px;
-        border: 1px solid rgba(0,0,0,0.1);
-    }
-
-    .stSelectbox > div {
-        background: white !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Cache data processing functions
-@st.cache_data
-def process_data(df):
-    """Process and prepare data for the dashboard"""
-    df = df.copy()
-    
-    # Convert dates and calculate time-based columns at once
-    df['Expected Close Date'] = pd.to_datetime(df['Expected Close Date'], format='%d-%m-%Y', errors='coerce')
-    df['Month'] = df['Expected Close Date'].dt.strftime('%B')
-    df['Year'] = df['Expected Close Date'].dt.year
-    df['Quarter'] = df['Expected Close Date'].dt.quarter.map({1: 'Q1', 2: 'Q2', 3: 'Q3', 4: 'Q4'})
-    
-    # Convert probability and calculate numeric values at once with safe null handling
-    def convert_probability(x):
-        try:
-            if pd.isna(x):
-                return 0
-            if isinstance(x, str):
-                x = x.rstrip('%')
-            return float(x)
-        except:
-            return 0
-    
-    df['Probability_Num'] = df['Probability'].apply(convert_probability)
-    
-    # Pre-calculate common flags and metrics with safe null handling
-    df['Is_Won'] = df['Sales Stage'].str.contains('Won', case=False, na=False)
-    df['Amount_Lacs'] = df['Amount'].fillna(0).div(100000).round(0).astype(int)
-    df['Weighted_Amount'] = (df['Amount_Lacs'] * df['Probability_Num'] / 100).round(0).astype(int)
-    
-    return df
-
-@st.cache_data
-def calculate_team_metrics(df):
+# Cached per dataset key, so reruns don't hash the whole frame to find the entry
+@profiling.profiled_cache()
+def calculate_team_metrics(key, _df):
     """Calculate all team-related metrics at once"""
-    team_metrics = df.groupby('Sales Owner').agg({
-        'Amount': lambda x: int(x[df['Is_Won'] & x.notna()].sum() / 100000) if len(x[df['Is_Won'] & x.notna()]) > 0 else 0,
-        'Is_Won': 'sum',
-        'Amount_Lacs': lambda x: int(x[~df['Is_Won'] & x.notna()].sum()) if len(x[~df['Is_Won'] & x.notna()]) > 0 else 0,
-        'Weighted_Amount': lambda x: int(x[~df['Is_Won'] & x.notna()].sum()) if len(x[~df['Is_Won'] & x.notna()]) > 0 else 0
-    }).reset_index()
-    
-    team_metrics.columns = ['Sales Owner', 'Closed Won', 'Closed Deals', 'Current Pipeline', 'Weighted Projections']
-    
-    team_metrics = team_metrics.fillna(0)
-    
-    # Calculate Pipeline Deals
-    pipeline_deals = df[~df['Is_Won']].groupby('Sales Owner').size()
-    team_metrics['Pipeline Deals'] = team_metrics['Sales Owner'].map(pipeline_deals).fillna(0).astype(int)
-    
-    # Win Rate
-    total_deals = team_metrics['Closed Deals'] + team_metrics['Pipeline Deals']
-    team_metrics['Win Rate'] = np.where(
-        total_deals > 0,
-        (team_metrics['Closed Deals'] / total_deals * 100).round(0),
-        0
-    ).astype(int)
-    
-    return team_metrics
+    return analytics.get_engine(_df, key).team_metrics()
 
-@st.cache_data
-def filter_dataframe(df, filters):
+# Each entry is a filtered copy of the rows, so keep only the recent combinations
+@profiling.profiled_cache(max_entries=32, ttl=900)
+def filter_dataframe(key, _df, filters, _catalog=None):
     """Apply filters to dataframe efficiently"""
-    mask = pd.Series(True, index=df.index)
-    
-    if filters.get('selected_member') != "All Team Members":
-        mask &= df['Sales Owner'] == filters['selected_member']
-    
-    if filters.get('search'):
-        search_mask = pd.Series(False, index=df.index)
-        search = filters['search'].lower()
-        for col in ['Organization Name', 'Opportunity Name', 'Sales Owner', 'Sales Stage']:
-            search_mask |= df[col].astype(str).str.lower().str.contains(search, na=False)
-        mask &= search_mask
-    
-    # Practice filter
-    if filters.get('practices'):
-        mask &= df['Practice'].isin(filters['practices'])
-            
-    if filters.get('month_filter') != "All Months":
-        mask &= df['Month'] == filters['month_filter']
-    
-    if filters.get('quarter_filter') != "All Quarters":
-        mask &= df['Quarter'] == filters['quarter_filter']
-    
-    if filters.get('year_filter') != "All Years":
-        mask &= df['Year'] == filters['year_filter']
-    
-    if filters.get('probability_filter') != "All Probability":
-        if filters['probability_filter'] == "Custom Range":
-            prob_range = filters['custom_prob_range'].split("-")
-            min_prob = float(prob_range[0])
-            max_prob = float(prob_range[1].rstrip("%"))
-        else:
-            prob_range = filters['probability_filter'].split("-")
-            min_prob = float(prob_range[0])
-            max_prob = float(prob_range[1].rstrip("%"))
-        mask &= (df['Probability_Num'] >= min_prob) & (df['Probability_Num'] <= max_prob)
-    
-    if filters.get('status_filter') != "All Status":
-        if filters['status_filter'] == "Committed for the Month":
-            current_month = pd.Timestamp.now().strftime('%B')
-            mask &= (df['Month'] == current_month) & (df['Probability_Num'] > 75)
-        elif filters['status_filter'] == "Upsides for the Month":
-            current_month = pd.Timestamp.now().strftime('%B')
-            mask &= (df['Month'] == current_month) & (df['Probability_Num'].between(25, 75))
-        else:
-            mask &= df['Sales Stage'] == filters['status_filter']
-    
-    if filters.get('focus_filter') != "All Focus":
-        mask &= df['KritiKal Focus Areas'] == filters['focus_filter']
-    
-    return df[mask]
+    return filter_spec.sales_team(filters).apply(_df, _catalog)
+
+@st.cache_data
+def get_sheet_names(upload_fingerprint, _uploaded_file):
+    """Sheet names of an uploaded workbook, cached by content so reruns don't reopen it"""
+    return pd.ExcelFile(_uploaded_file).sheet_names
 
 def show_data_input():
     # Custom header
@@ -619,13 +162,14 @@ def show_data_input():
         """, unsafe_allow_html=True)
 
 def show_overview():
-    if 'df_current' not in st.session_state or 'df_previous' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload data first.")
         return
     
     # Use current week data by default
-    df = st.session_state.df_current
-    st.session_state.df = df  # Set the current df in session state for compatibility
+    df = dataset.current
+    engine = analytics.get_engine(df, key=dataset.key('current'))
     
     st.title("Sales Performance Overview")
 
@@ -652,8 +196,8 @@ def show_overview():
     st.session_state.sales_target = float(user_target)
 
     # Calculate total "Closed Won"
-    won_deals = df[df['Sales Stage'].str.contains('Won', case=False, na=False)]
-    won_amount_lacs = won_deals['Amount'].sum() / 100000  # convert to Lakhs
+    with profiling.section("overview.closed_won", rows=len(df)):
+        won_amount_lacs = engine.closed_won_amount()
 
     # Show "Target vs Closed Won" progress
     if st.session_state.sales_target > 0:
@@ -661,26 +205,32 @@ def show_overview():
     else:
         achievement_pct = 0
 
-    st.markdown(
-        f"""
-        <div style='margin-top: 30px; padding: 20px; background: #f0f2f6; border-radius: 12px;'>
-            <h3 style='margin: 0; color: #2ecc71; font-size: 1.2em; font-weight: 500;'>Closed Won</h3>
-            <h2 style='margin: 5px 0; color: #2ecc71; font-size: 2.8em; font-weight: 700; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);'>
-                ₹{won_amount_lacs:,.2f}L
-            </h2>
-            <div style='text-align: right; margin-bottom: 10px;'>
-                <span style='color: #e74c3c; font-size: 1em; font-weight: 500;'>Target: ₹{st.session_state.sales_target:,.0f}L</span>
-            </div>
-            <div style='background: #e74c3c; height: 40px; border-radius: 20px; overflow: hidden; position: relative; box-shadow: inset 0 1px 3px rgba(0,0,0,0.2);'>
-                <div style='background: #2ecc71; height: 100%; width: {min(achievement_pct, 100)}%; transition: width 0.5s ease-in-out;'></div>
-                <div style='position: absolute; top: 50%; left: 50%; transform: translate(-50%, -50%); color: white; font-weight: 600; font-size: 1.2em; text-shadow: 1px 1px 2px rgba(0,0,0,0.5);'>
-                    {int(achievement_pct)}% Complete
+    if lite.enabled():
+        st.markdown(lite.cards([lite.card(
+            "Closed Won", f"₹{won_amount_lacs:,.2f}L", '#27AE60',
+            description=f"Target: ₹{st.session_state.sales_target:,.0f}L · {int(achievement_pct)}% complete",
+        )]), unsafe_allow_html=True)
+    else:
+        st.markdown(
+            f"""
+            <div style='margin-top: 30px; padding: 20px; background: #f0f2f6; border-radius: 12px;'>
+                <h3 style='margin: 0; color: #2ecc71; font-size: 1.2em; font-weight: 500;'>Closed Won</h3>
+                <h2 style='margin: 5px 0; color: #2ecc71; font-size: 2.8em; font-weight: 700; text-shadow: 1px 1px 2px rgba(0,0,0,0.2);'>
+                    ₹{won_amount_lacs:,.2f}L
+                </h2>
+                <div style='text-align: right; margin-bottom: 10px;'>
+                    <span style='color: #e74c3c; font-size: 1em; font-weight: 500;'>Target: ₹{st.session_state.sales_target:,.0f}L</span>
+                </div>
+                <div style='background: #e74c3c; height: 40px; border-radius: 20px; overflow: hidden; position: relative; box-shadow: inset 0 1px 3px rgba(0,0,0,0.2);'>
+                    <div style='background: #2ecc71; height: 100%; width: {min(achievement_pct, 100)}%; transition: width 0.5s ease-in-out;'></div>
+                    <div style='position: absolute; top: 50%; left: 50%; transform: translate(-50%, -50%); color: white; font-weight: 600; font-size: 1.2em; text-shadow: 1px 1px 2px rgba(0,0,0,0.5);'>
+                        {int(achievement_pct)}% Complete
+                    </div>
                 </div>
             </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+            """,
+            unsafe_allow_html=True
+        )
 
     # ---- The rest of your existing Overview code remains below ----
 
@@ -691,233 +241,223 @@ def show_overview():
         </div>
     """, unsafe_allow_html=True)
     
+    # Practices selected in the practice charts; the dependent charts come from
+    # the cached practice x focus x month aggregate instead of the raw frame.
+    # Without both columns there is nothing to link, and the charts below use
+    # the engine as before.
+    linked_practices = None
+    linked = None
+    if 'Practice' in df.columns and 'KritiKal Focus Areas' in df.columns:
+        linked = crossfilter.get_crossfilter(dataset.key('current'), df, dataset.catalog())
+    chart_selection = dict(on_select="rerun", selection_mode="points") if linked is not None else {}
+
     if 'Practice' in df.columns:
         # Add practice filter
-        practices = ['All'] + sorted(df['Practice'].dropna().unique().tolist())
+        practices = ['All'] + dataset.options('Practice')
         selected_practice = st.selectbox(
             "Select Practice",
             options=practices,
             key="practice_filter"
         )
+        profiling.annotate(filters={'practice': selected_practice})
         
-        # Filter data based on selected practice
-        df_practice = df.copy()
-        if selected_practice != 'All':
-            df_practice = df_practice[df_practice['Practice'] == selected_practice]
-        
-        # Calculate practice metrics
-        practice_metrics = df_practice.groupby('Practice').agg({
-            'Amount': lambda x: x[df_practice['Sales Stage'].str.contains('Won', case=False, na=False)].sum() / 100000,
-            'Sales Stage': lambda x: x[df_practice['Sales Stage'].str.contains('Won', case=False, na=False)].count()
-        }).reset_index()
-        
-        practice_metrics.columns = ['Practice', 'Closed Amount', 'Closed Deals']
-        
-        # Pipeline by practice
-        pipeline_df = df_practice[~df_practice['Sales Stage'].str.contains('Won', case=False, na=False)]
-        total_pipeline = pipeline_df.groupby('Practice')['Amount'].sum() / 100000
-        practice_metrics['Total Pipeline'] = practice_metrics['Practice'].map(total_pipeline)
-        
-        # Pipeline deal counts
-        total_deals = pipeline_df.groupby('Practice').size()
-        practice_metrics['Pipeline Deals'] = practice_metrics['Practice'].map(total_deals)
-        
-        # Sort by pipeline
-        practice_metrics = practice_metrics.sort_values('Total Pipeline', ascending=False)
+        with profiling.section("overview.practice_metrics", rows=len(df)):
+            # Closed and pipeline totals per practice, sorted by pipeline
+            practice_metrics = engine.practice_metrics(None if selected_practice == 'All' else selected_practice)
         
         # Charts
-        col1, col2 = st.columns(2)
+        with profiling.section("overview.practice_charts"):
+            col1, col2 = st.columns(2)
         
-        with col1:
-            fig_pipeline = go.Figure()
-            fig_pipeline.add_trace(go.Bar(
-                x=practice_metrics['Practice'],
-                y=practice_metrics['Total Pipeline'],
-                name='Pipeline',
-                text=practice_metrics['Total Pipeline'].apply(lambda x: f"₹{int(x)}L"),
-                textposition='outside',
-                textfont=dict(size=16, color='#4A90E2', family='Segoe UI', weight='bold'),
-                marker_color='#4A90E2',
-                marker_line=dict(color='#357ABD', width=2),
-                opacity=0.9
-            ))
-            fig_pipeline.add_trace(go.Bar(
-                x=practice_metrics['Practice'],
-                y=practice_metrics['Closed Amount'],
-                name='Closed Won',
-                text=practice_metrics['Closed Amount'].apply(lambda x: f"₹{int(x)}L"),
-                textposition='outside',
-                textfont=dict(size=16, color='#2ecc71', family='Segoe UI', weight='bold'),
-                marker_color='#2ecc71',
-                marker_line=dict(color='#27ae60', width=2),
-                opacity=0.9
-            ))
-            fig_pipeline.update_layout(
-                title=dict(
-                    text="Practice-wise Pipeline vs Closed Won",
-                    font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
-                    x=0.5,
-                    y=0.95,
-                    xanchor='center',
-                    yanchor='top'
-                ),
-                height=500,
-                barmode='group',
-                bargap=0.15,
-                bargroupgap=0.1,
-                xaxis_title=dict(
-                    text="Practice",
-                    font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
-                    standoff=15
-                ),
-                yaxis_title=dict(
-                    text="Amount (Lakhs)",
-                    font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
-                    standoff=15
-                ),
-                showlegend=True,
-                legend=dict(
-                    font=dict(size=14, family='Segoe UI', color='#2c3e50'),
-                    yanchor="top",
-                    y=0.99,
-                    xanchor="right",
-                    x=0.99,
-                    bgcolor='rgba(255, 255, 255, 0.8)',
-                    bordercolor='rgba(0, 0, 0, 0.2)',
-                    borderwidth=1
-                ),
-                font=dict(size=14, family='Segoe UI'),
-                xaxis=dict(
-                    tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
-                    gridcolor='rgba(0, 0, 0, 0.1)'
-                ),
-                yaxis=dict(
-                    tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
-                    gridcolor='rgba(0, 0, 0, 0.1)'
-                ),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                margin=dict(t=80, b=40, l=40, r=40)
-            )
-            st.plotly_chart(fig_pipeline, use_container_width=True)
+            with col1:
+                fig_pipeline = go.Figure()
+                fig_pipeline.add_trace(go.Bar(
+                    x=practice_metrics['Practice'],
+                    y=practice_metrics['Total Pipeline'],
+                    name='Pipeline',
+                    text=practice_metrics['Total Pipeline'].apply(lambda x: f"₹{int(x)}L"),
+                    textposition='outside',
+                    textfont=dict(size=16, color='#4A90E2', family='Segoe UI', weight='bold'),
+                    marker_color='#4A90E2',
+                    marker_line=dict(color='#357ABD', width=2),
+                    opacity=0.9
+                ))
+                fig_pipeline.add_trace(go.Bar(
+                    x=practice_metrics['Practice'],
+                    y=practice_metrics['Closed Amount'],
+                    name='Closed Won',
+                    text=practice_metrics['Closed Amount'].apply(lambda x: f"₹{int(x)}L"),
+                    textposition='outside',
+                    textfont=dict(size=16, color='#2ecc71', family='Segoe UI', weight='bold'),
+                    marker_color='#2ecc71',
+                    marker_line=dict(color='#27ae60', width=2),
+                    opacity=0.9
+                ))
+                fig_pipeline.update_layout(
+                    title=dict(
+                        text="Practice-wise Pipeline vs Closed Won",
+                        font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
+                        x=0.5,
+                        y=0.95,
+                        xanchor='center',
+                        yanchor='top'
+                    ),
+                    height=500,
+                    barmode='group',
+                    bargap=0.15,
+                    bargroupgap=0.1,
+                    xaxis_title=dict(
+                        text="Practice",
+                        font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
+                        standoff=15
+                    ),
+                    yaxis_title=dict(
+                        text="Amount (Lakhs)",
+                        font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
+                        standoff=15
+                    ),
+                    showlegend=True,
+                    legend=dict(
+                        font=dict(size=14, family='Segoe UI', color='#2c3e50'),
+                        yanchor="top",
+                        y=0.99,
+                        xanchor="right",
+                        x=0.99,
+                        bgcolor='rgba(255, 255, 255, 0.8)',
+                        bordercolor='rgba(0, 0, 0, 0.2)',
+                        borderwidth=1
+                    ),
+                    font=dict(size=14, family='Segoe UI'),
+                    xaxis=dict(
+                        tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
+                        gridcolor='rgba(0, 0, 0, 0.1)'
+                    ),
+                    yaxis=dict(
+                        tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
+                        gridcolor='rgba(0, 0, 0, 0.1)'
+                    ),
+                    plot_bgcolor='white',
+                    paper_bgcolor='white',
+                    margin=dict(t=80, b=40, l=40, r=40)
+                )
+                # Clicking practices here filters the Focus Areas and Monthly Trend charts below
+                pipeline_event = st.plotly_chart(
+                    fig_pipeline, use_container_width=True, key="overview_practice_pipeline", **chart_selection
+                )
         
-        with col2:
-            fig_deals = go.Figure()
-            fig_deals.add_trace(go.Bar(
-                x=practice_metrics['Practice'],
-                y=practice_metrics['Pipeline Deals'],
-                name='Pipeline Deals',
-                text=practice_metrics['Pipeline Deals'],
-                textposition='outside',
-                textfont=dict(size=16, color='#4A90E2', family='Segoe UI', weight='bold'),
-                marker_color='#4A90E2',
-                marker_line=dict(color='#357ABD', width=2),
-                opacity=0.9
-            ))
-            fig_deals.add_trace(go.Bar(
-                x=practice_metrics['Practice'],
-                y=practice_metrics['Closed Deals'],
-                name='Closed Deals',
-                text=practice_metrics['Closed Deals'],
-                textposition='outside',
-                textfont=dict(size=16, color='#2ecc71', family='Segoe UI', weight='bold'),
-                marker_color='#2ecc71',
-                marker_line=dict(color='#27ae60', width=2),
-                opacity=0.9
-            ))
-            fig_deals.update_layout(
-                title=dict(
-                    text="Practice-wise Pipeline vs Closed Deals",
-                    font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
-                    x=0.5,
-                    y=0.95,
-                    xanchor='center',
-                    yanchor='top'
-                ),
-                height=500,
-                barmode='group',
-                bargap=0.15,
-                bargroupgap=0.1,
-                xaxis_title=dict(
-                    text="Practice",
-                    font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
-                    standoff=15
-                ),
-                yaxis_title=dict(
-                    text="Number of Deals",
-                    font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
-                    standoff=15
-                ),
-                showlegend=True,
-                legend=dict(
-                    font=dict(size=14, family='Segoe UI', color='#2c3e50'),
-                    yanchor="top",
-                    y=0.99,
-                    xanchor="right",
-                    x=0.99,
-                    bgcolor='rgba(255, 255, 255, 0.8)',
-                    bordercolor='rgba(0, 0, 0, 0.2)',
-                    borderwidth=1
-                ),
-                font=dict(size=14, family='Segoe UI'),
-                xaxis=dict(
-                    tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
-                    gridcolor='rgba(0, 0, 0, 0.1)'
-                ),
-                yaxis=dict(
-                    tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
-                    gridcolor='rgba(0, 0, 0, 0.1)'
-                ),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                margin=dict(t=80, b=40, l=40, r=40)
+            with col2:
+                fig_deals = go.Figure()
+                fig_deals.add_trace(go.Bar(
+                    x=practice_metrics['Practice'],
+                    y=practice_metrics['Pipeline Deals'],
+                    name='Pipeline Deals',
+                    text=practice_metrics['Pipeline Deals'],
+                    textposition='outside',
+                    textfont=dict(size=16, color='#4A90E2', family='Segoe UI', weight='bold'),
+                    marker_color='#4A90E2',
+                    marker_line=dict(color='#357ABD', width=2),
+                    opacity=0.9
+                ))
+                fig_deals.add_trace(go.Bar(
+                    x=practice_metrics['Practice'],
+                    y=practice_metrics['Closed Deals'],
+                    name='Closed Deals',
+                    text=practice_metrics['Closed Deals'],
+                    textposition='outside',
+                    textfont=dict(size=16, color='#2ecc71', family='Segoe UI', weight='bold'),
+                    marker_color='#2ecc71',
+                    marker_line=dict(color='#27ae60', width=2),
+                    opacity=0.9
+                ))
+                fig_deals.update_layout(
+                    title=dict(
+                        text="Practice-wise Pipeline vs Closed Deals",
+                        font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
+                        x=0.5,
+                        y=0.95,
+                        xanchor='center',
+                        yanchor='top'
+                    ),
+                    height=500,
+                    barmode='group',
+                    bargap=0.15,
+                    bargroupgap=0.1,
+                    xaxis_title=dict(
+                        text="Practice",
+                        font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
+                        standoff=15
+                    ),
+                    yaxis_title=dict(
+                        text="Number of Deals",
+                        font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
+                        standoff=15
+                    ),
+                    showlegend=True,
+                    legend=dict(
+                        font=dict(size=14, family='Segoe UI', color='#2c3e50'),
+                        yanchor="top",
+                        y=0.99,
+                        xanchor="right",
+                        x=0.99,
+                        bgcolor='rgba(255, 255, 255, 0.8)',
+                        bordercolor='rgba(0, 0, 0, 0.2)',
+                        borderwidth=1
+                    ),
+                    font=dict(size=14, family='Segoe UI'),
+                    xaxis=dict(
+                        tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
+                        gridcolor='rgba(0, 0, 0, 0.1)'
+                    ),
+                    yaxis=dict(
+                        tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
+                        gridcolor='rgba(0, 0, 0, 0.1)'
+                    ),
+                    plot_bgcolor='white',
+                    paper_bgcolor='white',
+                    margin=dict(t=80, b=40, l=40, r=40)
+                )
+                deals_event = st.plotly_chart(
+                    fig_deals, use_container_width=True, key="overview_practice_deals", **chart_selection
+                )
+
+        # Only chart clicks link; the dropdown above filters the practice charts and tables alone
+        if linked is not None:
+            linked_practices = crossfilter.selected_practices(pipeline_event, deals_event)
+        if linked_practices:
+            st.caption(
+                f"Focus Areas and Monthly Pipeline Trend show Practice: {', '.join(map(str, linked_practices))}. "
+                "Double-click a practice chart to clear the selection."
             )
-            st.plotly_chart(fig_deals, use_container_width=True)
         
         # Practice summary
         st.markdown("### Practice Summary")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            total_pipeline_val = practice_metrics['Total Pipeline'].sum()
-            st.markdown(f"""
-                <div style='text-align: center; padding: 15px; background: #f8f9fa; border-radius: 10px;'>
-                    <div class='metric-label'>Total Pipeline</div>
-                    <div class='metric-value'>₹{int(total_pipeline_val)}L</div>
-                    <div style='color: #666; font-size: 0.9em;'>Active pipeline value</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            total_deals_count = practice_metrics['Pipeline Deals'].sum()
-            st.markdown(f"""
-                <div style='text-align: center; padding: 15px; background: #f8f9fa; border-radius: 10px;'>
-                    <div class='metric-label'>Pipeline Deals</div>
-                    <div class='metric-value'>{int(total_deals_count)}</div>
-                    <div style='color: #666; font-size: 0.9em;'>Active opportunities</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            total_won = practice_metrics['Closed Deals'].sum()
-            win_rate = (total_won / (total_won + total_deals_count) * 100) if (total_won + total_deals_count) > 0 else 0
-            st.markdown(f"""
-                <div style='text-align: center; padding: 15px; background: #f8f9fa; border-radius: 10px;'>
-                    <div class='metric-label'>Win Rate</div>
-                    <div class='metric-value'>{int(win_rate)}%</div>
-                    <div style='color: #666; font-size: 0.9em;'>{int(total_won)} won</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            avg_deal_size = practice_metrics['Closed Amount'].sum() / total_won if total_won > 0 else 0
-            st.markdown(f"""
-                <div style='text-align: center; padding: 15px; background: #f8f9fa; border-radius: 10px;'>
-                    <div class='metric-label'>Avg Deal Size</div>
-                    <div class='metric-value'>₹{int(avg_deal_size)}L</div>
-                    <div style='color: #666; font-size: 0.9em;'>Per won deal</div>
-                </div>
-            """, unsafe_allow_html=True)
+        total_pipeline_val = practice_metrics['Total Pipeline'].sum()
+        total_deals_count = practice_metrics['Pipeline Deals'].sum()
+        total_won = practice_metrics['Closed Deals'].sum()
+        win_rate = (total_won / (total_won + total_deals_count) * 100) if (total_won + total_deals_count) > 0 else 0
+        avg_deal_size = practice_metrics['Closed Amount'].sum() / total_won if total_won > 0 else 0
+        summary_cards = [
+            ("Total Pipeline", f"₹{int(total_pipeline_val)}L", "Active pipeline value"),
+            ("Pipeline Deals", f"{int(total_deals_count)}", "Active opportunities"),
+            ("Win Rate", f"{int(win_rate)}%", f"{int(total_won)} won"),
+            ("Avg Deal Size", f"₹{int(avg_deal_size)}L", "Per won deal"),
+        ]
+
+        if lite.enabled():
+            st.markdown(lite.cards([
+                lite.card(label, value, '#357ABD', description=description)
+                for label, value, description in summary_cards
+            ]), unsafe_allow_html=True)
+        else:
+            for col, (label, value, description) in zip(st.columns(4), summary_cards):
+                with col:
+                    st.markdown(f"""
+                        <div style='text-align: center; padding: 15px; background: #f8f9fa; border-radius: 10px;'>
+                            <div class='metric-label'>{label}</div>
+                            <div class='metric-value'>{value}</div>
+                            <div style='color: #666; font-size: 0.9em;'>{description}</div>
+                        </div>
+                    """, unsafe_allow_html=True)
         
         # Practice-wise table
         st.markdown("### Practice-wise Details")
@@ -927,10 +467,11 @@ def show_overview():
         summary_data['Total Pipeline'] = summary_data['Total Pipeline'].apply(lambda x: f"₹{int(x)}L")
         summary_data['Win Rate'] = summary_data['Win Rate'].apply(lambda x: f"{int(x)}%")
         
-        st.dataframe(
-            summary_data[['Practice', 'Closed Amount', 'Total Pipeline', 'Closed Deals', 'Pipeline Deals', 'Win Rate']],
-            use_container_width=True
-        )
+        with profiling.section("overview.practice_table"):
+            st.dataframe(
+                summary_data[['Practice', 'Closed Amount', 'Total Pipeline', 'Closed Deals', 'Pipeline Deals', 'Win Rate']],
+                use_container_width=True
+            )
     else:
         st.error("Practice column not found in the dataset")
 
@@ -942,24 +483,12 @@ def show_overview():
     """, unsafe_allow_html=True)
     
     if 'KritiKal Focus Areas' in df.columns:
-        focus_metrics = df.groupby('KritiKal Focus Areas').agg({
-            'Amount': 'sum',
-            'Sales Stage': lambda x: x[df['Sales Stage'].str.contains('Won', case=False, na=False)].count()
-        }).reset_index()
-        
-        focus_metrics['KritiKal Focus Areas'] = focus_metrics['KritiKal Focus Areas'].fillna('Uncategorized')
-        
-        focus_metrics.columns = ['Focus Area', 'Total Amount', 'Closed Deals']
-        focus_metrics['Total Amount'] = focus_metrics['Total Amount'] / 100000
-        
-        total_deals_focus = df.groupby('KritiKal Focus Areas').size().reset_index()
-        total_deals_focus.columns = ['Focus Area', 'Total Deals']
-        focus_metrics = focus_metrics.merge(total_deals_focus, on='Focus Area', how='left')
-        
-        total_amount_focus = focus_metrics['Total Amount'].sum()
-        focus_metrics['Share %'] = (focus_metrics['Total Amount'] / total_amount_focus * 100).round(1)
-        
-        focus_metrics = focus_metrics.sort_values('Total Amount', ascending=False)
+        with profiling.section("overview.focus_metrics", rows=len(df)):
+            if linked is not None:
+                focus_metrics = linked.focus_metrics(linked_practices)
+            else:
+                focus_metrics = engine.focus_metrics()
+            total_amount_focus = focus_metrics['Total Amount'].sum()
         
         st.markdown("### Focus Areas Summary")
         summary_data = focus_metrics.copy()
@@ -969,52 +498,56 @@ def show_overview():
         summary_data = summary_data.reset_index(drop=True)
         summary_data.index = summary_data.index + 1
         
-        st.dataframe(
-            summary_data[['Focus Area', 'Total Amount', 'Share %', 'Total Deals', 'Closed Deals']],
-            use_container_width=True
-        )
+        with profiling.section("overview.focus_table"):
+            st.dataframe(
+                summary_data[['Focus Area', 'Total Amount', 'Share %', 'Total Deals', 'Closed Deals']],
+                use_container_width=True
+            )
         
         st.markdown("### Focus Areas Distribution")
-        fig_focus = go.Figure(data=[go.Pie(
-            labels=focus_metrics['Focus Area'],
-            values=focus_metrics['Total Amount'],
-            hole=.4,
-            textinfo='label+percent+value',
-            texttemplate='%{label}<br>%{percent}<br>' + format_amount('%{value}'),
-            textfont=dict(size=14, family='Segoe UI', weight='bold')
-        )])
+        with profiling.section("overview.focus_chart"):
+            fig_focus = go.Figure(data=[go.Pie(
+                labels=focus_metrics['Focus Area'],
+                values=focus_metrics['Total Amount'],
+                hole=.4,
+                textinfo='label+percent+value',
+                texttemplate='%{label}<br>%{percent}<br>' + format_amount('%{value}'),
+                textfont=dict(size=14, family='Segoe UI', weight='bold')
+            )])
         
-        fig_focus.update_layout(
-            title=dict(
-                text="Focus Areas Distribution",
-                font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
-                x=0.5,
-                y=0.95,
-                xanchor='center',
-                yanchor='top'
-            ),
-            height=500,
-            showlegend=True,
-            legend=dict(
-                font=dict(size=14, family='Segoe UI', color='#2c3e50'),
-                yanchor="top",
-                y=0.99,
-                xanchor="right",
-                x=0.99,
-                bgcolor='rgba(255, 255, 255, 0.8)',
-                bordercolor='rgba(0, 0, 0, 0.2)',
-                borderwidth=1
-            ),
-            annotations=[dict(
-                text=f"Total: ₹{int(total_amount_focus)}L",
-                font=dict(size=16, family='Segoe UI', weight='bold'),
-                showarrow=False,
-                x=0.5,
-                y=0.5
-            )]
-        )
+            fig_focus.update_layout(
+                title=dict(
+                    text="Focus Areas Distribution" + (
+                        f" ({', '.join(map(str, linked_practices))})" if linked_practices else ""
+                    ),
+                    font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
+                    x=0.5,
+                    y=0.95,
+                    xanchor='center',
+                    yanchor='top'
+                ),
+                height=500,
+                showlegend=True,
+                legend=dict(
+                    font=dict(size=14, family='Segoe UI', color='#2c3e50'),
+                    yanchor="top",
+                    y=0.99,
+                    xanchor="right",
+                    x=0.99,
+                    bgcolor='rgba(255, 255, 255, 0.8)',
+                    bordercolor='rgba(0, 0, 0, 0.2)',
+                    borderwidth=1
+                ),
+                annotations=[dict(
+                    text=f"Total: ₹{int(total_amount_focus)}L",
+                    font=dict(size=16, family='Segoe UI', weight='bold'),
+                    showarrow=False,
+                    x=0.5,
+                    y=0.5
+                )]
+            )
         
-        st.plotly_chart(fig_focus, use_container_width=True)
+            st.plotly_chart(fig_focus, use_container_width=True)
     else:
         st.info("KritiKal Focus Areas column not found in the dataset")
 
@@ -1026,8 +559,6 @@ def show_overview():
     """, unsafe_allow_html=True)
     
     if 'Expected Close Date' in df.columns and 'Amount' in df.columns and 'Sales Stage' in df.columns:
-        df['Expected Close Date'] = pd.to_datetime(df['Expected Close Date'], errors='coerce')
-        
         deal_type = st.selectbox(
             "Select Deal Type",
             ["🌊 Pipeline", "🟢 Closed Won", "📦 All Deals"],
@@ -1035,72 +566,73 @@ def show_overview():
         )
         
         if deal_type == "🌊 Pipeline":
-            filtered_df = df[~df['Sales Stage'].str.contains('Won', case=False, na=False)]
+            trend_type = 'pipeline'
             color = '#00b4db'
         elif deal_type == "🟢 Closed Won":
-            filtered_df = df[df['Sales Stage'].str.contains('Won', case=False, na=False)]
+            trend_type = 'won'
             color = '#2ecc71'
         else:
-            filtered_df = df
+            trend_type = 'all'
             color = '#9b59b6'
         
-        monthly_data = filtered_df.groupby(filtered_df['Expected Close Date'].dt.to_period('M')).agg({
-            'Amount': 'sum',
-            'Sales Stage': 'count'
-        }).reset_index()
-        
-        monthly_data['Expected Close Date'] = monthly_data['Expected Close Date'].astype(str)
-        monthly_data['Amount'] = monthly_data['Amount'] / 100000
+        with profiling.section("overview.monthly_metrics", rows=len(df)):
+            if linked is not None:
+                monthly_data = linked.monthly_trend(trend_type, linked_practices)
+            else:
+                monthly_data = engine.monthly_trend(trend_type)
         
-        fig_trend = go.Figure()
-        fig_trend.add_trace(go.Scatter(
-            x=monthly_data['Expected Close Date'],
-            y=monthly_data['Amount'],
-            mode='lines+markers',
-            name=deal_type,
-            line=dict(width=3, color=color),
-            marker=dict(size=8, color=color),
-            text=monthly_data['Amount'].apply(lambda x: f"₹{int(x)}L"),
-            textposition='top center',
-            textfont=dict(size=12, family='Segoe UI', weight='bold')
-        ))
+        with profiling.section("overview.monthly_chart"):
+            fig_trend = go.Figure()
+            fig_trend.add_trace(go.Scatter(
+                x=monthly_data['Month'],
+                y=monthly_data['Amount'],
+                mode='lines+markers',
+                name=deal_type,
+                line=dict(width=3, color=color),
+                marker=dict(size=8, color=color),
+                text=monthly_data['Amount'].apply(lambda x: f"₹{int(x)}L"),
+                textposition='top center',
+                textfont=dict(size=12, family='Segoe UI', weight='bold')
+            ))
         
-        fig_trend.update_layout(
-            title=dict(
-                text=f"{deal_type} Trend",
-                font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
-                x=0.5,
-                y=0.95,
-                xanchor='center',
-                yanchor='top'
-            ),
-            height=500,
-            showlegend=False,
-            xaxis_title=dict(
-                text="Month",
-                font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
-                standoff=15
-            ),
-            yaxis_title=dict(
-                text="Amount (Lakhs)",
-                font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
-                standoff=15
-            ),
-            font=dict(size=14, family='Segoe UI'),
-            xaxis=dict(
-                tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
-                gridcolor='rgba(0, 0, 0, 0.1)'
-            ),
-            yaxis=dict(
-                tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
-                gridcolor='rgba(0, 0, 0, 0.1)'
-            ),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            margin=dict(t=80, b=40, l=40, r=40)
-        )
+            fig_trend.update_layout(
+                title=dict(
+                    text=f"{deal_type} Trend" + (
+                        f" ({', '.join(map(str, linked_practices))})" if linked_practices else ""
+                    ),
+                    font=dict(size=22, family='Segoe UI', color='#2c3e50', weight='bold'),
+                    x=0.5,
+                    y=0.95,
+                    xanchor='center',
+                    yanchor='top'
+                ),
+                height=500,
+                showlegend=False,
+                xaxis_title=dict(
+                    text="Month",
+                    font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
+                    standoff=15
+                ),
+                yaxis_title=dict(
+                    text="Amount (Lakhs)",
+                    font=dict(size=16, family='Segoe UI', color='#2c3e50', weight='bold'),
+                    standoff=15
+                ),
+                font=dict(size=14, family='Segoe UI'),
+                xaxis=dict(
+                    tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
+                    gridcolor='rgba(0, 0, 0, 0.1)'
+                ),
+                yaxis=dict(
+                    tickfont=dict(size=12, family='Segoe UI', color='#2c3e50'),
+                    gridcolor='rgba(0, 0, 0, 0.1)'
+                ),
+                plot_bgcolor='white',
+                paper_bgcolor='white',
+                margin=dict(t=80, b=40, l=40, r=40)
+            )
         
-        st.plotly_chart(fig_trend, use_container_width=True)
+            st.plotly_chart(fig_trend, use_container_width=True)
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1122,7 +654,7 @@ def show_overview():
                 </div>
             """, unsafe_allow_html=True)
         with col3:
-            total_deals = monthly_data['Sales Stage'].sum()
+            total_deals = monthly_data['Deals'].sum()
             st.markdown(f"""
                 <div style='text-align: center; padding: 15px; background: #f8f9fa; border-radius: 10px;'>
                     <div class='metric-label'>Total Deals</div>
@@ -1134,15 +666,16 @@ def show_overview():
         st.info("Required columns (Expected Close Date, Amount, Sales Stage) not found in the dataset")
 
 def show_sales_team():
-    if st.session_state.df is None:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload your sales data to view team information")
         return
     
     # Process data once with caching
-    df = process_data(st.session_state.df)
+    df = dataset.current
     
     # Team members
-    team_members = sorted(df['Sales Owner'].dropna().unique().tolist())
+    team_members = dataset.options('Sales Owner')
     
     st.markdown("""
         <div style='
@@ -1164,7 +697,7 @@ def show_sales_team():
         </div>
     """, unsafe_allow_html=True)
 
-    metrics = calculate_team_metrics(df)
+    metrics = calculate_team_metrics(dataset.key('current'), df)
     
     col1, col2, col3, col4 = st.columns(4)
     metric_style = """
@@ -1256,27 +789,42 @@ def show_sales_team():
         </div>
     """, unsafe_allow_html=True)
 
+    # Each dropdown lists only the values that still match rows under the other
+    # filters (as of the last interaction), with their row counts and amounts
+    with profiling.section("sales_team.facets", rows=len(df)):
+        facet_index = facets.get_index(dataset.key('current'), df, dataset.catalog())
+        facet = facet_index.facets(facets.filters_from_state(st.session_state))
+
+    def facet_select(label, name, options, all_label, display=str):
+        current = st.session_state.get(facets.WIDGET_KEYS[name])
+        return st.selectbox(
+            label,
+            options=[all_label] + facet[name].options(options, [current]),
+            format_func=lambda option: (
+                f"{option} ({facet[name].total_rows:,})" if option == all_label
+                else facet[name].label(option, display(option))
+            ),
+            key=facets.WIDGET_KEYS[name]
+        )
+
     # Create a single row with all filters using adjusted column sizes
     col1, col2, col3, col4, col5, col6, col7, col8 = st.columns([1.2, 1.2, 1.2, 1, 1, 1, 1.2, 1.2])
     
     with col1:
         filters = {
-            'selected_member': st.selectbox(
-                "👤 Sales Owner",
-                options=["All Team Members"] + team_members,
-                key="team_member_filter"
-            )
+            'selected_member': facet_select("👤 Sales Owner", 'selected_member', team_members, "All Team Members")
         }
     
     with col2:
-        filters['search'] = st.text_input("🔍 Search", placeholder="Search...")
+        filters['search'] = st.text_input("🔍 Search", placeholder="Search...", key=facets.WIDGET_KEYS['search'])
     
     with col3:
         if 'Practice' in df.columns:
-            practices = sorted(df['Practice'].dropna().unique())
+            practices = dataset.options('Practice')
             selected_practices = st.multiselect(
                 "🏢 Practice",
-                options=practices,
+                options=facet['practices'].options(practices, st.session_state.get("practice_filter", [])),
+                format_func=facet['practices'].label,
                 default=[],
                 key="practice_filter"
             )
@@ -1286,21 +834,28 @@ def show_sales_team():
             filters['practices'] = []
     
     with col4:
-        fiscal_order = ['April', 'May', 'June', 'July', 'August', 'September', 
-                       'October', 'November', 'December', 'January', 'February', 'March']
-        available_months = df['Month'].dropna().unique().tolist()
-        available_months.sort(key=lambda x: fiscal_order.index(x) if x in fiscal_order else len(fiscal_order))
-        filters['month_filter'] = st.selectbox("📅 Month", options=["All Months"] + available_months)
+        available_months = dataset.catalog().months()
+        filters['month_filter'] = facet_select("📅 Month", 'month_filter', available_months, "All Months")
     
     with col5:
-        filters['quarter_filter'] = st.selectbox("📊 Quarter", options=["All Quarters", "Q1", "Q2", "Q3", "Q4"])
+        filters['quarter_filter'] = facet_select(
+            "📊 Quarter", 'quarter_filter', fiscal.QUARTERS, "All Quarters", fiscal.quarter_label
+        )
     
     with col6:
-        filters['year_filter'] = st.selectbox("📅 Year", options=["All Years"] + sorted(df['Expected Close Date'].dt.year.unique().tolist()))
+        filters['year_filter'] = facet_select(
+            "📅 Year", 'year_filter', dataset.options('Fiscal_Year'), "All Years", fiscal.year_label
+        )
     
     with col7:
-        probability_options = ["All Probability", "0-25%", "26-50%", "51-75%", "76-100%", "Custom Range"]
-        filters['probability_filter'] = st.selectbox("📈 Probability", options=probability_options)
+        probability_options = facets.PROBABILITY_OPTIONS + ["Custom Range"]
+        filters['probability_filter'] = st.selectbox(
+            "📈 Probability",
+            options=["All Probability"] + probability_options,
+            format_func=lambda option: option if option in ("All Probability", "Custom Range")
+            else facet['probability_filter'].label(option),
+            key=facets.WIDGET_KEYS['probability_filter']
+        )
         if filters['probability_filter'] == "Custom Range":
             col7a, col7b = st.columns(2)
             with col7a:
@@ -1319,21 +874,29 @@ def show_sales_team():
                 filters['custom_prob_range'] = "0-100%"
     
     with col8:
-        status_options = ["All Status", "Committed for the Month", "Upsides for the Month"]
-        filters['status_filter'] = st.selectbox("🎯 Status", options=status_options)
-        if filters['status_filter'] == "Committed for the Month":
-            current_month = pd.Timestamp.now().strftime('%B')
-            mask = (df['Month'] == current_month) & (df['Probability_Num'] > 75)
-            filtered_df = df[mask]
-        elif filters['status_filter'] == "Upsides for the Month":
-            current_month = pd.Timestamp.now().strftime('%B')
-            mask = (df['Month'] == current_month) & (df['Probability_Num'].between(25, 75))
-            filtered_df = df[mask]
+        filters['status_filter'] = facet_select("🎯 Status", 'status_filter', facets.STATUS_OPTIONS, "All Status")
     
     with col8:
-        filters['focus_filter'] = st.selectbox("🎯 Focus", options=["All Focus"] + sorted(df['KritiKal Focus Areas'].dropna().unique().tolist()))
-
-    filtered_df = filter_dataframe(df, filters)
+        if 'KritiKal Focus Areas' in df.columns:
+            filters['focus_filter'] = facet_select(
+                "🎯 Focus", 'focus_filter', dataset.options('KritiKal Focus Areas'), "All Focus"
+            )
+        else:
+            filters['focus_filter'] = facets.DEFAULT_FILTERS['focus_filter']
+
+    profiling.annotate(filters=filters)
+    filtered_df = filter_dataframe(dataset.key('current'), df, filters, dataset.catalog('current'))
+
+    cube = scenario.get_cube(dataset.key('current'), df)
+    overrides = show_scenario_panel(cube)
+    what_if = scenario.active(overrides)
+    if what_if:
+        with profiling.section("sales_team.scenario", rows=len(cube)):
+            mask = cube.cell_mask(filters)
+            if mask is None:
+                baseline_weighted, scenario_weighted = scenario.row_totals(filtered_df, overrides)
+            else:
+                baseline_weighted, scenario_weighted = cube.total(overrides, mask)
     
     st.markdown("""
         <div style='margin-bottom: 20px;'>
@@ -1341,118 +904,140 @@ def show_sales_team():
         </div>
     """, unsafe_allow_html=True)
 
-    m1, m2, m3 = st.columns(3)
     current_pipeline = filtered_df[~filtered_df['Is_Won']]['Amount_Lacs'].sum()
     weighted_projections = filtered_df[~filtered_df['Is_Won']]['Weighted_Amount'].sum()
     closed_won = filtered_df[filtered_df['Is_Won']]['Amount_Lacs'].sum()
 
-    with m1:
-        st.markdown(f"""
-            <div style='
-                background: linear-gradient(135deg, #4A90E2 0%, #357ABD 100%);
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                text-align: center;
-                height: 100%;
-            '>
-                <div style='color: white; font-size: 1.1em; font-weight: 600; margin-bottom: 8px;'>
-                    🌊 Current Pipeline
-                </div>
-                <div style='color: white; font-size: 1.8em; font-weight: 800;'>
-                    ₹{int(current_pipeline)}L
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+    what_if_text = what_if_label = ""
+    if what_if:
+        change = scenario_weighted - baseline_weighted
+        what_if_text = f"What-if: ₹{int(weighted_projections + change)}L ({change:+,.1f}L)"
+        what_if_label = (
+            f"<div style='color: white; font-size: 1em; font-weight: 600; margin-top: 6px;'>{what_if_text}</div>"
+        )
 
-    with m2:
-        st.markdown(f"""
-            <div style='
-                background: linear-gradient(135deg, #6B5B95 0%, #846EA9 100%);
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                text-align: center;
-            '>
-                <div style='color: white; font-size: 1.1em; font-weight: 600; margin-bottom: 8px;'>
-                    ⚖️ Weighted Projections
-                </div>
-                <div style='color: white; font-size: 1.8em; font-weight: 800;'>
-                    ₹{int(weighted_projections)}L
+    if lite.enabled():
+        st.markdown(lite.cards([
+            lite.card("🌊 Current Pipeline", f"₹{int(current_pipeline)}L", '#357ABD'),
+            lite.card("⚖️ Weighted Projections", f"₹{int(weighted_projections)}L", '#6B5B95', description=what_if_text),
+            lite.card("💰 Closed Won", f"₹{int(closed_won)}L", '#27AE60'),
+        ]), unsafe_allow_html=True)
+    else:
+        m1, m2, m3 = st.columns(3)
+
+        with m1:
+            st.markdown(f"""
+                <div style='
+                    background: linear-gradient(135deg, #4A90E2 0%, #357ABD 100%);
+                    padding: 20px;
+                    border-radius: 10px;
+                    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+                    text-align: center;
+                    height: 100%;
+                '>
+                    <div style='color: white; font-size: 1.1em; font-weight: 600; margin-bottom: 8px;'>
+                        🌊 Current Pipeline
+                    </div>
+                    <div style='color: white; font-size: 1.8em; font-weight: 800;'>
+                        ₹{int(current_pipeline)}L
+                    </div>
                 </div>
-            </div>
-        """, unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
 
-    with m3:
-        st.markdown(f"""
-            <div style='
-                background: linear-gradient(135deg, #2ECC71 0%, #27AE60 100%);
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                text-align: center;
-            '>
-                <div style='color: white; font-size: 1.1em; font-weight: 600; margin-bottom: 8px;'>
-                    💰 Closed Won
+        with m2:
+            st.markdown(f"""
+                <div style='
+                    background: linear-gradient(135deg, #6B5B95 0%, #846EA9 100%);
+                    padding: 20px;
+                    border-radius: 10px;
+                    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+                    text-align: center;
+                '>
+                    <div style='color: white; font-size: 1.1em; font-weight: 600; margin-bottom: 8px;'>
+                        ⚖️ Weighted Projections
+                    </div>
+                    <div style='color: white; font-size: 1.8em; font-weight: 800;'>
+                        ₹{int(weighted_projections)}L
+                    </div>
+                    {what_if_label}
                 </div>
-                <div style='color: white; font-size: 1.8em; font-weight: 800;'>
-                    ₹{int(closed_won)}L
+            """, unsafe_allow_html=True)
+
+        with m3:
+            st.markdown(f"""
+                <div style='
+                    background: linear-gradient(135deg, #2ECC71 0%, #27AE60 100%);
+                    padding: 20px;
+                    border-radius: 10px;
+                    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+                    text-align: center;
+                '>
+                    <div style='color: white; font-size: 1.1em; font-weight: 600; margin-bottom: 8px;'>
+                        💰 Closed Won
+                    </div>
+                    <div style='color: white; font-size: 1.8em; font-weight: 800;'>
+                        ₹{int(closed_won)}L
+                    </div>
                 </div>
-            </div>
-        """, unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
 
     st.markdown("<div style='margin: 25px 0;'></div>", unsafe_allow_html=True)
 
     # First show Detailed Opportunities
     st.markdown("""### Detailed Opportunities""", unsafe_allow_html=True)
     
-    display_df = filtered_df[['Organization Name', 'Opportunity Name', 'Geography', 
-                            'Expected Close Date', 'Probability', 'Amount', 
-                            'Sales Owner', 'Pre-sales Technical Lead', 'Business Owner', 
-                            'Type', 'KritiKal Focus Areas']].copy()
-    
-    display_df = display_df.rename(columns={
-        'Amount': 'Amount (In Lacs)',
-        'Pre-sales Technical Lead': 'Tech Owner',
-        'Type': 'Hunting /farming'
-    })
-    
-    display_df['Amount (In Lacs)'] = display_df['Amount (In Lacs)'].apply(lambda x: int(x/100000) if pd.notnull(x) else 0)
-    display_df['Probability'] = display_df['Probability'].apply(format_percentage)
-    display_df['Weighted Revenue (In Lacs)'] = display_df.apply(
-        lambda row: int((row['Amount (In Lacs)']) * float(str(row['Probability']).rstrip('%'))/100) if pd.notnull(row['Amount (In Lacs)']) else 0, 
-        axis=1
-    )
-    
-    display_df['Expected Close Date'] = pd.to_datetime(display_df['Expected Close Date']).dt.strftime('%d-%b-%Y')
-    display_df = display_df.sort_values('Amount (In Lacs)', ascending=False)
-    
-    display_df.index = range(1, len(display_df) + 1)
-    display_df.index.name = 'S.No'
-    
-    st.dataframe(
-        display_df,
-        column_config={
-            'Amount (In Lacs)': st.column_config.NumberColumn(
-                'Amount (In Lacs)',
-                format="₹%d L",
-                help="Amount in Lakhs"
-            ),
-            'Weighted Revenue (In Lacs)': st.column_config.NumberColumn(
-                'Weighted Revenue (In Lacs)',
-                format="₹%d L",
-                help="Weighted Revenue in Lakhs"
-            ),
-            'Probability': st.column_config.TextColumn(
-                'Probability',
-                help="Probability of winning the deal"
-            ),
-            'Expected Close Date': st.column_config.TextColumn(
-                'Expected Close Date',
-                help="Expected closing date"
-            )
-        }
-    )
+    with profiling.section("sales_team.detail_prepare", rows=len(filtered_df)):
+        detail_columns = ['Organization Name', 'Opportunity Name', 'Geography', 
+                          'Expected Close Date', 'Probability', 'Amount', 
+                          'Sales Owner', 'Pre-sales Technical Lead', 'Business Owner', 
+                          'Type', 'KritiKal Focus Areas']
+        # Optional columns the upload doesn't have are left out of the table
+        display_df = filtered_df[[column for column in detail_columns if column in filtered_df.columns]].copy()
+    
+        display_df = display_df.rename(columns={
+            'Amount': 'Amount (In Lacs)',
+            'Pre-sales Technical Lead': 'Tech Owner',
+            'Type': 'Hunting /farming'
+        })
+    
+        # Whole lakhs and whole percentages, truncated, from the columns parsed at ingest
+        display_df['Amount (In Lacs)'] = (display_df['Amount (In Lacs)'] / 100000).fillna(0).astype(int)
+        display_df['Probability'] = np.trunc(filtered_df['Probability_Num']).astype(int)
+        display_df['Weighted Revenue (In Lacs)'] = (
+            display_df['Amount (In Lacs)'] * display_df['Probability'] / 100
+        ).astype(int)
+    
+        display_df = display_df.sort_values('Amount (In Lacs)', ascending=False)
+    
+        display_df.index = range(1, len(display_df) + 1)
+        display_df.index.name = 'S.No'
+    
+    with profiling.section("sales_team.detail_table"):
+        st.dataframe(
+            display_df,
+            column_config={
+                'Amount (In Lacs)': st.column_config.NumberColumn(
+                    'Amount (In Lacs)',
+                    format="₹%d L",
+                    help="Amount in Lakhs"
+                ),
+                'Weighted Revenue (In Lacs)': st.column_config.NumberColumn(
+                    'Weighted Revenue (In Lacs)',
+                    format="₹%d L",
+                    help="Weighted Revenue in Lakhs"
+                ),
+                'Probability': st.column_config.NumberColumn(
+                    'Probability',
+                    format="%d%%",
+                    help="Probability of winning the deal"
+                ),
+                'Expected Close Date': st.column_config.DateColumn(
+                    'Expected Close Date',
+                    format="DD-MMM-YYYY",
+                    help="Expected closing date"
+                )
+            }
+        )
 
     st.markdown("<div style='margin: 25px 0;'></div>", unsafe_allow_html=True)
 
@@ -1476,55 +1061,88 @@ def show_sales_team():
     """, unsafe_allow_html=True)
     
     # Calculate team metrics
-    team_metrics = df.groupby('Sales Owner').agg({
-        'Amount': lambda x: round(x[df['Sales Stage'].str.contains('Won', case=False, na=False)].sum() / 100000, 1),
-        'Sales Stage': lambda x: x[df['Sales Stage'].str.contains('Won', case=False, na=False)].count()
-    }).reset_index()
-    team_metrics.columns = ['Sales Owner', 'Closed Won', 'Closed Deals']
-    
-    pipeline_df = df[~df['Sales Stage'].str.contains('Won', case=False, na=False)]
-    total_pipeline = round(pipeline_df.groupby('Sales Owner')['Amount'].sum() / 100000, 1)
-    team_metrics['Current Pipeline'] = team_metrics['Sales Owner'].map(total_pipeline)
-    
-    def calculate_weighted_projection(owner):
-        owner_pipeline = pipeline_df[pipeline_df['Sales Owner'] == owner]
-        weighted_sum = sum((amt * pr / 100) 
-                           for amt, pr in zip(owner_pipeline['Amount'], owner_pipeline['Probability_Num']))
-        return round(weighted_sum / 100000, 1)
-    
-    team_metrics['Weighted Projections'] = team_metrics['Sales Owner'].apply(calculate_weighted_projection)
-    
-    total_deals_owner = pipeline_df.groupby('Sales Owner').size()
-    team_metrics['Pipeline Deals'] = team_metrics['Sales Owner'].map(total_deals_owner)
-    team_metrics['Win Rate'] = round((team_metrics['Closed Deals'] / (team_metrics['Closed Deals'] + team_metrics['Pipeline Deals']) * 100), 1)
-    team_metrics = team_metrics.sort_values('Current Pipeline', ascending=False)
+    with profiling.section("sales_team.member_metrics", rows=len(df)):
+        team_metrics = analytics.get_engine(
+            df, key=dataset.key('current')
+        ).member_performance()
     
     summary_data = team_metrics.copy()
+    columns = ['Sales Owner', 'Current Pipeline', 'Weighted Projections']
+    if what_if:
+        with profiling.section("sales_team.scenario_members", rows=len(cube)):
+            owners = cube.weighted(overrides, 'Sales Owner').set_index('Sales Owner')
+        change = (owners['Scenario Weighted'] - owners['Weighted']).reindex(summary_data['Sales Owner']).fillna(0)
+        summary_data['What-if Weighted'] = (
+            summary_data['Weighted Projections'] + change.to_numpy()
+        ).round(1).apply(lambda x: f"₹{x:,}L")
+        columns.append('What-if Weighted')
     summary_data['Current Pipeline'] = summary_data['Current Pipeline'].apply(lambda x: f"₹{x:,}L")
     summary_data['Weighted Projections'] = summary_data['Weighted Projections'].apply(lambda x: f"₹{x:,}L")
     summary_data['Closed Won'] = summary_data['Closed Won'].apply(lambda x: f"₹{x:,}L")
     summary_data['Win Rate'] = summary_data['Win Rate'].apply(lambda x: f"{x}%")
     
-    st.dataframe(
-        summary_data[[
-            'Sales Owner',
-            'Current Pipeline',
-            'Weighted Projections',
-            'Closed Won',
-            'Pipeline Deals',
-            'Closed Deals',
-            'Win Rate'
-        ]],
-        use_container_width=True
-    )
+    with profiling.section("sales_team.member_table"):
+        st.dataframe(
+            summary_data[columns + [
+                'Closed Won',
+                'Pipeline Deals',
+                'Closed Deals',
+                'Win Rate'
+            ]],
+            use_container_width=True
+        )
+
+def show_scenario_panel(cube):
+    """Per-stage and per-practice probability adjustments for the what-if scenario"""
+    overrides = {}
+    with st.expander("🧪 What-if Scenario"):
+        st.caption(
+            "Add or subtract probability points for every open deal in a stage or practice; "
+            "weighted projections below are recomputed for the scenario."
+        )
+        columns = st.columns(len(scenario.OVERRIDE_DIMENSIONS))
+        for column, dimension in zip(columns, scenario.OVERRIDE_DIMENSIONS):
+            labels = cube.labels[dimension]
+            with column:
+                edited = st.data_editor(
+                    pd.DataFrame({dimension: labels, 'Adjustment (pts)': np.zeros(len(labels), dtype=int)}),
+                    column_config={
+                        'Adjustment (pts)': st.column_config.NumberColumn(
+                            'Adjustment (pts)', min_value=-100, max_value=100, step=5, format="%+d"
+                        )
+                    },
+                    disabled=[dimension],
+                    hide_index=True,
+                    use_container_width=True,
+                    key=f"scenario_{dimension}",
+                )
+            adjustments = edited.set_index(dimension)['Adjustment (pts)'].fillna(0)
+            overrides[dimension] = adjustments[adjustments != 0].to_dict()
+
+        if scenario.active(overrides):
+            with profiling.section("sales_team.scenario_practices", rows=len(cube)):
+                practices = cube.weighted(overrides, 'Practice')
+            practices['Change'] = practices['Scenario Weighted'] - practices['Weighted']
+            st.dataframe(
+                practices,
+                column_config={
+                    column: st.column_config.NumberColumn(column, format="₹%.1f L")
+                    for column in ['Weighted', 'Scenario Weighted', 'Change']
+                },
+                hide_index=True,
+                use_container_width=True,
+            )
+    return overrides
+
 
 def show_detailed():
-    if st.session_state.df is None:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload your sales data to view detailed information")
         return
     
     st.title("Detailed Sales Data")
-    df = st.session_state.df
+    df = dataset.source('current')
     search = st.text_input("Search", placeholder="Search in any field...")
     
     if search:
@@ -1535,151 +1153,157 @@ def show_detailed():
     st.dataframe(df, use_container_width=True)
 
 def show_ytd_dashboard():
-    if 'df_current' not in st.session_state or 'df_previous' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload data first.")
         return
     
-    df_current = st.session_state.df_current
-    df_previous = st.session_state.df_previous
+    df_current = dataset.current
+    df_previous = dataset.previous
     
-    # Modern header with glassmorphism effect
-    st.markdown("""
-        <div style='
-            background: linear-gradient(135deg, rgba(30, 60, 114, 0.95) 0%, rgba(42, 82, 152, 0.95) 100%);
-            backdrop-filter: blur(8px);
-            -webkit-backdrop-filter: blur(8px);
-            padding: 2rem;
-            border-radius: 20px;
-            box-shadow: 0 8px 32px 0 rgba(31, 38, 135, 0.15);
-            border: 1px solid rgba(255, 255, 255, 0.18);
-            margin-bottom: 2rem;
-        '>
-            <h1 style='
-                color: white;
-                margin: 0;
-                text-align: center;
-                font-size: 2.5rem;
-                font-weight: 700;
-                letter-spacing: 1px;
-                text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-            '>YTD Performance Dashboard</h1>
-        </div>
-    """, unsafe_allow_html=True)
+    # Modern header with glassmorphism effect; a plain title in lite mode
+    if lite.enabled():
+        st.title("YTD Performance Dashboard")
+    else:
+        st.markdown("""
+            <div style='
+                background: linear-gradient(135deg, rgba(30, 60, 114, 0.95) 0%, rgba(42, 82, 152, 0.95) 100%);
+                backdrop-filter: blur(8px);
+                -webkit-backdrop-filter: blur(8px);
+                padding: 2rem;
+                border-radius: 20px;
+                box-shadow: 0 8px 32px 0 rgba(31, 38, 135, 0.15);
+                border: 1px solid rgba(255, 255, 255, 0.18);
+                margin-bottom: 2rem;
+            '>
+                <h1 style='
+                    color: white;
+                    margin: 0;
+                    text-align: center;
+                    font-size: 2.5rem;
+                    font-weight: 700;
+                    letter-spacing: 1px;
+                    text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+                '>YTD Performance Dashboard</h1>
+            </div>
+        """, unsafe_allow_html=True)
     
     # Enhanced filters section with 6 columns
     st.markdown("### 🎯 Filters")
     col1, col2, col3, col4, col5, col6 = st.columns(6)
     
     with col1:
-        sales_owners = ["All"] + sorted(df_current['Sales Owner'].dropna().unique().tolist()) if 'Sales Owner' in df_current.columns else ["All"]
+        sales_owners = ["All"] + dataset.options('Sales Owner')
         selected_owner = st.selectbox("Sales Owner", sales_owners)
     
     with col2:
-        # Try different possible column names for P&L Centre/Practice
-        practice_column = next((col for col in ['P&L Centre', 'Practice', 'Business Unit', 'Department'] 
-                              if col in df_current.columns), None)
+        practice_column = dataset.practice_column
         if practice_column:
-            practices = ["All"] + sorted(df_current[practice_column].dropna().unique().tolist())
-            selected_practice = st.selectbox(practice_column, practices)
+            practices = ["All"] + dataset.options(practice_column)
+            selected_practice = st.selectbox(dataset.label(practice_column), practices)
         else:
             selected_practice = "All"
             st.warning("Practice/P&L Centre column not found")
     
     with col3:
-        types = ["All"] + sorted(df_current['Type'].dropna().unique().tolist()) if 'Type' in df_current.columns else ["All"]
+        types = ["All"] + dataset.options('Type')
         selected_type = st.selectbox("Type", types)
     
     with col4:
-        # Try different possible column names for Status
-        status_column = next((col for col in ['Status', 'Sales Stage', 'Stage'] 
-                            if col in df_current.columns), None)
+        status_column = dataset.status_column
         if status_column:
-            statuses = ["All"] + sorted(df_current[status_column].dropna().unique().tolist())
-            selected_status = st.selectbox(status_column, statuses)
+            statuses = ["All"] + dataset.options(status_column)
+            selected_status = st.selectbox(dataset.label(status_column), statuses)
         else:
             selected_status = "All"
             st.warning("Status column not found")
     
     with col5:
-        geographies = ["All"] + sorted(df_current['Geography'].dropna().unique().tolist()) if 'Geography' in df_current.columns else ["All"]
+        geographies = ["All"] + dataset.options('Geography')
         selected_geography = st.selectbox("Geography", geographies)
     
     with col6:
-        years = ["All"]
-        if 'Year' in df_current.columns:
-            years.extend(sorted(df_current['Year'].dropna().unique().tolist()))
-        elif 'Expected Close Date' in df_current.columns:
-            df_current['Year'] = pd.to_datetime(df_current['Expected Close Date'], dayfirst=True).dt.year
-            years.extend(sorted(df_current['Year'].dropna().unique().tolist()))
-        selected_year = st.selectbox("Fiscal Year", years)
-    
-    # Filter data based on selections
-    def filter_data(df):
-        filtered_df = df.copy()
-        
-        if 'Sales Owner' in df.columns and selected_owner != "All":
-            filtered_df = filtered_df[filtered_df['Sales Owner'] == selected_owner]
-        
-        if practice_column and selected_practice != "All":
-            filtered_df = filtered_df[filtered_df[practice_column] == selected_practice]
-        
-        if 'Type' in df.columns and selected_type != "All":
-            filtered_df = filtered_df[filtered_df['Type'] == selected_type]
-        
-        if status_column and selected_status != "All":
-            filtered_df = filtered_df[filtered_df[status_column] == selected_status]
-        
-        if 'Geography' in df.columns and selected_geography != "All":
-            filtered_df = filtered_df[filtered_df['Geography'] == selected_geography]
-        
-        if selected_year != "All":
-            if 'Year' in df.columns:
-                filtered_df = filtered_df[filtered_df['Year'] == selected_year]
-            elif 'Expected Close Date' in df.columns:
-                filtered_df = filtered_df[pd.to_datetime(filtered_df['Expected Close Date'], dayfirst=True).dt.year == selected_year]
-            
-        return filtered_df
+        years = ["All"] + dataset.options('Fiscal_Year')
+        selected_year = st.selectbox(
+            "Fiscal Year", years, format_func=lambda year: year if year == "All" else fiscal.year_label(year)
+        )
     
-    df_current_filtered = filter_data(df_current)
-    df_previous_filtered = filter_data(df_previous)
+    # Equality filters for the selections, applied by the configured engine
+    selections = {}
+    if 'Sales Owner' in df_current.columns and selected_owner != "All":
+        selections['Sales Owner'] = selected_owner
+    if practice_column and selected_practice != "All":
+        selections[practice_column] = selected_practice
+    if 'Type' in df_current.columns and selected_type != "All":
+        selections['Type'] = selected_type
+    if status_column and selected_status != "All":
+        selections[status_column] = selected_status
+    if 'Geography' in df_current.columns and selected_geography != "All":
+        selections['Geography'] = selected_geography
+    if selected_year != "All":
+        selections['Fiscal_Year'] = selected_year
+    
+    profiling.annotate(filters={
+        'owner': selected_owner, 'practice': selected_practice, 'type': selected_type,
+        'status': selected_status, 'geography': selected_geography, 'year': selected_year
+    })
+    with profiling.section("ytd.filter", rows=len(df_current) + len(df_previous)):
+        won_column = 'Status_Won' if status_column else None
+        current = analytics.get_engine(df_current, key=dataset.key('current')).ytd_summary(selections, won_column)
+        previous = analytics.get_engine(df_previous, key=dataset.key('previous')).ytd_summary(selections, won_column)
+    
+    def kpis(summary):
+        won_deals = summary['won_deals']
+        return {
+            'Total Pipeline': summary['amount'] / 100000,
+            'Closed Won': summary['won_amount'] / 100000,
+            'Win Rate': won_deals / summary['deals'] * 100 if summary['deals'] > 0 else 0,
+            'Average Deal Size': summary['won_amount'] / won_deals / 100000 if won_deals > 0 else 0,
+        }
     
     # Define metrics dictionary with enhanced styling and animations
-    metrics = {
-        'Total Pipeline': {
-            'icon': '📈',
-            'current': df_current_filtered['Amount'].sum() / 100000,
-            'previous': df_previous_filtered['Amount'].sum() / 100000,
-            'description': 'Total pipeline value across all stages',
-            'gradient': 'linear-gradient(135deg, #3B82F6 0%, #1D4ED8 100%)',
-            'trend_icon': '↗️' if (df_current_filtered['Amount'].sum() / 100000) > (df_previous_filtered['Amount'].sum() / 100000) else '↘️'
-        },
-        'Closed Won': {
-            'icon': '🎯',
-            'current': df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / 100000 if status_column else 0,
-            'previous': df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / 100000 if status_column else 0,
-            'description': 'Successfully closed deals',
-            'gradient': 'linear-gradient(135deg, #10B981 0%, #059669 100%)',
-            'trend_icon': '↗️' if (df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / 100000) > (df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / 100000) else '↘️' if status_column else '➖'
-        },
-        'Win Rate': {
-            'icon': '🏆',
-            'current': (len(df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]) / len(df_current_filtered) * 100) if status_column and len(df_current_filtered) > 0 else 0,
-            'previous': (len(df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]) / len(df_previous_filtered) * 100) if status_column and len(df_previous_filtered) > 0 else 0,
-            'description': 'Deal success rate',
-            'gradient': 'linear-gradient(135deg, #8B5CF6 0%, #6D28D9 100%)',
-            'trend_icon': '↗️' if ((len(df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]) / len(df_current_filtered) * 100) if status_column and len(df_current_filtered) > 0 else 0) > ((len(df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]) / len(df_previous_filtered) * 100) if status_column and len(df_previous_filtered) > 0 else 0) else '↘️'
-        },
-        'Average Deal Size': {
-            'icon': '💰',
-            'current': (df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / len(df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)])) / 100000 if status_column and len(df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]) > 0 else 0,
-            'previous': (df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / len(df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)])) / 100000 if status_column and len(df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]) > 0 else 0,
-            'description': 'Average value per won deal',
-            'gradient': 'linear-gradient(135deg, #F59E0B 0%, #D97706 100%)',
-            'trend_icon': '↗️' if ((df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / len(df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)])) / 100000 if status_column and len(df_current_filtered[df_current_filtered[status_column].str.contains('Won', case=False, na=False)]) > 0 else 0) > ((df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]['Amount'].sum() / len(df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)])) / 100000 if status_column and len(df_previous_filtered[df_previous_filtered[status_column].str.contains('Won', case=False, na=False)]) > 0 else 0) else '↘️'
+    with profiling.section("ytd.metrics"):
+        current_kpis = kpis(current)
+        previous_kpis = kpis(previous)
+        metrics = {
+            'Total Pipeline': {
+                'icon': '📈',
+                'description': 'Total pipeline value across all stages',
+                'gradient': 'linear-gradient(135deg, #3B82F6 0%, #1D4ED8 100%)',
+                'color': '#1D4ED8',
+            },
+            'Closed Won': {
+                'icon': '🎯',
+                'description': 'Successfully closed deals',
+                'gradient': 'linear-gradient(135deg, #10B981 0%, #059669 100%)',
+                'color': '#059669',
+            },
+            'Win Rate': {
+                'icon': '🏆',
+                'description': 'Deal success rate',
+                'gradient': 'linear-gradient(135deg, #8B5CF6 0%, #6D28D9 100%)',
+                'color': '#6D28D9',
+            },
+            'Average Deal Size': {
+                'icon': '💰',
+                'description': 'Average value per won deal',
+                'gradient': 'linear-gradient(135deg, #F59E0B 0%, #D97706 100%)',
+                'color': '#D97706',
+            }
         }
-    }
+        for metric_name, data in metrics.items():
+            data['current'] = current_kpis[metric_name]
+            data['previous'] = previous_kpis[metric_name]
+            data['trend_icon'] = '↗️' if data['current'] > data['previous'] else '↘️'
+
+    if lite.enabled():
+        st.subheader("📊 Key Performance Metrics")
+        with profiling.section("ytd.cards"):
+            st.markdown(lite_metric_cards(metrics), unsafe_allow_html=True)
+        return
 
     # Key Metrics Section with ultra-modern design
+    assets.stylesheet("ytd.css")
     st.markdown("""
         <div style='
             background: linear-gradient(135deg, rgba(17, 25, 40, 0.95) 0%, rgba(28, 41, 66, 0.95) 100%);
@@ -1715,172 +1339,157 @@ def show_ytd_dashboard():
                 position: relative;
             '>📊 Key Performance Metrics</h2>
         </div>
-        <style>
-            @keyframes glow {
-                0% { transform: rotate(0deg); }
-                100% { transform: rotate(360deg); }
-            }
-            @keyframes pulse {
-                0% { transform: scale(1); }
-                50% { transform: scale(1.05); }
-                100% { transform: scale(1); }
-            }
-            @keyframes fadeIn {
-                from { opacity: 0; transform: translateY(20px); }
-                to { opacity: 1; transform: translateY(0); }
-            }
-            .metric-card {
-                animation: fadeIn 0.6s ease-out forwards;
-                transition: all 0.3s ease;
-            }
-            .metric-card:hover {
-                transform: translateY(-5px);
-                box-shadow: 0 12px 40px rgba(0,0,0,0.2);
-            }
-            .trend-icon {
-                transition: all 0.3s ease;
-            }
-            .metric-card:hover .trend-icon {
-                transform: scale(1.2);
-            }
-            .pulse-animation {
-                animation: pulse 2s infinite;
-            }
-        </style>
     """, unsafe_allow_html=True)
     
     # Display enhanced metric cards with modern design
-    metric_cols = st.columns(len(metrics))
-    for col, (metric_name, data) in zip(metric_cols, metrics.items()):
-        with col:
-            delta = data['current'] - data['previous']
-            delta_color = "normal" if delta >= 0 else "inverse"
+    with profiling.section("ytd.cards"):
+        metric_cols = st.columns(len(metrics))
+        for col, (metric_name, data) in zip(metric_cols, metrics.items()):
+            with col:
+                delta = data['current'] - data['previous']
+                delta_color = "normal" if delta >= 0 else "inverse"
             
-            st.markdown(f"""
-                <div class='metric-card' style='
-                    background: {data['gradient']};
-                    border-radius: 20px;
-                    padding: 2rem;
-                    height: 100%;
-                    position: relative;
-                    overflow: hidden;
-                    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.15);
-                    backdrop-filter: blur(10px);
-                    -webkit-backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.18);
-                '>
-                    <div class='trend-icon' style='
-                        position: absolute;
-                        top: 15px;
-                        right: 15px;
-                        font-size: 1.8rem;
-                        opacity: 0.9;
-                        text-shadow: 0 2px 4px rgba(0,0,0,0.2);
-                    '>{data['trend_icon']}</div>
-                    <div style='
-                        font-size: 2.2rem;
-                        margin-bottom: 1rem;
-                        text-shadow: 0 2px 4px rgba(0,0,0,0.2);
-                    '>{data['icon']}</div>
-                    <h3 style='
-                        color: white;
-                        font-size: 1.3rem;
-                        margin-bottom: 0.8rem;
-                        font-weight: 700;
-                        letter-spacing: 0.5px;
-                    '>{metric_name}</h3>
-                    <div class='pulse-animation' style='
-                        color: white;
-                        font-size: 2.2rem;
-                        font-weight: 800;
-                        margin: 1rem 0;
-                        text-shadow: 0 2px 4px rgba(0,0,0,0.2);
-                        letter-spacing: 0.5px;
-                    '>{format_metric(data['current'], metric_name)}</div>
-                    <div style='
-                        color: {'#4ADE80' if delta >= 0 else '#F87171'};
-                        font-size: 1.1rem;
-                        font-weight: 600;
-                        display: flex;
-                        align-items: center;
-                        gap: 0.5rem;
-                        margin: 0.8rem 0;
+                st.markdown(f"""
+                    <div class='metric-card' style='
+                        background: {data['gradient']};
+                        border-radius: 20px;
+                        padding: 2rem;
+                        height: 100%;
+                        position: relative;
+                        overflow: hidden;
+                        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.15);
+                        backdrop-filter: blur(10px);
+                        -webkit-backdrop-filter: blur(10px);
+                        border: 1px solid rgba(255, 255, 255, 0.18);
                     '>
-                        <span style='
+                        <div class='trend-icon' style='
+                            position: absolute;
+                            top: 15px;
+                            right: 15px;
+                            font-size: 1.8rem;
+                            opacity: 0.9;
+                            text-shadow: 0 2px 4px rgba(0,0,0,0.2);
+                        '>{data['trend_icon']}</div>
+                        <div style='
+                            font-size: 2.2rem;
+                            margin-bottom: 1rem;
+                            text-shadow: 0 2px 4px rgba(0,0,0,0.2);
+                        '>{data['icon']}</div>
+                        <h3 style='
+                            color: white;
+                            font-size: 1.3rem;
+                            margin-bottom: 0.8rem;
+                            font-weight: 700;
+                            letter-spacing: 0.5px;
+                        '>{metric_name}</h3>
+                        <div class='pulse-animation' style='
+                            color: white;
+                            font-size: 2.2rem;
+                            font-weight: 800;
+                            margin: 1rem 0;
+                            text-shadow: 0 2px 4px rgba(0,0,0,0.2);
+                            letter-spacing: 0.5px;
+                        '>{format_metric(data['current'], metric_name)}</div>
+                        <div style='
+                            color: {'#4ADE80' if delta >= 0 else '#F87171'};
+                            font-size: 1.1rem;
+                            font-weight: 600;
+                            display: flex;
+                            align-items: center;
+                            gap: 0.5rem;
+                            margin: 0.8rem 0;
+                        '>
+                            <span style='
+                                background: rgba(255,255,255,0.1);
+                                padding: 0.4rem 0.8rem;
+                                border-radius: 12px;
+                                backdrop-filter: blur(5px);
+                                -webkit-backdrop-filter: blur(5px);
+                            '>
+                                {format_metric(abs(delta), metric_name)}
+                                <span style='margin-left: 4px;'>{' ⬆️' if delta >= 0 else ' ⬇️'}</span>
+                            </span>
+                        </div>
+                        <div style='
+                            color: rgba(255, 255, 255, 0.9);
+                            font-size: 1rem;
+                            font-weight: 500;
+                            margin-top: 0.8rem;
+                            letter-spacing: 0.3px;
+                            line-height: 1.4;
+                        '>{data['description']}</div>
+                        <div class='sparkline-container' style='
+                            margin-top: 1.5rem;
+                            padding: 0.8rem;
                             background: rgba(255,255,255,0.1);
-                            padding: 0.4rem 0.8rem;
                             border-radius: 12px;
                             backdrop-filter: blur(5px);
                             -webkit-backdrop-filter: blur(5px);
                         '>
-                            {format_metric(abs(delta), metric_name)}
-                            <span style='margin-left: 4px;'>{' ⬆️' if delta >= 0 else ' ⬇️'}</span>
-                        </span>
                     </div>
-                    <div style='
-                        color: rgba(255, 255, 255, 0.9);
-                        font-size: 1rem;
-                        font-weight: 500;
-                        margin-top: 0.8rem;
-                        letter-spacing: 0.3px;
-                        line-height: 1.4;
-                    '>{data['description']}</div>
-                    <div class='sparkline-container' style='
-                        margin-top: 1.5rem;
-                        padding: 0.8rem;
-                        background: rgba(255,255,255,0.1);
-                        border-radius: 12px;
-                        backdrop-filter: blur(5px);
-                        -webkit-backdrop-filter: blur(5px);
-                    '>
-                </div>
-            """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
             
-            # Add enhanced sparkline charts
-            if metric_name in ['Total Pipeline', 'Closed Won']:
-                values = [data['previous'], data['current']]
-                trend_chart = go.Figure(go.Scatter(
-                    y=values,
-                    mode='lines+markers',
-                    line=dict(
-                        color='white',
-                        width=3,
-                        shape='spline',
-                        smoothing=1.3
-                    ),
-                    marker=dict(
-                        color='white',
-                        size=8,
-                        symbol='diamond',
+                # Add enhanced sparkline charts
+                if metric_name in ['Total Pipeline', 'Closed Won']:
+                    values = [data['previous'], data['current']]
+                    trend_chart = go.Figure(go.Scatter(
+                        y=values,
+                        mode='lines+markers',
                         line=dict(
-                            color='rgba(255,255,255,0.5)',
-                            width=2
-                        )
-                    ),
-                    fill='tonexty',
-                    fillcolor='rgba(255,255,255,0.1)'
-                ))
-                trend_chart.update_layout(
-                    height=80,
-                    margin=dict(l=0, r=0, t=0, b=0),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    showlegend=False,
-                    xaxis=dict(
-                        showgrid=False,
-                        showticklabels=False,
-                        showline=False,
-                        zeroline=False
-                    ),
-                    yaxis=dict(
-                        showgrid=False,
-                        showticklabels=False,
-                        showline=False,
-                        zeroline=False
-                    ),
-                    hovermode=False
-                )
-                st.plotly_chart(trend_chart, use_container_width=True, config={'displayModeBar': False})
+                            color='white',
+                            width=3,
+                            shape='spline',
+                            smoothing=1.3
+                        ),
+                        marker=dict(
+                            color='white',
+                            size=8,
+                            symbol='diamond',
+                            line=dict(
+                                color='rgba(255,255,255,0.5)',
+                                width=2
+                            )
+                        ),
+                        fill='tonexty',
+                        fillcolor='rgba(255,255,255,0.1)'
+                    ))
+                    trend_chart.update_layout(
+                        height=80,
+                        margin=dict(l=0, r=0, t=0, b=0),
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        showlegend=False,
+                        xaxis=dict(
+                            showgrid=False,
+                            showticklabels=False,
+                            showline=False,
+                            zeroline=False
+                        ),
+                        yaxis=dict(
+                            showgrid=False,
+                            showticklabels=False,
+                            showline=False,
+                            zeroline=False
+                        ),
+                        hovermode=False
+                    )
+                    st.plotly_chart(trend_chart, use_container_width=True, config={'displayModeBar': False})
+
+def lite_metric_cards(metrics):
+    """The YTD metric cards as one plain HTML grid, with SVG sparklines, for lite mode"""
+    cards = []
+    for metric_name, data in metrics.items():
+        delta = data['current'] - data['previous']
+        cards.append(lite.card(
+            f"{data['icon']} {metric_name} {data['trend_icon']}",
+            format_metric(data['current'], metric_name),
+            data['color'],
+            delta=f"{format_metric(abs(delta), metric_name)} {'⬆️' if delta >= 0 else '⬇️'}",
+            positive=delta >= 0,
+            description=data['description'],
+            sparkline=[data['previous'], data['current']] if metric_name in ['Total Pipeline', 'Closed Won'] else None,
+        ))
+    return lite.cards(cards)
 
 def format_metric(value, metric_type):
     """Helper function to format metric values"""
@@ -1891,56 +1500,80 @@ def format_metric(value, metric_type):
     return f"{abs(value):.0f}"
 
 def display_dashboard():
-    if 'df_current' not in st.session_state or 'df_previous' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload the data first!")
         return
 
-    df_current = st.session_state.df_current
-    df_previous = st.session_state.df_previous
+    df_current = dataset.current
+    df_previous = dataset.previous
 
     st.title("Sales Dashboard")
 
     col1, col2, col3 = st.columns([1, 1, 1])
 
     with col1:
-        sales_owners = sorted(df_current['Sales Owner'].dropna().unique().tolist())
+        sales_owners = dataset.options('Sales Owner')
         selected_sales_owner = st.selectbox("Select Sales Owner", ["All Sales Owners"] + sales_owners)
 
     with col2:
-        quarters = ['Q1', 'Q2', 'Q3', 'Q4']
-        selected_quarter = st.selectbox("Select Quarter", ["All Quarters"] + quarters)
+        selected_quarter = st.selectbox(
+            "Select Quarter", ["All Quarters"] + fiscal.QUARTERS,
+            format_func=lambda quarter: quarter if quarter == "All Quarters" else fiscal.quarter_label(quarter)
+        )
 
     with col3:
-        practices = sorted(df_current['Practice'].dropna().unique().tolist())
+        practices = dataset.options('Practice')
         selected_practice = st.selectbox("Select Practice", ["All Practices"] + practices)
 
-    if selected_sales_owner != "All Sales Owners":
-        df_current = df_current[df_current['Sales Owner'] == selected_sales_owner]
-        df_previous = df_previous[df_previous['Sales Owner'] == selected_sales_owner]
-
-    if selected_quarter != "All Quarters":
-        df_current = df_current[df_current['Quarter'] == selected_quarter]
-        df_previous = df_previous[df_previous['Quarter'] == selected_quarter]
-
-    if selected_practice != "All Practices":
-        df_current = df_current[df_current['Practice'] == selected_practice]
-        df_previous = df_previous[df_previous['Practice'] == selected_practice]
-
-    committed_current_week = df_current[df_current['Status'] == "Committed for the Month"]['Amount'].sum()
-    upside_current_week = df_current[df_current['Status'] == "Upside for the Month"]['Amount'].sum()
-    closed_won_current_week = df_current[df_current['Status'] == "Closed Won"]['Amount'].sum()
-
-    committed_previous_week = df_previous[df_previous['Status'] == "Committed for the Month"]['Amount'].sum()
-    upside_previous_week = df_previous[df_previous['Status'] == "Upside for the Month"]['Amount'].sum()
-    closed_won_previous_week = df_previous[df_previous['Status'] == "Closed Won"]['Amount'].sum()
-
-    committed_delta = committed_current_week - committed_previous_week
-    upside_delta = upside_current_week - upside_previous_week
-    closed_won_delta = closed_won_current_week - closed_won_previous_week
-
-    overall_committed_current_week = committed_current_week + closed_won_current_week
-    overall_committed_previous_week = committed_previous_week + closed_won_previous_week
-    overall_committed_delta = overall_committed_current_week - overall_committed_previous_week
+    profiling.annotate(filters={
+        'owner': selected_sales_owner, 'quarter': selected_quarter, 'practice': selected_practice
+    })
+    with profiling.section("dashboard.metrics", rows=len(df_current) + len(df_previous)):
+        selections = {}
+        if selected_sales_owner != "All Sales Owners":
+            selections['Sales Owner'] = selected_sales_owner
+        if selected_quarter != "All Quarters":
+            selections['Fiscal_Quarter'] = selected_quarter
+        if selected_practice != "All Practices":
+            selections['Practice'] = selected_practice
+
+        current_week = analytics.get_engine(df_current, key=dataset.key('current')).quarter_summary(selections)
+        previous_week = analytics.get_engine(df_previous, key=dataset.key('previous')).quarter_summary(selections)
+
+        committed_current_week = current_week["Committed for the Month"]
+        upside_current_week = current_week["Upside for the Month"]
+        closed_won_current_week = current_week["Closed Won"]
+
+        committed_previous_week = previous_week["Committed for the Month"]
+        upside_previous_week = previous_week["Upside for the Month"]
+        closed_won_previous_week = previous_week["Closed Won"]
+
+        committed_delta = committed_current_week - committed_previous_week
+        upside_delta = upside_current_week - upside_previous_week
+        closed_won_delta = closed_won_current_week - closed_won_previous_week
+
+        overall_committed_current_week = committed_current_week + closed_won_current_week
+        overall_committed_previous_week = committed_previous_week + closed_won_previous_week
+        overall_committed_delta = overall_committed_current_week - overall_committed_previous_week
+
+    if lite.enabled():
+        # One grid of plain cards: this week's total, the change and a previous-to-current sparkline
+        rows = [
+            ("Committed Data", committed_current_week, committed_previous_week, '#2a5298'),
+            ("Upside Data", upside_current_week, upside_previous_week, '#6B5B95'),
+            ("Closed Won", closed_won_current_week, closed_won_previous_week, '#27AE60'),
+            ("Overall Committed Data", overall_committed_current_week, overall_committed_previous_week, '#D97706'),
+        ]
+        st.markdown(lite.cards([
+            lite.card(
+                label, f"₹{current / 100000:.0f}L", color,
+                delta=f"₹{(current - previous) / 100000:.0f}L vs ₹{previous / 100000:.0f}L last week",
+                positive=current >= previous, sparkline=[previous, current],
+            )
+            for label, current, previous, color in rows
+        ]), unsafe_allow_html=True)
+        return
 
     with st.container():
         st.markdown(f"""
@@ -2033,8 +1666,8 @@ def display_data_input():
     if uploaded_file is not None:
         try:
             # Read the Excel file and get sheet names
-            excel_file = pd.ExcelFile(uploaded_file)
-            sheet_names = excel_file.sheet_names
+            upload_fingerprint = dataset_store.fingerprint_upload(uploaded_file.getvalue())
+            sheet_names = get_sheet_names(upload_fingerprint, uploaded_file)
 
             # Sheet selection for current week
             current_week_sheet = st.selectbox(
@@ -2054,13 +1687,24 @@ def display_data_input():
                 st.warning("Please select different sheets for current and previous week data.")
                 return
 
-            # Read the selected sheets
-            df_current = pd.read_excel(uploaded_file, sheet_name=current_week_sheet)
-            df_previous = pd.read_excel(uploaded_file, sheet_name=previous_week_sheet)
-
-            # Store the dataframes in session state
-            st.session_state.df_current = df_current
-            st.session_state.df_previous = df_previous
+            def read_sheets():
+                with profiling.section("data_input.read_excel"):
+                    return {
+                        'current': pd.read_excel(uploaded_file, sheet_name=current_week_sheet),
+                        'previous': pd.read_excel(uploaded_file, sheet_name=previous_week_sheet),
+                    }
+
+            # Sessions share one parsed copy per distinct upload; only a handle is
+            # kept in session state, and the sheets are only parsed the first time
+            # any process on this host sees the upload (see dataset_store.load_frames)
+            fingerprint = dataset_store.fingerprint_upload(
+                upload_fingerprint.encode(), current_week_sheet, previous_week_sheet
+            )
+            dataset = row_security.restrict(
+                dataset_store.attach(fingerprint, read_sheets).dataset, row_security.session_scope()
+            )
+            df_current = dataset.source('current')
+            df_previous = dataset.source('previous')
 
             # Show success message
             st.success("Data uploaded successfully!")
@@ -2072,6 +1716,12 @@ def display_data_input():
             st.subheader("Previous Week Data Preview")
             st.dataframe(df_previous.head(), use_container_width=True)
 
+            # Sheet headers are mapped to the dashboard's column names once, at load time
+            with st.expander("Column mapping"):
+                for name, title in (('current', "Current week"), ('previous', "Previous week")):
+                    st.caption(title)
+                    st.dataframe(dataset.mappings[name].report(), hide_index=True, use_container_width=True)
+
         except Exception as e:
             st.error(f"Error reading the files: {str(e)}")
     else:
@@ -2079,11 +1729,15 @@ def display_data_input():
 
 def show_pipeline_analysis():
     """Advanced Pipeline Analysis View"""
-    if 'df_current' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload data first.")
         return
 
-    df = st.session_state.df_current
+    df = dataset.current
+    key = dataset.key('current')
+    with profiling.section("pipeline.index", rows=len(df)):
+        index = pipeline_index.get_index(key, df)
 
     st.markdown("""
         <div style='
@@ -2109,65 +1763,255 @@ def show_pipeline_analysis():
     with col1:
         probability_range = st.slider("Probability Range", 0, 100, (0, 100), 5)
     with col2:
-        amount_range = st.slider("Deal Size (Lakhs)", 
-                               int(df['Amount'].min()/100000), 
-                               int(df['Amount'].max()/100000), 
-                               (int(df['Amount'].min()/100000), int(df['Amount'].max()/100000)))
+        min_amount, max_amount = index.amount_bounds
+        amount_range = st.slider("Deal Size (Lakhs)", min_amount, max_amount, (min_amount, max_amount))
     with col3:
         timeline = st.selectbox("Timeline", ["Next Quarter", "Next 6 Months", "Next Year", "All"])
+    profiling.annotate(filters={
+        'probability': probability_range, 'amount': amount_range, 'timeline': timeline
+    })
 
-    # Filter data
-    filtered_df = df.copy()
-    filtered_df = filtered_df[
-        (filtered_df['Probability'].between(probability_range[0], probability_range[1])) &
-        (filtered_df['Amount'].between(amount_range[0]*100000, amount_range[1]*100000))
-    ]
+    # The Timeline window is a contiguous range of the date-sorted index; with
+    # "All" the sliders are answered from the prefix sums without touching rows
+    rows = index.window(timeline)
+    with profiling.section("pipeline.aggregate", rows=len(df) if rows is None else rows[1] - rows[0]):
+        stages, prob_dist, timeline_dist = index.query(probability_range, amount_range, rows)
 
     # Pipeline Funnel
-    stages = filtered_df['Sales Stage'].value_counts()
-    fig_funnel = go.Figure(go.Funnel(
-        y=stages.index,
-        x=stages.values,
-        textinfo="value+percent initial",
-        textposition="inside",
-        textfont=dict(size=16, color="white"),
-        marker=dict(
-            color=["#4CAF50", "#2196F3", "#9C27B0", "#FF9800", "#F44336"]
+    with profiling.section("pipeline.funnel"):
+        fig_funnel = go.Figure(go.Funnel(
+            y=stages['Sales Stage'],
+            x=stages['Deals'],
+            textinfo="value+percent initial",
+            textposition="inside",
+            textfont=dict(size=16, color="white"),
+            marker=dict(
+                color=["#4CAF50", "#2196F3", "#9C27B0", "#FF9800", "#F44336"]
+            )
+        ))
+        fig_funnel.update_layout(
+            title="Pipeline Funnel Analysis",
+            height=500,
+            showlegend=False
         )
-    ))
-    fig_funnel.update_layout(
-        title="Pipeline Funnel Analysis",
-        height=500,
-        showlegend=False
-    )
-    st.plotly_chart(fig_funnel, use_container_width=True)
+        st.plotly_chart(fig_funnel, use_container_width=True)
 
     # Probability Distribution
     col1, col2 = st.columns(2)
     with col1:
-        prob_dist = filtered_df.groupby(pd.cut(filtered_df['Probability'], 
-                                             bins=[0, 25, 50, 75, 100]))['Amount'].sum()/100000
-        fig_prob = px.bar(
-            x=["0-25%", "26-50%", "51-75%", "76-100%"],
-            y=prob_dist.values,
-            title="Pipeline by Probability",
-            labels={"x": "Probability Range", "y": "Amount (Lakhs)"}
+        with profiling.section("pipeline.probability"):
+            fig_prob = px.bar(
+                x=prob_dist['Band'],
+                y=prob_dist['Amount'],
+                title="Pipeline by Probability",
+                labels={"x": "Probability Range", "y": "Amount (Lakhs)"}
+            )
+            fig_prob.update_traces(marker_color='#2196F3')
+            st.plotly_chart(fig_prob, use_container_width=True)
+
+    with col2:
+        with profiling.section("pipeline.timeline"):
+            fig_timeline = px.line(
+                timeline_dist.assign(Month=timeline_dist['Month'].dt.to_timestamp()),
+                x='Month',
+                y='Amount',
+                title="Pipeline Timeline",
+                labels={"Month": "Month", "Amount": "Amount (Lakhs)"}
+            )
+            fig_timeline.update_traces(line_color='#4CAF50')
+            st.plotly_chart(fig_timeline, use_container_width=True)
+
+def show_forecast():
+    """Monte Carlo bookings forecast for the open pipeline"""
+    dataset = row_security.session_dataset()
+    if dataset is None:
+        st.warning("Please upload data first.")
+        return
+
+    df = dataset.current
+
+    st.markdown("""
+        <div style='
+            background: linear-gradient(135deg, #004d40 0%, #00796b 100%);
+            padding: 2rem;
+            border-radius: 20px;
+            margin-bottom: 2rem;
+            box-shadow: 0 8px 32px rgba(0,0,0,0.15);
+        '>
+            <h2 style='
+                color: white;
+                text-align: center;
+                font-size: 2.2rem;
+                font-weight: 700;
+                margin: 0;
+                text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+            '>Pipeline Forecast</h2>
+        </div>
+    """, unsafe_allow_html=True)
+    st.caption(
+        "Each open deal closes independently with its probability; P10/P50/P90 are the bookings "
+        "reached in 10%, 50% and 90% of simulated scenarios, next to the deterministic weighted projection."
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        scenarios = st.number_input("Scenarios", min_value=1000, max_value=200000,
+                                    value=forecast.DEFAULT_SCENARIOS, step=1000)
+    with col2:
+        seed = st.number_input("Random Seed", min_value=0, value=forecast.DEFAULT_SEED, step=1)
+    with col3:
+        dimension = st.selectbox("Group By", forecast.DIMENSIONS)
+    profiling.annotate(filters={'scenarios': scenarios, 'seed': seed, 'dimension': dimension})
+
+    run = forecast.get_forecast(dataset.fingerprint, df, scenarios, seed)
+    if not run.done():
+        # The simulation runs on a worker thread; poll it so new widget input
+        # interrupts this rerun instead of waiting for the result
+        with profiling.section("forecast.wait"):
+            progress = st.progress(0.0, text="Simulating scenarios...")
+            while not run.done():
+                time.sleep(0.2)
+                progress.progress(run.progress, text=f"Simulating scenarios... {run.progress:.0%}")
+            progress.empty()
+    result = run.result()
+
+    total = result['Total']
+    cols = st.columns(4)
+    for col, (label, value) in zip(cols, [
+        ("Weighted Projection", total['Weighted']),
+        ("P10 Bookings", total['P10']),
+        ("P50 Bookings", total['P50']),
+        ("P90 Bookings", total['P90']),
+    ]):
+        with col:
+            st.markdown(f"""
+                <div style='text-align: center; padding: 15px; background: #f8f9fa; border-radius: 10px;'>
+                    <div class='metric-label'>{label}</div>
+                    <div class='metric-value'>₹{value:,.0f}L</div>
+                    <div style='color: #666; font-size: 0.9em;'>{total['Open Deals']:,} open deals</div>
+                </div>
+            """, unsafe_allow_html=True)
+
+    table = result[dimension]
+    with profiling.section("forecast.chart"):
+        fig = go.Figure(go.Bar(
+            x=table[dimension],
+            y=table['P50'],
+            name='P50',
+            marker_color='#00796b',
+            error_y=dict(
+                type='data',
+                symmetric=False,
+                array=table['P90'] - table['P50'],
+                arrayminus=table['P50'] - table['P10'],
+            ),
+        ))
+        fig.add_trace(go.Scatter(
+            x=table[dimension],
+            y=table['Weighted'],
+            name='Weighted Projection',
+            mode='markers',
+            marker=dict(color='#F59E0B', size=10, symbol='diamond'),
+        ))
+        fig.update_layout(
+            title=f"Forecast Bookings by {dimension} (P10-P90)",
+            yaxis_title="Amount (Lakhs)",
+            height=500,
         )
-        fig_prob.update_traces(marker_color='#2196F3')
-        st.plotly_chart(fig_prob, use_container_width=True)
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(
+        table,
+        column_config={
+            column: st.column_config.NumberColumn(column, format="₹%.1f L")
+            for column in ['Pipeline', 'Weighted', 'P10', 'P50', 'P90']
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+def show_pivot():
+    """Two-dimensional pivot of any cube dimensions, answered from the pre-aggregated cube"""
+    dataset = row_security.session_dataset()
+    if dataset is None:
+        st.warning("Please upload data first.")
+        return
+
+    st.markdown("""
+        <div style='
+            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+            padding: 2rem;
+            border-radius: 20px;
+            margin-bottom: 2rem;
+            box-shadow: 0 8px 32px rgba(0,0,0,0.15);
+        '>
+            <h2 style='
+                color: white;
+                text-align: center;
+                font-size: 2.2rem;
+                font-weight: 700;
+                margin: 0;
+                text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+            '>Pivot</h2>
+        </div>
+    """, unsafe_allow_html=True)
 
+    name = 'current' if st.radio("Dataset", ["Current Week", "Previous Week"], horizontal=True) == "Current Week" else 'previous'
+    with profiling.section("pivot.cube", rows=len(dataset.frames[name])):
+        cube = olap.get_cube(dataset.key(name), dataset.frames[name], dataset.catalog(name))
+
+    dimensions = cube.dimensions
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rows = st.selectbox("Rows", dimensions, format_func=olap.DIMENSIONS.get, key="pivot_rows")
     with col2:
-        timeline_dist = filtered_df.groupby(pd.Grouper(key='Expected Close Date', freq='M'))['Amount'].sum()/100000
-        fig_timeline = px.line(
-            x=timeline_dist.index,
-            y=timeline_dist.values,
-            title="Pipeline Timeline",
-            labels={"x": "Month", "y": "Amount (Lakhs)"}
+        column_options = [None] + [d for d in dimensions if d != rows]
+        columns = st.selectbox(
+            "Columns", column_options,
+            index=column_options.index('Fiscal_Month') if 'Fiscal_Month' in column_options else 0,
+            format_func=lambda d: "None" if d is None else olap.DIMENSIONS[d], key="pivot_columns"
         )
-        fig_timeline.update_traces(line_color='#4CAF50')
-        st.plotly_chart(fig_timeline, use_container_width=True)
+    with col3:
+        measure = st.selectbox("Measure", olap.MEASURES, key="pivot_measure")
+
+    with st.expander("Slice", expanded=False):
+        slice_cols = st.columns(4)
+        slices = {}
+        for i, dimension in enumerate(dimensions):
+            with slice_cols[i % 4]:
+                slices[dimension] = st.multiselect(
+                    olap.DIMENSIONS[dimension], cube.options(dimension), key=f"pivot_slice_{dimension}"
+                )
+
+    profiling.annotate(filters={'rows': rows, 'columns': columns, 'measure': measure,
+                                'slices': {d: v for d, v in slices.items() if v}})
+    with profiling.section("pivot.query", rows=len(cube)):
+        table = cube.pivot(rows, columns, measure, slices)
+
+    st.caption(f"{len(cube):,} cube cells summarising {cube.rows:,} deals")
+    number_format = "%d" if measure in ('Deals', 'Won Deals') else "₹%.1f L"
+    st.dataframe(
+        table,
+        column_config={
+            column: st.column_config.NumberColumn(str(column), format=number_format) for column in table.columns
+        },
+        use_container_width=True
+    )
+    st.download_button(
+        "Download CSV",
+        table.to_csv().encode("utf-8"),
+        file_name=f"pivot_{olap.DIMENSIONS[rows]}_{olap.DIMENSIONS[columns] if columns else 'total'}.csv".replace(' ', '_').lower(),
+        mime="text/csv"
+    )
 
 def main():
+    # Every page shows only the signed-in user's deals (see row_security.py)
+    auth.init_session_state()
+    if not auth.is_authenticated():
+        assets.stylesheet("dashboard.css")
+        auth.show_login_page()
+        return
+
     # Initialize session state for navigation if not exists
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "Data Input"
@@ -2176,30 +2020,63 @@ def main():
     st.sidebar.title("Navigation")
     
     # First check if data is uploaded
-    if 'df_current' not in st.session_state or 'df_previous' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.session_state.current_page = "Data Input"
     else:
         st.session_state.current_page = st.sidebar.radio(
             "Select a page",
             ["Data Input", "Dashboard (Quarter Summary)", "Overview", "Sales Team", "Pipeline Analysis", 
-             "YTD Dashboard", "Detailed Data"]
+             "Forecast", "Pivot", "YTD Dashboard", "Detailed Data"]
         )
 
-    # Display the selected page
-    if st.session_state.current_page == "Data Input":
-        display_data_input()
-    elif st.session_state.current_page == "Dashboard (Quarter Summary)":
-        display_dashboard()
-    elif st.session_state.current_page == "Overview":
-        show_overview()
-    elif st.session_state.current_page == "Sales Team":
-        show_sales_team()
-    elif st.session_state.current_page == "Pipeline Analysis":
-        show_pipeline_analysis()
-    elif st.session_state.current_page == "YTD Dashboard":
-        show_ytd_dashboard()
-    elif st.session_state.current_page == "Detailed Data":
-        show_detailed()
+    # Custom CSS for modern styling, plus plain templates for slow screens
+    # (?lite=1 or the sidebar toggle) on the pages that have them
+    lite.toggle()
+    assets.stylesheet("dashboard.css", *lite.stylesheets(st.session_state.current_page))
+
+    # Opt-in per-rerun profiling (?profile=1 or SALES_DASHBOARD_PROFILE=1); section
+    # timings are always collected while the performance event log is enabled
+    run = profiling.start_run(st.session_state.current_page, record_timings=perf_log.enabled())
+
+    # The event is written however the rerun ends: reruns cut short by
+    # st.rerun() or an exception are the ones the log most needs to show
+    try:
+        if st.sidebar.button("Logout"):
+            auth.logout()
+            st.rerun()
+
+        no_rows = dataset is not None and not row_security.has_rows(dataset)
+
+        # Display the selected page
+        with profiling.section(f"page: {st.session_state.current_page}"):
+            if st.session_state.current_page == "Data Input":
+                display_data_input()
+            elif no_rows:
+                st.info("None of the deals in this upload are visible to your account.")
+            elif st.session_state.current_page == "Dashboard (Quarter Summary)":
+                display_dashboard()
+            elif st.session_state.current_page == "Overview":
+                show_overview()
+            elif st.session_state.current_page == "Sales Team":
+                show_sales_team()
+            elif st.session_state.current_page == "Pipeline Analysis":
+                show_pipeline_analysis()
+            elif st.session_state.current_page == "Forecast":
+                show_forecast()
+            elif st.session_state.current_page == "Pivot":
+                show_pivot()
+            elif st.session_state.current_page == "YTD Dashboard":
+                show_ytd_dashboard()
+            elif st.session_state.current_page == "Detailed Data":
+                show_detailed()
+
+        profiling.render_panel()
+    except BaseException as e:
+        profiling.annotate(outcome=type(e).__name__)
+        raise
+    finally:
+        perf_log.log_rerun(run)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,146 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import catalog
+import filter_spec
+import fiscal
+
+# What-if probability modelling. Open deals are pre-aggregated once per dataset
+# into a sparse (stage x owner x practice x focus area x close month x
+# probability) cube of amount sums; applying probability overrides and
+# re-aggregating is then linear in occupied cells rather than in deals. The
+# Sales Team filters are applied to the cells with the same FilterSpec the page
+# uses for rows, evaluated on the cube's codes.
+DIMENSIONS = ('Sales Stage', 'Sales Owner', 'Practice', 'KritiKal Focus Areas')
+OVERRIDE_DIMENSIONS = ('Sales Stage', 'Practice')
+
+
+def _codes(series):
+    codes, values = pd.factorize(series, sort=True)
+    return codes, np.asarray(values, dtype=object)
+
+
+class ScenarioCube:
+    """Sum of open-deal amounts per occupied cube cell, with per-cell labels as codes"""
+
+    def __init__(self, df):
+        df = df[~df['Is_Won']]
+        columns = {}
+        self.labels = {}
+        for dimension in DIMENSIONS:
+            values = df[dimension] if dimension in df.columns else pd.Series(np.nan, index=df.index)
+            columns[dimension], self.labels[dimension] = _codes(values)
+        self.positions = {d: {label: i for i, label in enumerate(labels)} for d, labels in self.labels.items()}
+
+        dates = df['Expected Close Date']
+        # Close month as months since year 0; -1 for undated deals
+        columns['month'] = np.where(
+            dates.notna(), (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=float), -1
+        ).astype(np.int64)
+        columns['probability'] = df['Probability_Num'].to_numpy(dtype=float)
+
+        cells = pd.DataFrame(columns).assign(amount=df['Amount'].fillna(0).to_numpy(dtype=float))
+        cells = cells.groupby(list(columns), sort=False).agg(amount=('amount', 'sum'), deals=('amount', 'size'))
+        cells = cells.reset_index()
+
+        self.codes = {dimension: cells[dimension].to_numpy() for dimension in DIMENSIONS}
+        self.month = cells['month'].to_numpy()
+        self.fiscal_year, self.fiscal_quarter = fiscal.year_and_quarter(self.month)
+        self.probability = cells['probability'].to_numpy()
+        self.amount = cells['amount'].to_numpy()
+        self.deals = cells['deals'].to_numpy()
+        self.frame, self.catalog = self._cell_frame()
+
+    def __len__(self):
+        return len(self.amount)
+
+    def adjusted_probability(self, overrides):
+        """Cell probabilities after adding the override points, clipped to 0-100.
+
+        ``overrides`` maps a dimension in OVERRIDE_DIMENSIONS to {label: points}.
+        """
+        points = np.zeros(len(self))
+        for dimension, adjustments in (overrides or {}).items():
+            labels = self.labels[dimension]
+            # The trailing slot is read by deals without a label (code -1)
+            lookup = np.array([adjustments.get(label, 0) for label in labels] + [0], dtype=float)
+            points += lookup[self.codes[dimension]]
+        return np.clip(self.probability + points, 0, 100)
+
+    def _cell_frame(self):
+        """The cells as a frame of the columns the Sales Team filters read, with a catalog over it"""
+        dated = self.month >= 0
+        month_names = np.array(calendar.month_name[1:] + [None], dtype=object)
+        frame = pd.DataFrame({
+            # The trailing None is read by cells without a label (code -1)
+            **{dimension: np.append(self.labels[dimension], None)[self.codes[dimension]] for dimension in DIMENSIONS},
+            'Month': month_names[np.where(dated, self.month % 12, 12)],
+            'Fiscal_Year': np.where(dated, self.fiscal_year, np.nan),
+            'Fiscal_Quarter': np.where(dated, self.fiscal_quarter, np.nan),
+            'Probability_Num': self.probability,
+        })
+        dimensions = {
+            dimension: catalog.Dimension.from_codes(self.codes[dimension], self.labels[dimension])
+            for dimension in DIMENSIONS
+        }
+        return frame, catalog.DimensionCatalog(frame, dimensions)
+
+    def cell_mask(self, filters):
+        """Cells matching the Sales Team filters, or None when a filter can't be answered from the cube"""
+        if filters.get('search'):
+            # Search reads text columns the cube doesn't keep
+            return None
+        return filter_spec.sales_team(filters).mask(self.frame, self.catalog)
+
+    def weighted(self, overrides, by, mask=None):
+        """Baseline and scenario weighted pipeline (Lakhs) per ``by`` label"""
+        codes = self.codes[by]
+        keep = codes >= 0 if mask is None else mask & (codes >= 0)
+        groups = len(self.labels[by])
+        baseline = np.bincount(codes[keep], self.amount[keep] * self.probability[keep], minlength=groups)
+        scenario = np.bincount(
+            codes[keep], self.amount[keep] * self.adjusted_probability(overrides)[keep], minlength=groups
+        )
+        return pd.DataFrame({
+            by: self.labels[by],
+            'Pipeline Deals': np.bincount(codes[keep], self.deals[keep], minlength=groups).astype(int),
+            'Weighted': baseline / 100 / 100000,
+            'Scenario Weighted': scenario / 100 / 100000,
+        })
+
+    def total(self, overrides, mask=None):
+        """(baseline, scenario) weighted pipeline in Lakhs over the cells in ``mask``"""
+        keep = slice(None) if mask is None else mask
+        amount = self.amount[keep]
+        return (
+            float(amount @ self.probability[keep]) / 100 / 100000,
+            float(amount @ self.adjusted_probability(overrides)[keep]) / 100 / 100000,
+        )
+
+
+def row_totals(df, overrides):
+    """(baseline, scenario) weighted pipeline in Lakhs for filtered rows the cube can't answer"""
+    df = df[~df['Is_Won']]
+    probability = df['Probability_Num'].to_numpy(dtype=float)
+    points = np.zeros(len(df))
+    for dimension, adjustments in (overrides or {}).items():
+        if dimension in df.columns:
+            points += df[dimension].map(adjustments).fillna(0).to_numpy(dtype=float)
+    amount = df['Amount'].fillna(0).to_numpy(dtype=float)
+    return (
+        float(amount @ probability) / 100 / 100000,
+        float(amount @ np.clip(probability + points, 0, 100)) / 100 / 100000,
+    )
+
+
+def active(overrides):
+    return any(points for adjustments in (overrides or {}).values() for points in adjustments.values())
+
+
+@st.cache_resource(max_entries=8)
+def get_cube(key, _df):
+    """ScenarioCube for a processed dataset, built once per dataset ``key``"""
+    return ScenarioCube(_df)
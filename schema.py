@@ -0,0 +1,102 @@
+import pandas as pd
+
+# Every supported export layout is renamed to one canonical column set at load
+# time, so pages and engines only ever see these names. Each canonical column
+# lists the source headers it accepts, in order of preference; headers are
+# matched ignoring case and surrounding whitespace.
+ALIASES = {
+    'Expected Close Date': ['Expected Close Date', 'Close Date', 'Date'],
+    'Amount': ['Amount', 'Deal Value', 'Value'],
+    'Probability': ['Probability', 'Probability (%)', 'Win Probability'],
+    'Sales Stage': ['Sales Stage', 'Stage', 'Status'],
+    'Sales Owner': ['Sales Owner', 'Sales Team Member', 'Owner'],
+    'Practice': ['Practice', 'P&L Centre', 'Business Unit', 'Department'],
+    'Status': ['Status'],
+    'KritiKal Focus Areas': ['KritiKal Focus Areas', 'Focus Areas', 'Focus'],
+    'Pre-sales Technical Lead': ['Pre-sales Technical Lead', 'Technical Lead', 'Tech Owner'],
+    'Business Owner': ['Business Owner'],
+    'Organization Name': ['Organization Name', 'Organisation Name', 'Account'],
+    'Opportunity Name': ['Opportunity Name', 'Opportunity'],
+    'Geography': ['Geography', 'Region'],
+    'Type': ['Type', 'Hunting /farming', 'Hunting/Farming'],
+}
+REQUIRED = ['Expected Close Date', 'Amount', 'Probability', 'Sales Stage', 'Sales Owner']
+
+
+def _normalized(name):
+    return str(name).strip().casefold()
+
+
+class SchemaError(ValueError):
+    """The upload lacks columns every page depends on"""
+
+
+class SchemaMapping:
+    """Which source header feeds each canonical column, resolved once per sheet"""
+
+    def __init__(self, source_columns, mapping=None):
+        self.source_columns = [str(column) for column in source_columns]
+        if mapping is None:
+            headers = {}
+            for column in self.source_columns:
+                headers.setdefault(_normalized(column), column)
+            mapping = {}
+            for canonical, aliases in ALIASES.items():
+                source = next((headers[_normalized(a)] for a in aliases if _normalized(a) in headers), None)
+                if source is not None:
+                    mapping[canonical] = source
+        self.mapping = mapping
+
+    @property
+    def missing(self):
+        return [column for column in REQUIRED if column not in self.mapping]
+
+    @property
+    def unmapped(self):
+        used = set(self.mapping.values())
+        return [column for column in self.source_columns if column not in used]
+
+    def source(self, canonical):
+        """Header the canonical column was read from, or None"""
+        return self.mapping.get(canonical)
+
+    def validate(self):
+        if self.missing:
+            raise SchemaError(
+                "Missing required columns: "
+                + ", ".join(f"{c} (any of: {', '.join(ALIASES[c])})" for c in self.missing)
+            )
+
+    def apply(self, df):
+        """Frame with canonical columns first, then every unmapped source column"""
+        columns = {canonical: df[source] for canonical, source in self.mapping.items()}
+        for column in self.unmapped:
+            if column not in columns:
+                columns[column] = df[column]
+        return pd.DataFrame(columns, index=df.index)
+
+    def report(self):
+        """One row per canonical column and per unmapped source column"""
+        rows = [
+            {'Column': canonical, 'Source': self.mapping.get(canonical, ''),
+             'Status': 'mapped' if canonical in self.mapping else
+                       ('missing (required)' if canonical in REQUIRED else 'missing')}
+            for canonical in ALIASES
+        ]
+        rows += [{'Column': column, 'Source': column, 'Status': 'kept as is'} for column in self.unmapped]
+        return pd.DataFrame(rows)
+
+    def to_dict(self):
+        return {'source_columns': self.source_columns, 'mapping': self.mapping}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['source_columns'], data['mapping'])
+
+
+def normalize(df):
+    """(canonical frame, SchemaMapping) for a freshly parsed sheet; raises SchemaError"""
+    mapping = SchemaMapping(df.columns)
+    mapping.validate()
+    df = df.rename(columns=str) if any(not isinstance(c, str) for c in df.columns) else df
+    return mapping.apply(df), mapping
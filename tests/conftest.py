@@ -0,0 +1,84 @@
+import collections
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.core.strings.accessor import StringMethods
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep test runs from writing the perf log or the Arrow dataset cache
+os.environ.setdefault("SALES_DASHBOARD_PERF_LOG", "off")
+os.environ.setdefault("SALES_DASHBOARD_CACHE_DIR", "off")
+
+import dataset_store  # noqa: E402
+
+OPTIONAL_COLUMNS = ['Practice', 'KritiKal Focus Areas', 'Geography', 'Type']
+
+
+def make_deals(rows=400, seed=0, drop=()):
+    """Raw upload with every column, NaN amounts and unparseable dates; ``drop`` removes columns"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2024-01-15") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D")
+    df = pd.DataFrame({
+        "Organization Name": [f"Org {i % 40}" for i in range(rows)],
+        "Opportunity Name": [f"Opp {i}" for i in range(rows)],
+        "Geography": rng.choice(["India", "US", "EU"], rows),
+        "Expected Close Date": dates.strftime('%d-%m-%Y'),
+        "Probability": rng.choice(["10%", "25%", "50%", "75%", "90%", 100], rows),
+        "Amount": rng.integers(1, 500, rows) * 100000.0 + rng.choice([0, 55000], rows),
+        "Sales Stage": rng.choice(["Prospecting", "Proposal", "Negotiation", "Closed Won", "Closed Lost"], rows),
+        "Practice": rng.choice(["AI", "Cloud", "Vision", None], rows),
+        "Sales Owner": rng.choice([f"Owner {i}" for i in range(6)], rows),
+        "Pre-sales Technical Lead": rng.choice(["T1", "T2"], rows),
+        "Business Owner": rng.choice(["B1", "B2"], rows),
+        "Type": rng.choice(["Hunting", "Farming"], rows),
+        "KritiKal Focus Areas": rng.choice(["Retail", "Health", None], rows),
+        "Status": rng.choice(["Committed for the Month", "Upside for the Month", "Closed Won", "Pipeline"], rows),
+    })
+    if rows:
+        df.loc[rng.random(rows) < 0.05, "Amount"] = np.nan
+        df.loc[rng.random(rows) < 0.03, "Expected Close Date"] = "not a date"
+    return df.drop(columns=list(drop))
+
+
+def prepare(df):
+    """The processed frame pages see for a raw upload"""
+    frames, _ = dataset_store.prepare_frames({"current": df})
+    return frames["current"]
+
+
+@pytest.fixture
+def deals():
+    return prepare(make_deals())
+
+
+@pytest.fixture
+def deals_without_optional_columns():
+    return prepare(make_deals(drop=OPTIONAL_COLUMNS))
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Counter of the operations that read a text column row by row"""
+    counts = collections.Counter()
+
+    def counted(owner, name, label, when=lambda *args: True):
+        original = getattr(owner, name)
+
+        def wrapper(*args, **kwargs):
+            if when(*args):
+                counts[label] += 1
+            return original(*args, **kwargs)
+        monkeypatch.setattr(owner, name, wrapper)
+
+    def is_text(series, *args):
+        return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+    counted(pd, 'factorize', 'factorize')
+    counted(pd, 'to_datetime', 'to_datetime')
+    counted(StringMethods, '__init__', 'str')
+    counted(pd.Series, 'astype', 'astype', is_text)
+    return counts
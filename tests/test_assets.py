@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import assets
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "STATIC_DIR", str(tmp_path))
+    monkeypatch.setattr(assets, "_versions", {})
+    (tmp_path / "page.css").write_text("body { color: red; }\n")
+    return tmp_path
+
+
+def test_version_follows_the_file_contents(static_dir):
+    first = assets.version("page.css")
+    assert assets.version("page.css") == first
+    (static_dir / "page.css").write_text("body { color: blue; }\n")
+    os.utime(static_dir / "page.css", ns=(1, 1))
+    assert assets.version("page.css") != first
+
+
+def test_link_and_inline_tags(static_dir):
+    assert assets.link_tag("page.css") == (
+        f'<link rel="stylesheet" href="app/static/page.css?v={assets.version("page.css")}">'
+    )
+    assert assets.inline_tag("page.css") == "<style>\nbody { color: red; }\n</style>"
+
+
+@pytest.mark.parametrize("serving", [True, False])
+def test_stylesheet_emits_one_element_for_every_sheet(static_dir, monkeypatch, serving):
+    (static_dir / "extra.css").write_text("p { margin: 0; }\n")
+    rendered = []
+    monkeypatch.setattr(assets, "static_serving", lambda: serving)
+    monkeypatch.setattr(assets.st, "markdown", lambda body, **kwargs: rendered.append(body))
+
+    assets.stylesheet("page.css", "extra.css")
+    assets.stylesheet()
+
+    [body] = rendered
+    tag = assets.link_tag if serving else assets.inline_tag
+    assert body == "\n".join([tag("page.css"), tag("extra.css")])
+
+
+def test_every_shipped_sheet_is_linkable():
+    names = [name for name in os.listdir(assets.STATIC_DIR) if name.endswith(".css")]
+    assert {"dashboard.css", "lite.css", "login.css", "ytd.css"} <= set(names)
+    for name in names:
+        assert len(assets.version(name)) == 10
@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import auth
+import rate_limit
+from auth import UserStore
+
+
+def write_users(path, users, mtime_ns=None):
+    with open(path, "w") as f:
+        json.dump(users, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Counts users.json parses"""
+    calls = []
+    real_load = auth.json.load
+
+    def load(f):
+        calls.append(f.name)
+        return real_load(f)
+
+    monkeypatch.setattr(auth.json, "load", load)
+    return calls
+
+
+@pytest.fixture
+def users_file(tmp_path):
+    path = tmp_path / "users.json"
+    write_users(path, {"ana": {"password": "x", "role": "user"}}, mtime_ns=10**18)
+    return str(path)
+
+
+def test_rereads_only_when_the_file_changes(users_file, loads):
+    store = UserStore(users_file)
+    assert store.get("ana")["role"] == "user"
+    assert store.get("ana")["role"] == "user"
+    assert store.get("nobody") is None
+    assert len(loads) == 1
+
+    # Same size, new mtime
+    write_users(users_file, {"ana": {"password": "y", "role": "user"}}, mtime_ns=2 * 10**18)
+    assert store.get("ana")["password"] == "y"
+    assert len(loads) == 2
+
+    # Same mtime, new size
+    write_users(users_file, {"ana": {"password": "yy", "role": "user"}}, mtime_ns=2 * 10**18)
+    assert store.get("ana")["password"] == "yy"
+    assert len(loads) == 3
+
+    assert store.users() is store.users()
+    assert len(loads) == 3
+
+
+def test_malformed_file_keeps_the_last_good_copy(users_file):
+    store = UserStore(users_file)
+    assert store.get("ana") is not None
+    with open(users_file, "w") as f:
+        f.write('{"ana": {"password": ')
+    assert store.get("ana")["password"] == "x"
+
+
+def test_malformed_file_without_a_good_copy_raises(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text("not json")
+    with pytest.raises(ValueError):
+        UserStore(str(path)).users()
+
+
+def test_missing_file_creates_the_default_admin(tmp_path):
+    path = tmp_path / "users.json"
+    store = UserStore(str(path))
+    admin = store.get("admin")
+    assert admin == {"password": auth.hash_password("admin123"), "role": "admin"}
+    with open(path) as f:
+        assert json.load(f) == {"admin": admin}
+
+
+def test_set_user_replaces_the_file_atomically(users_file, monkeypatch):
+    store = UserStore(users_file)
+    replaced = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # The new contents are complete before they take users.json's place
+        with open(src) as f:
+            replaced.append((os.path.dirname(src), dst, json.load(f)))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(auth.os, "replace", replace)
+    store.set_user("ben", {"password": "z", "role": "user"})
+
+    [(directory, destination, written)] = replaced
+    assert directory == os.path.dirname(users_file) and destination == users_file
+    assert set(written) == {"ana", "ben"}
+    assert set(UserStore(users_file).users()) == {"ana", "ben"}
+    assert os.listdir(directory) == ["users.json"]
+
+
+def test_failed_write_leaves_the_file_untouched(users_file, monkeypatch):
+    store = UserStore(users_file)
+    store.users()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(auth.json, "dump", fail)
+    with pytest.raises(OSError):
+        store.set_user("ben", {"password": "z", "role": "user"})
+    assert set(UserStore(users_file).users()) == {"ana"}
+    assert os.listdir(os.path.dirname(users_file)) == ["users.json"]
+
+
+@pytest.fixture
+def slow_verify(monkeypatch):
+    """verify_password blocks until ``release`` is set; passwords named "boom" raise"""
+    release = threading.Event()
+
+    def verify_password(username, password):
+        release.wait(5)
+        if password == "boom":
+            raise RuntimeError("hash failed")
+        return password == "right"
+
+    monkeypatch.setattr(auth, "verify_password", verify_password)
+    return release
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_full_queue_raises_login_busy(slow_verify):
+    verifier = auth.PasswordVerifier(workers=1, max_pending=1)
+    first = verifier.submit("ana", "right")
+    with pytest.raises(auth.LoginBusy):
+        verifier.submit("ben", "right")
+    assert verifier.stats()["rejected"] == 1
+    assert verifier.stats()["pending"] == 1
+
+    slow_verify.set()
+    assert first.result(5) is True
+    wait_for(lambda: verifier.stats()["pending"] == 0)
+    assert verifier.submit("ben", "right").result(5) is True
+
+
+def test_slow_verification_times_out_as_login_busy(slow_verify, monkeypatch):
+    verifier = auth.PasswordVerifier(workers=1, max_pending=1)
+    monkeypatch.setattr(auth, "get_verifier", lambda: verifier)
+    limiter = rate_limit.RateLimiter(rate_limit.MemoryBuckets())
+    monkeypatch.setattr(rate_limit, "get_limiter", lambda: limiter)
+    monkeypatch.setattr(rate_limit, "client_address", lambda: None)
+
+    with pytest.raises(auth.LoginBusy, match="longer than usual"):
+        auth.verify_credentials("ana", "right", timeout=0.05)
+    assert verifier.stats()["timeouts"] == 1
+
+    slow_verify.set()
+    wait_for(lambda: verifier.stats()["pending"] == 0)
+
+
+def test_stats_average_wait_and_verify_times(slow_verify):
+    verifier = auth.PasswordVerifier(workers=1, max_pending=2)
+    assert verifier.stats()["avg_verify_ms"] == verifier.stats()["avg_wait_ms"] == 0.0
+
+    first, second = verifier.submit("ana", "right"), verifier.submit("ben", "wrong")
+    time.sleep(0.05)
+    slow_verify.set()
+    assert (first.result(5), second.result(5)) == (True, False)
+    wait_for(lambda: verifier.stats()["pending"] == 0)
+
+    stats = verifier.stats()
+    assert stats["verified"] == 2
+    # The first verification blocked for ~50 ms and the second queued behind it
+    assert stats["max_verify_ms"] >= 40
+    assert stats["avg_verify_ms"] == pytest.approx(stats["max_verify_ms"] / 2, abs=10)
+    assert stats["avg_wait_ms"] >= 20
+    assert "wait_ms" not in stats and "verify_ms" not in stats
+
+
+def test_failed_verification_releases_its_slot(slow_verify):
+    slow_verify.set()
+    verifier = auth.PasswordVerifier(workers=1, max_pending=1)
+    with pytest.raises(RuntimeError):
+        verifier.submit("ana", "boom").result(5)
+    wait_for(lambda: verifier.stats()["pending"] == 0)
+    assert verifier.stats()["verified"] == 1
+    assert verifier.submit("ana", "right").result(5) is True
@@ -0,0 +1,53 @@
+import numpy as np
+
+import catalog
+from catalog import Dimension, DimensionCatalog
+from conftest import OPTIONAL_COLUMNS
+
+
+def test_codes_cover_every_row(deals):
+    catalog = DimensionCatalog(deals)
+    dimension = catalog['Practice']
+    assert len(dimension.codes) == len(deals)
+    assert dimension.values == ['AI', 'Cloud', 'Vision']
+    assert dimension.counts.sum() == deals['Practice'].notna().sum()
+    assert dimension.position('Nowhere') == -1
+
+
+def test_missing_optional_columns_have_a_code_per_row(deals_without_optional_columns):
+    df = deals_without_optional_columns
+    catalog = DimensionCatalog(df)
+    for column in OPTIONAL_COLUMNS:
+        dimension = catalog[column]
+        assert len(dimension.codes) == len(df)
+        assert (dimension.codes == -1).all()
+        assert dimension.values == []
+        assert len(dimension) == 0
+        assert dimension.count('AI') == 0
+
+
+def test_empty_frame(deals):
+    catalog = DimensionCatalog(deals.iloc[:0])
+    assert len(catalog['Sales Owner'].codes) == 0
+    assert catalog['Sales Owner'].values == []
+    assert np.asarray(catalog['Practice'].counts).sum() == 0
+
+
+def test_dimension_from_codes_matches_factorizing(deals):
+    built = Dimension(deals['Practice'])
+    reused = Dimension.from_codes(built.codes, built.values)
+    np.testing.assert_array_equal(reused.codes, built.codes)
+    np.testing.assert_array_equal(reused.counts, built.counts)
+    assert reused.position('Cloud') == built.position('Cloud')
+
+
+def test_catalog_factorizes_each_column_once(deals, scans):
+    dimensions = DimensionCatalog(deals)
+    dimensions['Sales Owner']
+    assert scans == {'factorize': len(catalog.DIMENSIONS)}
+    dimensions['Organization Name']
+    for column in catalog.DIMENSIONS + ['Organization Name']:
+        dimensions[column]
+        dimensions.options(column)
+    dimensions.months()
+    assert scans == {'factorize': len(catalog.DIMENSIONS) + 1}
@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from analytics import PandasEngine
+from catalog import DimensionCatalog
+from crossfilter import CrossFilter
+
+
+@pytest.mark.parametrize("deal_type", ["pipeline", "won", "all"])
+def test_matches_the_pandas_engine(deals, deal_type):
+    linked = CrossFilter(deals, DimensionCatalog(deals))
+    engine = PandasEngine(deals)
+    pd.testing.assert_frame_equal(linked.focus_metrics(), engine.focus_metrics(), check_dtype=False)
+    pd.testing.assert_frame_equal(linked.monthly_trend(deal_type), engine.monthly_trend(deal_type), check_dtype=False)
+
+
+def test_selected_practices_filter_the_linked_charts(deals):
+    linked = CrossFilter(deals, DimensionCatalog(deals))
+    practice = deals[deals['Practice'] == 'AI']
+    engine = PandasEngine(practice.reset_index(drop=True))
+    pd.testing.assert_frame_equal(linked.focus_metrics(['AI']), engine.focus_metrics(), check_dtype=False)
+    pd.testing.assert_frame_equal(linked.monthly_trend('all', ['AI']), engine.monthly_trend('all'), check_dtype=False)
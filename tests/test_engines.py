@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+from bench_engines import FILTERS
+from conftest import OPTIONAL_COLUMNS, make_deals, prepare
+from facets import DEFAULT_FILTERS
+
+
+def duckdb_engine(df):
+    pytest.importorskip("duckdb")
+    import duckdb_backend
+    return duckdb_backend.DuckDBEngine(df)
+
+
+def polars_engine(df):
+    pytest.importorskip("polars")
+    import polars_backend
+    return polars_backend.PolarsEngine(df)
+
+
+ENGINES = [duckdb_engine, polars_engine]
+UPLOADS = {
+    'deals': lambda: make_deals(),
+    'empty': lambda: make_deals(rows=0),
+    'without_optional_columns': lambda: make_deals(drop=OPTIONAL_COLUMNS),
+}
+
+
+@pytest.mark.parametrize("upload", list(UPLOADS))
+@pytest.mark.parametrize("factory", ENGINES, ids=lambda factory: factory.__name__)
+def test_engine_matches_pandas(factory, upload):
+    df = prepare(UPLOADS[upload]())
+    engine = factory(df)
+    assert analytics.compare_engines(df, engine, filters=FILTERS) == []
+    for quarter in (1, 4):
+        selections = {'Fiscal_Quarter': quarter}
+        assert engine.quarter_summary(selections) == pytest.approx(analytics.PandasEngine(df).quarter_summary(selections))
+
+
+@pytest.mark.parametrize("upload", list(UPLOADS))
+def test_polars_process_data_matches_pandas(upload):
+    pytest.importorskip("polars")
+    import polars_backend
+    raw = UPLOADS[upload]()
+    pd.testing.assert_frame_equal(
+        analytics.process_data_pandas(raw), polars_backend.process_data(raw), check_dtype=False
+    )
+
+
+def test_nan_amounts_count_as_zero(deals):
+    assert deals['Amount'].isna().any()
+    expected = deals.loc[deals['Is_Won'], 'Amount'].fillna(0).sum() / 100000
+    assert analytics.PandasEngine(deals).closed_won_amount() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("filters", [
+    FILTERS,
+    dict(DEFAULT_FILTERS, practices=['AI', 'Cloud'], probability_filter='Custom Range', custom_prob_range='30-80%'),
+    dict(DEFAULT_FILTERS, search='ORG 1', status_filter='Closed Won', quarter_filter=2),
+    dict(DEFAULT_FILTERS, selected_member='Owner 3', focus_filter='Retail'),
+])
+@pytest.mark.parametrize("upload", list(UPLOADS))
+def test_polars_filters_match_filter_spec(upload, filters):
+    # Filters on absent optional columns keep no rows, as FilterSpec does
+    df = prepare(UPLOADS[upload]())
+    engine = polars_engine(df)
+    expected = analytics.PandasEngine(df).filter_mask(filters)
+    if upload == 'deals':
+        assert expected.any() or filters is FILTERS
+    np.testing.assert_array_equal(engine.filter_mask(filters), expected)
@@ -0,0 +1,20 @@
+from catalog import DimensionCatalog
+from facets import FacetIndex
+
+
+def test_facets_count_rows_under_other_filters(deals):
+    index = FacetIndex(deals, DimensionCatalog(deals))
+    facet = index.facets({'practices': ['AI']})
+    # The practice facet ignores its own filter; the others see only AI rows
+    assert facet['practices'].total_rows == len(deals)
+    assert facet['selected_member'].total_rows == (deals['Practice'] == 'AI').sum()
+
+
+def test_missing_optional_columns_have_no_facet(deals_without_optional_columns):
+    df = deals_without_optional_columns
+    index = FacetIndex(df, DimensionCatalog(df))
+    facet = index.facets({'selected_member': 'Owner 1'})
+    assert 'practices' not in facet
+    assert 'focus_filter' not in facet
+    assert facet['selected_member'].total_rows == len(df)
+    assert facet['month_filter'].total_rows == (df['Sales Owner'] == 'Owner 1').sum()
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+import filter_spec
+from catalog import DimensionCatalog
+from facets import DEFAULT_FILTERS
+from filter_spec import FilterSpec
+
+
+def reference_mask(df, filters):
+    """The Sales Team filters as chained boolean masks over the columns"""
+    mask = pd.Series(True, index=df.index)
+    if filters['selected_member'] != "All Team Members":
+        mask &= df['Sales Owner'] == filters['selected_member']
+    if filters['search']:
+        found = pd.Series(False, index=df.index)
+        for column in analytics.SEARCH_COLUMNS:
+            if column in df.columns:
+                found |= df[column].astype(str).str.lower().str.contains(filters['search'].lower(), regex=False)
+        mask &= found
+    if filters['practices']:
+        mask &= df['Practice'].isin(filters['practices'])
+    if filters['month_filter'] != "All Months":
+        mask &= df['Month'] == filters['month_filter']
+    if filters['quarter_filter'] != "All Quarters":
+        mask &= (df['Fiscal_Quarter'] == filters['quarter_filter']).fillna(False)
+    if filters['year_filter'] != "All Years":
+        mask &= (df['Fiscal_Year'] == filters['year_filter']).fillna(False)
+    if filters['probability_filter'] != "All Probability":
+        mask &= df['Probability_Num'].between(*analytics.probability_bounds(filters))
+    if filters['status_filter'] != "All Status":
+        mask &= df['Sales Stage'] == filters['status_filter']
+    if filters['focus_filter'] != "All Focus":
+        mask &= df['KritiKal Focus Areas'] == filters['focus_filter']
+    return mask.to_numpy(dtype=bool)
+
+
+def random_filters(rng, df):
+    def pick(column, default):
+        if rng.random() < 0.5:
+            return default
+        values = df[column].dropna().unique().tolist()
+        return values[rng.integers(len(values))]
+
+    low = int(rng.integers(0, 100))
+    return dict(
+        DEFAULT_FILTERS,
+        selected_member=pick('Sales Owner', "All Team Members"),
+        search=["", "", "org 1", "OPP 2"][rng.integers(4)],
+        practices=[] if rng.random() < 0.5 else ['AI', 'Vision'][:rng.integers(1, 3)],
+        month_filter=pick('Month', "All Months"),
+        quarter_filter=pick('Fiscal_Quarter', "All Quarters"),
+        year_filter=pick('Fiscal_Year', "All Years"),
+        probability_filter="All Probability" if rng.random() < 0.5 else "Custom Range",
+        custom_prob_range=f"{low}-{int(rng.integers(low, 101))}%",
+        status_filter=pick('Sales Stage', "All Status"),
+        focus_filter=pick('KritiKal Focus Areas', "All Focus"),
+    )
+
+
+def test_sales_team_spec_matches_chained_masks(deals):
+    catalog = DimensionCatalog(deals)
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        filters = random_filters(rng, deals)
+        spec = filter_spec.sales_team(filters)
+        expected = reference_mask(deals, filters)
+        np.testing.assert_array_equal(spec.mask(deals, catalog), expected)
+        np.testing.assert_array_equal(spec.mask(deals), expected)
+        np.testing.assert_array_equal(spec.positions(deals, catalog), np.flatnonzero(expected))
+
+
+@pytest.mark.parametrize("inclusive", filter_spec.INCLUSIVE)
+def test_between_matches_series_between(deals, inclusive):
+    spec = FilterSpec().between('Probability_Num', 25, 75, inclusive=inclusive)
+    expected = deals['Probability_Num'].between(25, 75, inclusive=inclusive).to_numpy()
+    np.testing.assert_array_equal(spec.mask(deals, DimensionCatalog(deals)), expected)
+    np.testing.assert_array_equal(spec.mask(deals), expected)
+
+
+def test_between_rejects_unknown_inclusive():
+    with pytest.raises(ValueError):
+        FilterSpec().between('Probability_Num', 0, 10, inclusive='all')
+
+
+def test_plan_runs_selective_predicates_first_and_search_last(deals):
+    catalog = DimensionCatalog(deals)
+    spec = FilterSpec().search("org").equals('Practice', 'AI').equals('Sales Owner', 'Owner 1')
+    order = [type(predicate).__name__ for predicate, _ in spec.plan(deals, catalog)]
+    assert order[-1] == '_Search'
+    estimates = [estimate for predicate, estimate in spec.plan(deals, catalog)[:2]]
+    assert estimates == sorted(estimates)
+    assert estimates[0] == (deals['Sales Owner'] == 'Owner 1').sum()
+
+
+def test_absent_values_and_columns_keep_no_rows(deals, deals_without_optional_columns):
+    assert len(FilterSpec().equals('Sales Owner', 'Nobody').positions(deals, DimensionCatalog(deals))) == 0
+    df = deals_without_optional_columns
+    assert len(FilterSpec().isin('Practice', ['AI']).apply(df, DimensionCatalog(df))) == 0
+
+
+def test_empty_spec_keeps_every_row(deals):
+    assert FilterSpec().apply(deals) is deals
+    assert FilterSpec().mask(deals).all()
+    assert len(FilterSpec().search("")) == 0
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fiscal
+
+
+def periods(*dates):
+    return fiscal.periods(pd.Series(pd.to_datetime(list(dates))))
+
+
+@pytest.mark.parametrize("date, year, quarter, month, week", [
+    ("2024-03-31", 2023, 4, 12, 13),
+    ("2024-04-01", 2024, 1, 1, 1),
+    ("2024-06-30", 2024, 1, 3, 13),
+    ("2024-07-01", 2024, 2, 4, 1),
+    ("2024-12-31", 2024, 3, 9, 14),
+    ("2025-01-01", 2024, 4, 10, 1),
+    ("1969-04-01", 1969, 1, 1, 1),
+])
+def test_periods_around_the_april_start(date, year, quarter, month, week):
+    columns = periods(date)
+    assert columns['Fiscal_Year'].iloc[0] == year
+    assert columns['Fiscal_Quarter'].iloc[0] == quarter
+    assert columns['Fiscal_Month'].iloc[0] == month
+    assert columns['Fiscal_Week'].iloc[0] == week
+
+
+def test_missing_dates_have_missing_periods():
+    columns = periods("2024-03-31", None, "2024-04-01")
+    for name in fiscal.COLUMNS:
+        assert columns[name].isna().tolist() == [False, True, False]
+        assert str(columns[name].dtype).startswith("Int")
+    assert columns['Fiscal_Year'].tolist() == [2023, pd.NA, 2024]
+
+
+def test_year_and_quarter_of_month_numbers():
+    months = np.array([2024 * 12 + 2, 2024 * 12 + 3, 2024 * 12 + 11, 2025 * 12 + 0])  # Mar, Apr, Dec 2024, Jan 2025
+    years, quarters = fiscal.year_and_quarter(months)
+    assert years.tolist() == [2023, 2024, 2024, 2024]
+    assert quarters.tolist() == [4, 1, 3, 4]
+
+
+def test_labels():
+    assert fiscal.year_label(2023) == "FY 2023-24"
+    assert fiscal.year_label(2099) == "FY 2099-00"
+    assert fiscal.year_label(np.int16(2024)) == "FY 2024-25"
+    assert [fiscal.quarter_label(q) for q in fiscal.QUARTERS] == [
+        "Q1 (Apr-Jun)", "Q2 (Jul-Sep)", "Q3 (Oct-Dec)", "Q4 (Jan-Mar)",
+    ]
+    assert fiscal.month_index("April") == 1 and fiscal.month_index("March") == 12
+
+
+def test_year_bounds_run_april_to_april():
+    start, end = fiscal.year_bounds(2024)
+    assert (start, end) == (pd.Timestamp("2024-04-01"), pd.Timestamp("2025-04-01"))
+    assert periods(start, end - pd.Timedelta(1, "ns"))['Fiscal_Year'].tolist() == [2024, 2024]
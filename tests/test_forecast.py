@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import fiscal
+import forecast
+
+
+def test_histogram_percentiles_are_within_a_bin():
+    rng = np.random.default_rng(0)
+    pipeline = np.array([100.0, 5000.0, 1.0])
+    values = rng.random((20000, 3)) * pipeline
+    values[rng.random(20000) < 0.3, 0] = 0  # groups often book nothing
+    histogram = forecast.GroupHistogram(pipeline)
+    for block in np.array_split(values, 7):
+        histogram.add(block)
+    expected = np.percentile(values, forecast.PERCENTILES, axis=0)
+    assert np.all(np.abs(histogram.percentiles() - expected) <= histogram.width)
+
+
+def test_group_memory_does_not_grow_with_scenarios(deals):
+    deals = forecast.open_deals(deals)
+    shapes = []
+    for scenarios in (1000, 20000):
+        totals, by_group = forecast.simulate(deals, scenarios)
+        assert totals.shape == (scenarios,)
+        shapes.append({d: histogram.counts.shape for d, (groups, histogram) in by_group.items()})
+        for groups, histogram in by_group.values():
+            assert histogram.counts.shape == (len(groups), forecast.HISTOGRAM_BINS + 1)
+            assert (histogram.counts.sum(axis=1) == scenarios).all()
+    assert shapes[0] == shapes[1]
+
+
+def test_forecast_is_reproducible_and_bounded(deals):
+    deals = forecast.open_deals(deals)
+    first = forecast.summarize(deals, *forecast.simulate(deals, 5000, seed=7))
+    second = forecast.summarize(deals, *forecast.simulate(deals, 5000, seed=7))
+    assert first['Total'] == second['Total']
+    for dimension in forecast.DIMENSIONS:
+        table = first[dimension]
+        assert table['Open Deals'].sum() == len(deals)
+        assert (table['P10'] <= table['P50']).all() and (table['P50'] <= table['P90']).all()
+        assert (table['P90'] <= table['Pipeline'] + 1e-9).all()
+
+
+def test_groups_by_fiscal_quarter(deals):
+    open_deals = forecast.open_deals(deals)
+    assert 'Fiscal Quarter' in forecast.DIMENSIONS
+    is_open = ~deals['Is_Won'] & (deals['Amount'] > 0) & (deals['Probability_Num'] > 0)
+    source = deals[is_open.fillna(False)]
+    dated = source['Fiscal_Year'].notna().to_numpy()
+    expected = [
+        f"{fiscal.year_label(y)} {fiscal.quarter_label(q)}"
+        for y, q in zip(source['Fiscal_Year'][dated], source['Fiscal_Quarter'][dated])
+    ]
+    assert list(open_deals['Fiscal Quarter'][dated]) == expected
+    assert (open_deals['Fiscal Quarter'][~dated] == forecast.UNASSIGNED).all()
+
+
+def test_empty_pipeline(deals):
+    deals = forecast.open_deals(deals.iloc[:0])
+    result = forecast.summarize(deals, *forecast.simulate(deals, 1000))
+    assert result['Total']['P50'] == pytest.approx(0)
+    assert all(len(result[d]) == 0 for d in forecast.DIMENSIONS)
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import dataset_store
+import lite
+from conftest import make_deals
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_sparkline_svg_scales_values_into_the_box():
+    svg = lite.sparkline_svg([1, 3], width=100, height=40)
+    assert svg.startswith('<svg class="lite-sparkline"')
+    assert 'points="0.0,36.0 100.0,4.0"' in svg
+    assert svg.count("<circle") == 2
+
+
+def test_sparkline_svg_draws_a_flat_series_mid_height():
+    assert 'points="0.0,20.0 100.0,20.0"' in lite.sparkline_svg([5, 5], width=100, height=40)
+
+
+def test_cards_render_as_one_grid():
+    html = lite.cards([
+        lite.card("Won", "₹10L", "#28A745", delta="₹2L", positive=False, description="vs target", sparkline=[1, 2]),
+        lite.card("Lost", "₹3L", "#DC3545"),
+    ])
+    assert html.startswith("<div class='lite-cards'>")
+    assert html.count("class='lite-card'") == 2
+    assert "#FECACA" in html and "vs target" in html
+    assert html.count("<svg") == 1
+
+
+@pytest.mark.parametrize("page, covered", [("Overview", True), ("YTD Dashboard", True), ("Pipeline Analysis", False), ("Pivot", False)])
+def test_lite_css_only_on_covered_pages(page, covered, tmp_path, monkeypatch):
+    # auth creates users.json with the default admin in the working directory
+    monkeypatch.chdir(tmp_path)
+    handle = dataset_store.get_store().acquire(
+        "lite-pages", lambda: {"current": make_deals(), "previous": make_deals(seed=1)}
+    )
+    rendered = {}
+    for mode in (False, True):
+        app = AppTest.from_file(os.path.join(ROOT, "sales_dashboard.py"), default_timeout=60)
+        app.session_state["authenticated"] = True
+        app.session_state["username"] = "admin"
+        app.session_state[lite.SESSION_KEY] = mode
+        app.session_state[dataset_store.HANDLE_KEY] = handle
+        app.run()
+        app.sidebar.radio[0].set_value(page).run()
+        assert not app.exception
+        rendered[mode] = [element.value for element in app.markdown]
+    assert any("lite.css" in body or ".lite-cards" in body for body in rendered[True]) == covered
+    if not covered:
+        assert rendered[True] == rendered[False]
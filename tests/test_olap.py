@@ -0,0 +1,22 @@
+import numpy as np
+
+from catalog import DimensionCatalog
+from conftest import OPTIONAL_COLUMNS
+from olap import DIMENSIONS, TOTAL, Cube
+
+
+def test_pivot_totals_match_the_deals(deals):
+    cube = Cube(deals, DimensionCatalog(deals))
+    assert cube.dimensions == list(DIMENSIONS)
+    table = cube.pivot('Sales Owner', 'Practice', 'Deals')
+    assert table.loc[TOTAL, TOTAL] == len(deals)
+    assert np.isclose(cube.pivot('Sales Owner').loc[TOTAL].iloc[0], deals['Amount'].fillna(0).sum() / 100000)
+
+
+def test_missing_optional_columns_are_not_dimensions(deals_without_optional_columns):
+    df = deals_without_optional_columns
+    cube = Cube(df, DimensionCatalog(df))
+    assert not set(OPTIONAL_COLUMNS) & set(cube.dimensions)
+    assert set(cube.codes) == set(cube.dimensions)
+    table = cube.pivot('Sales Stage', 'Fiscal_Year', 'Deals', {'Sales Owner': ['Owner 1']})
+    assert table.loc[TOTAL, TOTAL] == (df['Sales Owner'] == 'Owner 1').sum()
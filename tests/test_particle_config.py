@@ -0,0 +1,31 @@
+import json
+import re
+
+from particle_config import ParticleConfig
+
+
+def script_config(script):
+    return json.loads(re.search(r"const config = (\{.*?\});", script).group(1))
+
+
+def test_script_embeds_the_settings():
+    config = script_config(ParticleConfig.get_particle_script())
+    assert config['count'] == ParticleConfig.PARTICLE_COUNT
+    assert config['maxParticles'] == ParticleConfig.MAX_PARTICLES
+    assert config['fpsLimit'] == ParticleConfig.FPS_LIMIT
+    assert config['useRaf'] is ParticleConfig.USE_REQUEST_ANIMATION_FRAME
+    assert config['harness'] is False
+    assert script_config(ParticleConfig.get_particle_script(harness=True))['harness'] is True
+
+
+def test_count_is_capped_by_the_pool():
+    config = type("Crowded", (ParticleConfig,), {'PARTICLE_COUNT': 5000, 'MAX_PARTICLES': 200})
+    assert script_config(config.get_particle_script())['count'] == 200
+
+
+def test_particles_share_one_canvas():
+    script = ParticleConfig.get_particle_script()
+    assert script.count("createElement('canvas')") == 1
+    assert "new Float32Array(config.maxParticles * STRIDE)" in script
+    # No element per particle
+    assert "class=\"particle\"" not in script and "createElement('div')" not in script
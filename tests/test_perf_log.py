@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import auth  # noqa: F401  (registers its sign-in counters)
+import dataset_store
+import perf_log
+import profiling
+import rate_limit  # noqa: F401
+import row_security
+from conftest import make_deals
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Events:
+    def __init__(self):
+        self.lines = []
+
+    def info(self, line):
+        self.lines.append(json.loads(line))
+
+
+@pytest.fixture
+def events(monkeypatch):
+    logger = _Events()
+    monkeypatch.setattr(perf_log, "_get_logger", lambda: logger)
+    return logger.lines
+
+
+@pytest.mark.parametrize("value, path", [
+    (None, None), ("off", None), ("0", None), ("1", perf_log.DEFAULT_LOG_PATH),
+    ("on", perf_log.DEFAULT_LOG_PATH), ("/tmp/perf.jsonl", "/tmp/perf.jsonl"),
+])
+def test_log_is_opt_in(monkeypatch, value, path):
+    if value is None:
+        monkeypatch.delenv(perf_log.PERF_LOG_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(perf_log.PERF_LOG_ENV_VAR, value)
+    assert perf_log.log_path() == path
+
+
+def test_disabled_log_writes_nothing(monkeypatch, events):
+    monkeypatch.delenv(perf_log.PERF_LOG_ENV_VAR, raising=False)
+    perf_log.log_rerun(profiling.RunProfile("Overview"))
+    assert events == []
+
+
+def test_event_carries_registered_stats(monkeypatch, tmp_path, events):
+    monkeypatch.setenv(perf_log.PERF_LOG_ENV_VAR, str(tmp_path / "perf.jsonl"))
+    monkeypatch.setattr(perf_log, "_stats", {})
+    perf_log.register_stats("login", "verify", lambda: {"verified": 3})
+    perf_log.register_stats("login", "rate_limit", lambda: {"rejected": 1})
+
+    perf_log.log_rerun(profiling.RunProfile("Overview"))
+
+    [event] = events
+    assert event["page"] == "Overview"
+    assert event["login"] == {"verify": {"verified": 3}, "rate_limit": {"rejected": 1}}
+
+
+def test_auth_and_rate_limit_register_their_counters():
+    assert set(perf_log._stats["login"]) == {"verify", "rate_limit"}
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path, events):
+    # auth creates users.json with the default admin in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(perf_log.PERF_LOG_ENV_VAR, str(tmp_path / "perf.jsonl"))
+    handle = dataset_store.get_store().acquire(
+        "perf-log", lambda: {"current": make_deals(), "previous": make_deals(seed=1)}
+    )
+    app = AppTest.from_file(os.path.join(ROOT, "sales_dashboard.py"), default_timeout=60)
+    app.session_state["authenticated"] = True
+    app.session_state["username"] = "admin"
+    app.session_state[dataset_store.HANDLE_KEY] = handle
+    app.run()
+    app.sidebar.radio[0].set_value("Overview").run()
+    assert not app.exception
+    return app
+
+
+def test_every_rerun_logs_an_event(app, events):
+    assert [event["outcome"] for event in events] == ["ok", "ok"]
+    assert events[-1]["page"] == "Overview"
+    assert "page: Overview" in events[-1]["stages"]
+
+
+def test_rerun_ended_by_st_rerun_is_logged(app, events):
+    app.sidebar.button[0].click().run()
+    assert "RerunException" in [event["outcome"] for event in events[2:]]
+    assert not app.session_state["authenticated"]
+
+
+def test_rerun_that_raises_is_logged(app, events, monkeypatch):
+    def broken(dataset):
+        raise RuntimeError("page failed")
+
+    monkeypatch.setattr(row_security, "has_rows", broken)
+    app.run()
+    assert app.exception
+    assert events[-1]["outcome"] == "RuntimeError"
+    assert events[-1]["page"] == "Overview"
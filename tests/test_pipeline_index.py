@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+import pipeline_index
+from conftest import make_deals, prepare
+from pipeline_index import PipelineIndex, TIMELINE_MONTHS
+
+TODAY = pd.Timestamp("2025-01-10 15:30")
+# Values exactly on the 5% grid, on the band edges (25, 50, 75), at 0 and 100 and between steps
+PROBABILITIES = [0, 3, 5, 12.5, 24.9, 25, 26, 50, 50.1, 74.9, 75, 80, 99, 100]
+
+
+@pytest.fixture(scope="module")
+def deals():
+    df = prepare(make_deals(rows=600, seed=3))
+    rng = np.random.default_rng(3)
+    df['Probability_Num'] = rng.choice(PROBABILITIES, len(df))
+    # Whole lakhs, half lakhs and just under the next lakh
+    df['Amount'] = rng.integers(1, 40, len(df)) * 100000.0 + rng.choice([0, 50000, 99999], len(df))
+    # Some deals close exactly on a Timeline window's first or last day
+    edges = [TODAY.normalize() + pd.DateOffset(months=m) for m in (0, 3, 6, 12)]
+    on_edge = rng.random(len(df)) < 0.1
+    df.loc[on_edge, 'Expected Close Date'] = rng.choice(edges, on_edge.sum())
+    df.loc[rng.random(len(df)) < 0.05, 'Amount'] = np.nan
+    return df
+
+
+def reference(df, probability_range, amount_range, timeline="All"):
+    """PandasEngine on the rows the old Timeline mask kept"""
+    months = TIMELINE_MONTHS.get(timeline)
+    if months is not None:
+        start = TODAY.normalize()
+        dates = df['Expected Close Date']
+        df = df[(dates >= start) & (dates < start + pd.DateOffset(months=months))]
+    return analytics.PandasEngine(df).pipeline_summary(probability_range, amount_range)
+
+
+def assert_same(actual, expected):
+    for got, want in zip(actual, expected):
+        pd.testing.assert_frame_equal(got.reset_index(drop=True), want.reset_index(drop=True), check_dtype=False)
+
+
+def slider_ranges(index, rng, count=25):
+    """Probability ranges on the 5% grid and amount ranges in whole lakhs, edges included"""
+    low, high = index.amount_bounds
+    ranges = [((0, 100), (low, high)), ((25, 75), (low, high)), ((25, 25), (1, 1)), ((100, 100), (low, high))]
+    for _ in range(count):
+        p = sorted(rng.choice(np.arange(0, 101, 5), 2))
+        a = sorted(rng.integers(low, high + 1, 2))
+        ranges.append(((int(p[0]), int(p[1])), (int(a[0]), int(a[1]))))
+    return ranges
+
+
+@pytest.mark.parametrize("timeline", list(TIMELINE_MONTHS) + ["All"])
+def test_query_matches_pandas_on_the_slider_grid(deals, timeline):
+    index = PipelineIndex(deals)
+    assert index.built
+    rows = index.window(timeline, today=TODAY)
+    for probability_range, amount_range in slider_ranges(index, np.random.default_rng(11)):
+        assert_same(
+            index.query(probability_range, amount_range, rows),
+            reference(deals, probability_range, amount_range, timeline),
+        )
+
+
+@pytest.mark.parametrize("probability_range", [(12, 33), (3, 3), (24.9, 75), (0, 99)])
+def test_off_grid_probabilities_scan_rows(deals, probability_range):
+    index = PipelineIndex(deals)
+    assert not index.supports(probability_range)
+    assert_same(
+        index.query(probability_range, index.amount_bounds),
+        reference(deals, probability_range, index.amount_bounds),
+    )
+
+
+def test_window_matches_the_date_mask(deals):
+    index = PipelineIndex(deals)
+    assert index.window("All", today=TODAY) is None
+    dated = deals.loc[deals['Amount'].notna(), 'Expected Close Date'].dropna()
+    for timeline, months in TIMELINE_MONTHS.items():
+        first, last = index.window(timeline, today=TODAY)
+        start = TODAY.normalize()
+        in_window = (dated >= start) & (dated < start + pd.DateOffset(months=months))
+        assert last - first == in_window.sum()
+        assert (index.close_dates[first:last] >= start.to_datetime64()).all()
+
+
+def test_oversized_index_falls_back_to_scanning(deals, monkeypatch):
+    monkeypatch.setattr(pipeline_index, "MAX_INDEX_CELLS", 0)
+    index = PipelineIndex(deals)
+    assert not index.built and not index.supports((0, 100))
+    assert_same(
+        index.query((25, 75), index.amount_bounds),
+        reference(deals, (25, 75), index.amount_bounds),
+    )
@@ -0,0 +1,117 @@
+import pytest
+
+import auth
+import rate_limit
+from rate_limit import CAPACITY, REFILL_SECONDS, MemoryBuckets, RateLimiter, SQLiteBuckets
+
+
+def spend(buckets, key, now):
+    """Take tokens at ``now`` until the bucket refuses; the number taken and the wait given"""
+    taken = 0
+    while True:
+        wait = buckets.take(key, now)
+        if wait:
+            return taken, wait
+        taken += 1
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def buckets(request, tmp_path):
+    return MemoryBuckets() if request.param == "memory" else SQLiteBuckets(str(tmp_path / "buckets.db"))
+
+
+def test_bucket_empties_after_capacity_and_refills(buckets):
+    taken, wait = spend(buckets, "ana\x00127.0.0.1", now=1000.0)
+    assert taken == CAPACITY == 3
+    assert wait == pytest.approx(REFILL_SECONDS)
+
+    # Half a refill later the bucket still has no whole token
+    assert buckets.take("ana\x00127.0.0.1", 1000.0 + REFILL_SECONDS / 2) == pytest.approx(REFILL_SECONDS / 2)
+    # One refill after emptying, exactly one attempt is allowed again
+    assert buckets.take("ana\x00127.0.0.1", 1000.0 + REFILL_SECONDS) == 0
+    assert buckets.take("ana\x00127.0.0.1", 1000.0 + REFILL_SECONDS) > 0
+    # A full refill later the whole capacity is back, and never more
+    assert spend(buckets, "ana\x00127.0.0.1", 1000.0 + 100 * REFILL_SECONDS)[0] == CAPACITY
+
+
+def test_buckets_are_per_username_and_client(buckets):
+    limiter = RateLimiter(buckets)
+    for _ in range(CAPACITY):
+        assert limiter.attempt("ana", "10.0.0.1") == 0
+    assert limiter.attempt("ana", "10.0.0.1") > 0
+    assert limiter.attempt("ana", "10.0.0.2") == 0
+    assert limiter.attempt("ben", "10.0.0.1") == 0
+    assert limiter.stats()["limited"] == 1
+
+    limiter.succeeded("ana", "10.0.0.1")
+    assert limiter.attempt("ana", "10.0.0.1") == 0
+
+
+def test_sqlite_buckets_agree_across_connections(tmp_path):
+    path = str(tmp_path / "shared" / "buckets.db")
+    first, second = SQLiteBuckets(path), SQLiteBuckets(path)
+
+    assert first.take("ana", 1000.0) == 0
+    assert second.take("ana", 1000.0) == 0
+    assert first.take("ana", 1000.0) == 0
+    # Both stores spent tokens from the one bucket in the file
+    assert second.take("ana", 1000.0) == pytest.approx(REFILL_SECONDS)
+    assert len(first) == len(second) == 1
+
+    second.reset("ana")
+    assert first.take("ana", 1000.0) == 0
+
+
+class StubVerifier:
+    """Records submissions and answers with a fixed result instead of hashing"""
+
+    def __init__(self, valid):
+        self.valid = valid
+        self.submitted = []
+
+    def submit(self, username, password):
+        self.submitted.append(username)
+        future = auth.Future()
+        future.set_result(self.valid)
+        return future
+
+
+@pytest.fixture
+def login(monkeypatch):
+    limiter = RateLimiter(MemoryBuckets())
+    succeeded = []
+    monkeypatch.setattr(limiter, "succeeded", lambda username, client=None: succeeded.append(username))
+    monkeypatch.setattr(rate_limit, "get_limiter", lambda: limiter)
+    monkeypatch.setattr(rate_limit, "client_address", lambda: "10.0.0.1")
+
+    def use(valid):
+        verifier = StubVerifier(valid)
+        monkeypatch.setattr(auth, "get_verifier", lambda: verifier)
+        return verifier
+
+    return limiter, succeeded, use
+
+
+def test_limited_attempt_raises_before_any_hashing(login):
+    limiter, succeeded, use = login
+    verifier = use(valid=False)
+    for _ in range(CAPACITY):
+        assert auth.verify_credentials("ana", "wrong") is False
+    assert len(verifier.submitted) == CAPACITY
+
+    with pytest.raises(auth.TooManyAttempts) as raised:
+        auth.verify_credentials("ana", "wrong")
+    assert raised.value.retry_after > 0
+    assert len(verifier.submitted) == CAPACITY
+    assert succeeded == []
+
+
+def test_only_a_valid_login_refills_the_bucket(login):
+    limiter, succeeded, use = login
+    use(valid=False)
+    assert auth.verify_credentials("ana", "wrong") is False
+    assert succeeded == []
+
+    use(valid=True)
+    assert auth.verify_credentials("ana", "right") is True
+    assert succeeded == ["ana"]
@@ -0,0 +1,59 @@
+import gc
+import os
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import row_security
+from dataset_store import Dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERS = {
+    'asha': {'sales_owner': 'Owner 1', 'team': ['Owner 2'], 'practices': ['AI']},
+    'boss': {'role': 'admin'},
+}
+
+
+def test_scope_permits_own_team_and_practice_rows(deals):
+    dataset = Dataset('fixture', {'current': deals, 'previous': deals}, {})
+    positions = row_security.user_scope('asha', USERS).positions(dataset.catalog())
+    expected = deals['Sales Owner'].isin(['Owner 1', 'Owner 2']) | (deals['Practice'] == 'AI')
+    np.testing.assert_array_equal(positions, np.flatnonzero(expected))
+    assert row_security.user_scope('boss', USERS).everything
+    assert len(row_security.user_scope('nobody', USERS).positions(dataset.catalog())) == 0
+
+
+def test_sessions_that_have_not_signed_in_see_nothing():
+    st.session_state.clear()
+    scope = row_security.session_scope()
+    assert not scope.everything
+    assert not scope.owners and not scope.practices
+
+
+def test_scoped_frames_live_only_while_held(deals):
+    dataset = Dataset('fixture-live', {'current': deals, 'previous': deals}, {})
+    scope = row_security.user_scope('asha', USERS)
+    scoped = row_security.restrict(dataset, scope)
+    assert row_security.restrict(dataset, scope) is scoped
+    assert scoped.current is scoped.previous
+    assert len(scoped.current) == len(row_security.positions(dataset, scope)['current'])
+
+    cache, live, _ = row_security._scoped_cache()
+    del scoped
+    gc.collect()
+    # Only the position arrays outlive the sessions holding the scoped frames
+    assert (dataset.fingerprint, scope.key) not in live
+    assert (dataset.fingerprint, scope.key) in cache
+
+
+def test_views_login_keeps_the_username(tmp_path, monkeypatch):
+    # auth creates users.json with the default admin in the working directory
+    monkeypatch.chdir(tmp_path)
+    app = AppTest.from_file(os.path.join(ROOT, 'views.py'), default_timeout=30).run()
+    app.text_input(key='login_username').input('admin')
+    app.text_input(key='login_password').input('admin123')
+    app.button[0].click().run()
+    assert not app.exception
+    assert app.session_state['authenticated']
+    assert app.session_state['username'] == 'admin'
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+import analytics
+import filter_spec
+import scenario
+from conftest import OPTIONAL_COLUMNS, make_deals, prepare
+from facets import DEFAULT_FILTERS, PROBABILITY_OPTIONS, STATUS_OPTIONS
+
+
+def random_filters(rng, df):
+    """Sales Team filters with each one set at random to a value from ``df`` (or a miss)"""
+    def pick(column, default):
+        if rng.random() < 0.5:
+            return default
+        values = df[column].dropna().unique().tolist() if column in df.columns else []
+        return values[rng.integers(len(values))] if values else "Nowhere"
+
+    filters = dict(DEFAULT_FILTERS)
+    filters['selected_member'] = pick('Sales Owner', "All Team Members")
+    filters['month_filter'] = pick('Month', "All Months")
+    filters['quarter_filter'] = pick('Fiscal_Quarter', "All Quarters")
+    filters['year_filter'] = pick('Fiscal_Year', "All Years")
+    filters['focus_filter'] = pick('KritiKal Focus Areas', "All Focus")
+    if rng.random() < 0.5:
+        filters['practices'] = ['AI', 'Vision'][:rng.integers(1, 3)]
+    if rng.random() < 0.5:
+        low = int(rng.integers(0, 100))
+        filters['probability_filter'] = "Custom Range"
+        filters['custom_prob_range'] = f"{low}-{int(rng.integers(low, 101))}%"
+    elif rng.random() < 0.3:
+        filters['probability_filter'] = PROBABILITY_OPTIONS[rng.integers(len(PROBABILITY_OPTIONS))]
+    if rng.random() < 0.4:
+        filters['status_filter'] = (STATUS_OPTIONS + ['Negotiation', 'Proposal'])[rng.integers(4)]
+    return filters
+
+
+def random_overrides(rng, cube):
+    return {
+        dimension: {label: int(rng.integers(-50, 51)) for label in cube.labels[dimension] if rng.random() < 0.6}
+        for dimension in scenario.OVERRIDE_DIMENSIONS
+    }
+
+
+@pytest.mark.parametrize("drop", [(), OPTIONAL_COLUMNS], ids=["deals", "without_optional_columns"])
+def test_cube_totals_match_rows(drop):
+    df = prepare(make_deals(drop=drop))
+    cube = scenario.ScenarioCube(df)
+    rng = np.random.default_rng(7)
+    for _ in range(60):
+        filters = random_filters(rng, df)
+        overrides = random_overrides(rng, cube)
+        rows = filter_spec.sales_team(filters).apply(df)
+        mask = cube.cell_mask(filters)
+        assert cube.total(overrides, mask) == pytest.approx(scenario.row_totals(rows, overrides)), filters
+
+
+def test_weighted_by_owner_matches_rows(deals):
+    cube = scenario.ScenarioCube(deals)
+    overrides = {'Sales Stage': {'Proposal': 20}, 'Practice': {'AI': -30}}
+    filters = dict(DEFAULT_FILTERS, practices=['AI', 'Cloud'])
+    by_owner = cube.weighted(overrides, 'Sales Owner', cube.cell_mask(filters)).set_index('Sales Owner')
+
+    rows = filter_spec.sales_team(filters).apply(deals)
+    for owner, group in rows.groupby('Sales Owner'):
+        baseline, scenario_weighted = scenario.row_totals(group, overrides)
+        assert by_owner.loc[owner, 'Weighted'] == pytest.approx(baseline)
+        assert by_owner.loc[owner, 'Scenario Weighted'] == pytest.approx(scenario_weighted)
+        assert by_owner.loc[owner, 'Pipeline Deals'] == (~group['Is_Won']).sum()
+
+
+def test_search_falls_back_to_rows(deals):
+    cube = scenario.ScenarioCube(deals)
+    assert cube.cell_mask(dict(DEFAULT_FILTERS, search="org 1")) is None
+    assert cube.cell_mask(DEFAULT_FILTERS).all()
+
+
+def test_committed_for_the_month_uses_the_current_month(deals, monkeypatch):
+    monkeypatch.setattr(analytics, "current_month", lambda: "March")
+    cube = scenario.ScenarioCube(deals)
+    filters = dict(DEFAULT_FILTERS, status_filter="Committed for the Month")
+    rows = filter_spec.sales_team(filters).apply(deals)
+    assert len(rows) and (rows['Month'] == "March").all()
+    assert cube.total(None, cube.cell_mask(filters)) == pytest.approx(scenario.row_totals(rows, None))
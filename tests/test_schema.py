@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+import schema
+from schema import SchemaError, SchemaMapping
+
+DASHBOARD = [
+    'Organization Name', 'Opportunity Name', 'Geography', 'Expected Close Date', 'Probability', 'Amount',
+    'Sales Stage', 'Practice', 'Sales Owner', 'Pre-sales Technical Lead', 'Business Owner', 'Type',
+    'KritiKal Focus Areas', 'Status',
+]
+VIEWS = [
+    'Organization Name', 'Opportunity Name', 'Geography', 'Date', 'Probability', 'Deal Value', 'Status',
+    'Practice', 'Sales Team Member', 'Technical Lead', 'Hunting /farming', 'Focus',
+]
+YTD = [
+    'Organization Name', 'Expected Close Date', 'Probability', 'Amount', 'Status', 'P&L Centre', 'Sales Owner',
+]
+
+
+@pytest.mark.parametrize("columns, expected", [
+    (DASHBOARD, {column: column for column in DASHBOARD}),
+    (VIEWS, {
+        'Expected Close Date': 'Date', 'Amount': 'Deal Value', 'Probability': 'Probability',
+        'Sales Stage': 'Status', 'Status': 'Status', 'Sales Owner': 'Sales Team Member', 'Practice': 'Practice',
+        'KritiKal Focus Areas': 'Focus', 'Pre-sales Technical Lead': 'Technical Lead',
+        'Organization Name': 'Organization Name', 'Opportunity Name': 'Opportunity Name',
+        'Geography': 'Geography', 'Type': 'Hunting /farming',
+    }),
+    (YTD, {
+        'Expected Close Date': 'Expected Close Date', 'Amount': 'Amount', 'Probability': 'Probability',
+        'Sales Stage': 'Status', 'Status': 'Status', 'Sales Owner': 'Sales Owner', 'Practice': 'P&L Centre',
+        'Organization Name': 'Organization Name',
+    }),
+], ids=["sales_dashboard", "views", "ytd"])
+def test_each_export_layout_maps_to_canonical_columns(columns, expected):
+    mapping = SchemaMapping(columns)
+    assert mapping.mapping == expected
+    assert mapping.missing == []
+    assert mapping.unmapped == []
+
+    df, normalized = schema.normalize(pd.DataFrame([range(len(columns))], columns=columns))
+    # Canonical columns come out in ALIASES order
+    assert list(df.columns) == [column for column in schema.ALIASES if column in expected]
+    for canonical, source in expected.items():
+        assert df[canonical].iloc[0] == columns.index(source)
+
+    report = normalized.report().set_index('Column')
+    assert (report.loc[list(expected), 'Status'] == 'mapped').all()
+    assert report.loc[list(expected), 'Source'].tolist() == list(expected.values())
+
+
+@pytest.mark.parametrize("columns, canonical, source", [
+    # Several candidates present: the first alias in ALIASES wins
+    (['Practice', 'P&L Centre', 'Business Unit', 'Department'], 'Practice', 'Practice'),
+    (['Department', 'Business Unit', 'P&L Centre'], 'Practice', 'P&L Centre'),
+    (['Date', 'Close Date', 'Expected Close Date'], 'Expected Close Date', 'Expected Close Date'),
+    (['Value', 'Deal Value'], 'Amount', 'Deal Value'),
+    (['Status', 'Stage', 'Sales Stage'], 'Sales Stage', 'Sales Stage'),
+    (['Owner', 'Sales Team Member'], 'Sales Owner', 'Sales Team Member'),
+])
+def test_preferred_alias_wins_when_several_are_present(columns, canonical, source):
+    mapping = SchemaMapping(columns)
+    assert mapping.source(canonical) == source
+    report = mapping.report().set_index('Column')
+    assert report.loc[canonical, 'Source'] == source
+    # The losing candidates are kept as they are, unless another canonical column claimed them
+    claimed = set(mapping.mapping.values())
+    kept = report[report['Status'] == 'kept as is'].index.tolist()
+    assert kept == [column for column in columns if column not in claimed]
+
+
+def test_headers_match_ignoring_case_and_whitespace():
+    mapping = SchemaMapping([' deal value ', 'SALES TEAM MEMBER', 'date', 'Probability', 'stage'])
+    assert mapping.source('Amount') == ' deal value '
+    assert mapping.source('Sales Owner') == 'SALES TEAM MEMBER'
+    assert mapping.missing == []
+
+
+def test_missing_required_columns_are_reported_and_raise():
+    mapping = SchemaMapping(['Deal Value', 'Notes'])
+    assert mapping.missing == ['Expected Close Date', 'Probability', 'Sales Stage', 'Sales Owner']
+    report = mapping.report().set_index('Column')
+    assert report.loc['Sales Owner', 'Status'] == 'missing (required)'
+    assert report.loc['Geography', 'Status'] == 'missing'
+    assert report.loc['Notes', 'Status'] == 'kept as is'
+    with pytest.raises(SchemaError, match="Sales Owner \\(any of: Sales Owner, Sales Team Member, Owner\\)"):
+        schema.normalize(pd.DataFrame(columns=['Deal Value', 'Notes']))
+
+
+def test_mapping_round_trips_through_a_dict():
+    mapping = SchemaMapping(VIEWS)
+    restored = SchemaMapping.from_dict(mapping.to_dict())
+    assert restored.mapping == mapping.mapping
+    assert restored.source_columns == mapping.source_columns
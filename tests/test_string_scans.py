@@ -0,0 +1,31 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import dataset_store
+from conftest import make_deals
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Dashboard (Quarter Summary)", "Overview", "Sales Team", "Pipeline Analysis",
+         "Forecast", "Pivot", "YTD Dashboard", "Detailed Data"]
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_reruns_scan_no_text_column(page, scans, tmp_path, monkeypatch):
+    # auth creates users.json with the default admin in the working directory
+    monkeypatch.chdir(tmp_path)
+    handle = dataset_store.get_store().acquire(
+        f"string-scans-{page}", lambda: {"current": make_deals(), "previous": make_deals(seed=1)}
+    )
+    app = AppTest.from_file(os.path.join(ROOT, "sales_dashboard.py"), default_timeout=60)
+    app.session_state["authenticated"] = True
+    app.session_state["username"] = "admin"
+    app.session_state[dataset_store.HANDLE_KEY] = handle
+    app.run()
+    app.sidebar.radio[0].set_value(page).run()
+    # The first render builds the catalog and per-dataset caches; reruns reuse them
+    scans.clear()
+    app.run()
+    assert not app.exception
+    assert scans == {}
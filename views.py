@@ -5,258 +5,116 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 
+import assets
+import auth
+import dataset_store
+import filter_spec
+import fiscal
+import lite
+import row_security
+
 def show_login_page(st):
     """Display the login page with neon-styled authentication and tsparticles"""
     # Custom CSS and JS for login page with particles
-    st.markdown("""
-        <style>
-            /* Reset and base styles */
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-
-            /* Particle container */
-            #tsparticles {
-                position: fixed;
-                width: 100%;
-                height: 100%;
-                top: 0;
-                left: 0;
-                z-index: 0;
-                background: #0a0a2e;
-            }
-
-            /* Main container */
-            .container {
-                position: relative;
-                z-index: 1;
-                height: 100vh;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                padding: 20px;
-            }
-
-            /* Login box */
-            .login-box {
-                background: rgba(0, 0, 0, 0.8);
-                border-radius: 20px;
-                padding: 40px;
-                width: 100%;
-                max-width: 400px;
-                border: 1px solid rgba(0, 255, 255, 0.1);
-                backdrop-filter: blur(10px);
-                box-shadow: 0 0 20px rgba(0, 255, 255, 0.2);
-            }
-
-            /* Form header */
-            .login-header {
-                text-align: center;
-                margin-bottom: 30px;
-            }
-
-            .login-header h1 {
-                color: #0ff;
-                font-size: 2.5em;
-                font-weight: 600;
-                font-family: 'Segoe UI', sans-serif;
-                text-shadow: 0 0 10px rgba(0, 255, 255, 0.5);
-                margin-bottom: 10px;
-            }
-
-            /* Form inputs */
-            .form-group {
-                margin-bottom: 20px;
-            }
-
-            .stTextInput > div > div > input {
-                width: 100% !important;
-                padding: 15px !important;
-                border-radius: 30px !important;
-                background: rgba(0, 0, 0, 0.5) !important;
-                border: 2px solid #0ff !important;
-                color: #0ff !important;
-                font-size: 1.1em !important;
-                transition: all 0.3s ease !important;
-            }
-
-            .stTextInput > div > div > input:focus {
-                box-shadow: 0 0 20px rgba(0, 255, 255, 0.4) !important;
-                border-color: #0ff !important;
-            }
-
-            .stTextInput > div > div > input::placeholder {
-                color: rgba(0, 255, 255, 0.5) !important;
-            }
-
-            /* Login button */
-            .stButton > button {
-                width: 100% !important;
-                padding: 15px !important;
-                border-radius: 30px !important;
-                background: linear-gradient(90deg, #00ffff, #ff00ff) !important;
-                background-size: 200% 200% !important;
-                border: none !important;
-                color: white !important;
-                font-size: 1.2em !important;
-                font-weight: 600 !important;
-                text-transform: uppercase !important;
-                letter-spacing: 2px !important;
-                cursor: pointer !important;
-                transition: all 0.3s ease !important;
-                animation: buttonGlow 3s infinite !important;
-            }
-
-            .stButton > button:hover {
-                transform: translateY(-2px) !important;
-                box-shadow: 0 0 20px rgba(255, 0, 255, 0.4) !important;
-            }
-
-            /* Additional options */
-            .login-options {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-top: 20px;
-                color: #0ff;
-                font-size: 0.9em;
-            }
-
-            .remember-me {
-                display: flex;
-                align-items: center;
-                gap: 5px;
-            }
-
-            .remember-me input[type="checkbox"] {
-                accent-color: #0ff;
-            }
-
-            .forgot-password {
-                color: #0ff;
-                text-decoration: none;
-                transition: all 0.3s ease;
-            }
-
-            .forgot-password:hover {
-                text-shadow: 0 0 10px #0ff;
-            }
-
-            /* Error message */
-            .error-message {
-                color: #ff0055;
-                text-align: center;
-                margin-top: 15px;
-                font-size: 0.9em;
-                text-shadow: 0 0 10px rgba(255, 0, 85, 0.5);
-            }
-
-            /* Animations */
-            @keyframes buttonGlow {
-                0% { background-position: 0% 50%; }
-                50% { background-position: 100% 50%; }
-                100% { background-position: 0% 50%; }
-            }
-        </style>
-
-        <script src="https://cdn.jsdelivr.net/npm/tsparticles@2.12.0/tsparticles.bundle.min.js"></script>
-        <script>
-            window.onload = function() {
-                tsParticles.load("tsparticles", {
-                    fullScreen: {
-                        enable: true
-                    },
-                    particles: {
-                        number: {
-                            value: 80,
-                            density: {
-                                enable: true,
-                                value_area: 800
-                            }
+    assets.stylesheet("views_login.css", *lite.stylesheets())
+    if not lite.enabled():
+        st.markdown("""
+            <script src="https://cdn.jsdelivr.net/npm/tsparticles@2.12.0/tsparticles.bundle.min.js"></script>
+            <script>
+                window.onload = function() {
+                    tsParticles.load("tsparticles", {
+                        fullScreen: {
+                            enable: true
                         },
-                        color: {
-                            value: ["#00ffff", "#ff00ff", "#00ff00"]
-                        },
-                        shape: {
-                            type: "circle"
-                        },
-                        opacity: {
-                            value: 0.5,
-                            random: true,
-                            animation: {
+                        particles: {
+                            number: {
+                                value: 80,
+                                density: {
+                                    enable: true,
+                                    value_area: 800
+                                }
+                            },
+                            color: {
+                                value: ["#00ffff", "#ff00ff", "#00ff00"]
+                            },
+                            shape: {
+                                type: "circle"
+                            },
+                            opacity: {
+                                value: 0.5,
+                                random: true,
+                                animation: {
+                                    enable: true,
+                                    speed: 1,
+                                    minimumValue: 0.1,
+                                    sync: false
+                                }
+                            },
+                            size: {
+                                value: 3,
+                                random: true,
+                                animation: {
+                                    enable: true,
+                                    speed: 2,
+                                    minimumValue: 0.1,
+                                    sync: false
+                                }
+                            },
+                            links: {
                                 enable: true,
-                                speed: 1,
-                                minimumValue: 0.1,
-                                sync: false
-                            }
-                        },
-                        size: {
-                            value: 3,
-                            random: true,
-                            animation: {
+                                distance: 150,
+                                color: "#00ffff",
+                                opacity: 0.4,
+                                width: 1
+                            },
+                            move: {
                                 enable: true,
                                 speed: 2,
-                                minimumValue: 0.1,
-                                sync: false
+                                direction: "none",
+                                random: false,
+                                straight: false,
+                                outModes: {
+                                    default: "out"
+                                },
+                                attract: {
+                                    enable: false,
+                                    rotateX: 600,
+                                    rotateY: 1200
+                                }
                             }
                         },
-                        links: {
-                            enable: true,
-                            distance: 150,
-                            color: "#00ffff",
-                            opacity: 0.4,
-                            width: 1
-                        },
-                        move: {
-                            enable: true,
-                            speed: 2,
-                            direction: "none",
-                            random: false,
-                            straight: false,
-                            outModes: {
-                                default: "out"
+                        interactivity: {
+                            detectsOn: "window",
+                            events: {
+                                onHover: {
+                                    enable: true,
+                                    mode: "repulse"
+                                },
+                                onClick: {
+                                    enable: true,
+                                    mode: "push"
+                                },
+                                resize: true
                             },
-                            attract: {
-                                enable: false,
-                                rotateX: 600,
-                                rotateY: 1200
+                            modes: {
+                                repulse: {
+                                    distance: 100,
+                                    duration: 0.4
+                                },
+                                push: {
+                                    quantity: 4
+                                }
                             }
-                        }
-                    },
-                    interactivity: {
-                        detectsOn: "window",
-                        events: {
-                            onHover: {
-                                enable: true,
-                                mode: "repulse"
-                            },
-                            onClick: {
-                                enable: true,
-                                mode: "push"
-                            },
-                            resize: true
                         },
-                        modes: {
-                            repulse: {
-                                distance: 100,
-                                duration: 0.4
-                            },
-                            push: {
-                                quantity: 4
-                            }
+                        background: {
+                            color: "#0a0a2e"
                         }
-                    },
-                    background: {
-                        color: "#0a0a2e"
-                    }
-                });
-            }
-        </script>
+                    });
+                }
+            </script>
 
-        <div id="tsparticles"></div>
-    """, unsafe_allow_html=True)
+            <div id="tsparticles"></div>
+        """, unsafe_allow_html=True)
 
     # Login container
     st.markdown("""
@@ -269,14 +127,23 @@ def show_login_page(st):
     """, unsafe_allow_html=True)
 
     # Login form
-    username = st.text_input("", placeholder="Username", key="username")
-    password = st.text_input("", type="password", placeholder="Password", key="password")
+    username = st.text_input("", placeholder="Username", key="login_username")
+    password = st.text_input("", type="password", placeholder="Password", key="login_password")
     
     if st.button("LOGIN"):
-        if password == "admin123":  # Default password
+        # Users and their row-level access scopes live in users.json (see auth.py)
+        # Verified on auth's worker pool so login bursts can't starve other sessions' reruns
+        try:
+            valid = auth.verify_credentials(username, password)
+        except auth.LoginBusy as e:
+            valid = None
+            st.warning(str(e))
+        if valid:
             st.session_state.authenticated = True
+            # Kept outside the widget keys, which Streamlit drops once the login form is gone
+            st.session_state.username = username
             st.rerun()
-        else:
+        elif valid is False:
             st.markdown('<div class="error-message">Invalid credentials. Please try again.</div>', unsafe_allow_html=True)
 
     # Remember me and forgot password
@@ -298,38 +165,8 @@ def show_data_input_view(st):
     st.title("Data Input")
     
     # File upload section
+    assets.stylesheet("data_input.css")
     st.markdown("""
-        <style>
-            .upload-container {
-                background: rgba(0, 0, 0, 0.8);
-                border-radius: 20px;
-                padding: 30px;
-                margin-bottom: 30px;
-                border: 1px solid rgba(0, 255, 255, 0.1);
-                backdrop-filter: blur(10px);
-            }
-            
-            .upload-header {
-                color: #0ff;
-                font-size: 1.5em;
-                margin-bottom: 20px;
-                text-shadow: 0 0 10px rgba(0, 255, 255, 0.5);
-            }
-            
-            .file-format-info {
-                background: rgba(0, 0, 0, 0.5);
-                border-radius: 10px;
-                padding: 15px;
-                margin-top: 20px;
-                border: 1px solid rgba(0, 255, 255, 0.2);
-            }
-            
-            .required-fields {
-                margin-top: 20px;
-                color: #0ff;
-            }
-        </style>
-        
         <div class="upload-container">
             <div class="upload-header">Upload Sales Data</div>
     """, unsafe_allow_html=True)
@@ -338,12 +175,20 @@ def show_data_input_view(st):
     
     if uploaded_file is not None:
         try:
-            if uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_file)
-            else:
-                df = pd.read_csv(uploaded_file)
-            
-            st.session_state.df = df
+            def read_file():
+                if uploaded_file.name.endswith('.xlsx'):
+                    df = pd.read_excel(uploaded_file)
+                else:
+                    df = pd.read_csv(uploaded_file)
+                # A single upload serves as both the current and the previous week
+                return {'current': df, 'previous': df}
+
+            # Same shared, canonicalised and processed dataset as the main dashboard
+            fingerprint = dataset_store.fingerprint_upload(uploaded_file.getvalue(), uploaded_file.name)
+            dataset = row_security.restrict(
+                dataset_store.attach(fingerprint, read_file).dataset, row_security.session_scope()
+            )
+            df = dataset.source('current')
             st.success("File uploaded successfully!")
             
             # Display data preview
@@ -354,6 +199,9 @@ def show_data_input_view(st):
             st.subheader("Data Summary")
             st.write(f"Total Records: {len(df)}")
             st.write(f"Columns: {', '.join(df.columns)}")
+
+            st.subheader("Column Mapping")
+            st.dataframe(dataset.mappings['current'].report(), hide_index=True)
             
         except Exception as e:
             st.error(f"Error reading file: {str(e)}")
@@ -370,11 +218,11 @@ def show_data_input_view(st):
             <div class="required-fields">
                 <h4>Required Fields:</h4>
                 <ul>
-                    <li>Date</li>
-                    <li>Sales Team Member</li>
-                    <li>Practice</li>
-                    <li>Deal Value</li>
-                    <li>Status</li>
+                    <li>Date (or Expected Close Date)</li>
+                    <li>Sales Team Member (or Sales Owner)</li>
+                    <li>Deal Value (or Amount)</li>
+                    <li>Probability</li>
+                    <li>Status (or Sales Stage)</li>
                 </ul>
             </div>
         </div>
@@ -382,7 +230,8 @@ def show_data_input_view(st):
 
 def show_overview_view(st):
     """Display the overview view with key metrics and visualizations"""
-    if 'df_current' not in st.session_state or 'df_previous' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload data first.")
         return
 
@@ -392,11 +241,11 @@ def show_overview_view(st):
         horizontal=True
     )
 
-    df = st.session_state.df_current if dataset_choice == "Current Week" else st.session_state.df_previous
+    df = dataset.current if dataset_choice == "Current Week" else dataset.previous
     
     # Calculate metrics
-    total_closed_won = df[df['Status'] == 'Closed Won']['Deal Value'].sum()
-    total_pipeline = df['Deal Value'].sum()
+    total_closed_won = df[df['Is_Won']]['Amount'].sum()
+    total_pipeline = df['Amount'].sum()
     win_rate = (total_closed_won / total_pipeline) * 100 if total_pipeline > 0 else 0
     
     # Display metrics
@@ -411,30 +260,30 @@ def show_overview_view(st):
     
     # Practice-wise pipeline
     st.subheader("Practice-wise Pipeline")
-    practice_pipeline = df.groupby('Practice')['Deal Value'].sum().reset_index()
-    fig1 = px.bar(practice_pipeline, x='Practice', y='Deal Value',
+    practice_pipeline = df.groupby('Practice')['Amount'].sum().reset_index()
+    fig1 = px.bar(practice_pipeline, x='Practice', y='Amount',
                   color='Practice', title='Pipeline by Practice')
     st.plotly_chart(fig1)
     
     # Practice-wise closed deals
     st.subheader("Practice-wise Closed Deals")
-    closed_deals = df[df['Status'] == 'Closed Won'].groupby('Practice')['Deal Value'].sum().reset_index()
-    fig2 = px.pie(closed_deals, values='Deal Value', names='Practice',
+    closed_deals = df[df['Is_Won']].groupby('Practice')['Amount'].sum().reset_index()
+    fig2 = px.pie(closed_deals, values='Amount', names='Practice',
                   title='Closed Deals by Practice')
     st.plotly_chart(fig2)
     
     # Monthly trend
     st.subheader("Monthly Sales Trend")
-    df['Date'] = pd.to_datetime(df['Date'])
-    monthly_trend = df.groupby(df['Date'].dt.to_period('M'))['Deal Value'].sum().reset_index()
-    monthly_trend['Date'] = monthly_trend['Date'].astype(str)
-    fig3 = px.line(monthly_trend, x='Date', y='Deal Value',
+    monthly_trend = df.groupby(df['Expected Close Date'].dt.to_period('M'))['Amount'].sum().reset_index()
+    monthly_trend['Expected Close Date'] = monthly_trend['Expected Close Date'].astype(str)
+    fig3 = px.line(monthly_trend, x='Expected Close Date', y='Amount',
                    title='Monthly Sales Trend')
     st.plotly_chart(fig3)
 
 def show_sales_team_view(st):
     """Display the sales team view with team performance metrics"""
-    if 'df_current' not in st.session_state or 'df_previous' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload data first.")
         return
 
@@ -444,14 +293,15 @@ def show_sales_team_view(st):
         horizontal=True
     )
 
-    df = st.session_state.df_current if dataset_choice == "Current Week" else st.session_state.df_previous
+    name = 'current' if dataset_choice == "Current Week" else 'previous'
+    df = dataset.frames[name]
     
     # First row of filters with adjusted column sizes
     col1, col2, col3, col4, col5, col6, col7, col8, col9 = st.columns([1.2, 1.2, 1.2, 1, 1, 1, 1, 1.2, 1.2])
     
     with col1:
         # Sales Owner (Team Member) filter
-        team_members = sorted(df['Sales Team Member'].unique())
+        team_members = dataset.options('Sales Owner')
         selected_team = st.selectbox("👤 Sales Owner", ["All Team Members"] + list(team_members))
     
     with col2:
@@ -462,7 +312,7 @@ def show_sales_team_view(st):
         try:
             # Practice filter
             if 'Practice' in df.columns:
-                practices = sorted(df['Practice'].dropna().unique())
+                practices = dataset.options('Practice')
                 selected_practice = st.selectbox("🏢 Practice", ["All Practices"] + list(practices))
             else:
                 st.error("Practice column not found in the data")
@@ -473,19 +323,21 @@ def show_sales_team_view(st):
     
     with col4:
         # Month filter
-        months = ["All Months", "April", "May", "June", "July", "August", "September",
-                 "October", "November", "December", "January", "February", "March"]
-        selected_month = st.selectbox("📅 Month", months)
+        selected_month = st.selectbox("📅 Month", ["All Months"] + fiscal.MONTHS)
     
     with col5:
-        # Quarter filter
-        quarters = ["All Quarters", "Q1", "Q2", "Q3", "Q4"]
-        selected_quarter = st.selectbox("📊 Quarter", quarters)
+        # Fiscal quarter filter
+        selected_quarter = st.selectbox(
+            "📊 Quarter", ["All Quarters"] + fiscal.QUARTERS,
+            format_func=lambda quarter: quarter if quarter == "All Quarters" else fiscal.quarter_label(quarter)
+        )
     
     with col6:
-        # Year filter
-        years = sorted(df['Date'].dt.year.unique())
-        selected_year = st.selectbox("📆 Year", ["All Years"] + [str(year) for year in years])
+        # Fiscal year filter
+        selected_year = st.selectbox(
+            "📆 Year", ["All Years"] + dataset.options('Fiscal_Year'),
+            format_func=lambda year: year if year == "All Years" else fiscal.year_label(year)
+        )
     
     with col7:
         # Probability filter
@@ -494,73 +346,46 @@ def show_sales_team_view(st):
     
     with col8:
         # Status filter
-        statuses = sorted(df['Status'].unique())
+        statuses = dataset.options(dataset.status_column)
         selected_status = st.selectbox("🎯 Status", ["All Status"] + list(statuses))
     
     with col9:
         # Focus filter
-        focus_options = ["All Focus", "New Business", "Existing Business"]
+        focus_options = ["All Focus"] + dataset.options('KritiKal Focus Areas')
         selected_focus = st.selectbox("🎯 Focus", focus_options)
     
     # Apply filters
-    filtered_df = df.copy()
-    
-    # Apply Sales Owner filter
+    spec = filter_spec.FilterSpec()
     if selected_team != "All Team Members":
-        filtered_df = filtered_df[filtered_df['Sales Team Member'] == selected_team]
-    
-    # Apply Practice filter
+        spec.equals('Sales Owner', selected_team)
     if selected_practice != "All Practices":
-        filtered_df = filtered_df[filtered_df['Practice'] == selected_practice]
-    
-    # Apply Month filter
+        spec.equals('Practice', selected_practice)
     if selected_month != "All Months":
-        month_map = {
-            "January": 1, "February": 2, "March": 3, "April": 4,
-            "May": 5, "June": 6, "July": 7, "August": 8,
-            "September": 9, "October": 10, "November": 11, "December": 12
-        }
-        filtered_df = filtered_df[filtered_df['Date'].dt.month == month_map[selected_month]]
-    
-    # Apply Quarter filter
+        spec.equals('Fiscal_Month', fiscal.month_index(selected_month))
     if selected_quarter != "All Quarters":
-        quarter_map = {"Q1": [1, 2, 3], "Q2": [4, 5, 6], 
-                      "Q3": [7, 8, 9], "Q4": [10, 11, 12]}
-        if selected_quarter in quarter_map:
-            filtered_df = filtered_df[filtered_df['Date'].dt.month.isin(quarter_map[selected_quarter])]
-    
-    # Apply Year filter
+        spec.fiscal_quarter(selected_quarter)
     if selected_year != "All Years":
-        filtered_df = filtered_df[filtered_df['Date'].dt.year == int(selected_year)]
-    
-    # Apply Probability filter
+        spec.fiscal_year(selected_year)
     if selected_probability != "All Probability":
-        filtered_df = filtered_df[filtered_df['Probability'] == selected_probability]
-    
-    # Apply Status filter
+        spec.equals('Probability', selected_probability)
     if selected_status != "All Status":
-        filtered_df = filtered_df[filtered_df['Status'] == selected_status]
-    
-    # Apply Focus filter
+        spec.equals(dataset.status_column, selected_status)
     if selected_focus != "All Focus":
-        filtered_df = filtered_df[filtered_df['Focus'] == selected_focus]
-    
-    # Apply Search filter
-    if search_term:
-        mask = filtered_df.astype(str).apply(lambda x: x.str.contains(search_term, case=False)).any(axis=1)
-        filtered_df = filtered_df[mask]
+        spec.equals('KritiKal Focus Areas', selected_focus)
+    spec.search(search_term)
+    filtered_df = spec.apply(df, dataset.catalog(name))
     
     if len(filtered_df) > 0:
         # Display team metrics in a single view
         st.subheader("Team Performance Metrics")
         
         # Calculate team metrics
-        team_metrics = filtered_df.groupby('Sales Team Member').agg({
-            'Deal Value': ['sum', 'count'],
-            'Status': lambda x: (x == 'Closed Won').sum()
+        team_metrics = filtered_df.groupby('Sales Owner').agg({
+            'Amount': ['sum', 'count'],
+            'Is_Won': 'sum'
         }).reset_index()
         
-        team_metrics.columns = ['Sales Team Member', 'Total Pipeline', 'Total Deals', 'Closed Won']
+        team_metrics.columns = ['Sales Owner', 'Total Pipeline', 'Total Deals', 'Closed Won']
         team_metrics['Win Rate'] = (team_metrics['Closed Won'] / team_metrics['Total Deals'] * 100).round(1)
         team_metrics['Average Deal Size'] = (team_metrics['Total Pipeline'] / team_metrics['Total Deals']).round(2)
         
@@ -573,31 +398,32 @@ def show_sales_team_view(st):
         
         # Team performance visualization
         st.subheader("Team Performance Visualization")
-        fig = px.bar(team_metrics, x='Sales Team Member', y=['Total Pipeline', 'Closed Won'],
+        fig = px.bar(team_metrics, x='Sales Owner', y=['Total Pipeline', 'Closed Won'],
                      title='Pipeline vs Closed Won by Team Member', barmode='group')
         st.plotly_chart(fig)
         
         # Detailed Opportunities
         st.subheader("Detailed Opportunities")
-        display_df = filtered_df[['Organization Name', 'Opportunity Name', 'Geography', 
-                                'Date', 'Probability', 'Deal Value', 
-                                'Sales Team Member', 'Technical Lead', 'Business Owner', 
-                                'Type', 'Focus']].copy()
+        detail_columns = ['Organization Name', 'Opportunity Name', 'Geography',
+                          'Expected Close Date', 'Probability', 'Amount',
+                          'Sales Owner', 'Pre-sales Technical Lead', 'Business Owner',
+                          'Type', 'KritiKal Focus Areas']
+        display_df = filtered_df[[c for c in detail_columns if c in filtered_df.columns]].copy()
         
         display_df = display_df.rename(columns={
-            'Deal Value': 'Amount (In Lacs)',
-            'Technical Lead': 'Tech Owner',
-            'Type': 'Hunting /farming'
+            'Amount': 'Amount (In Lacs)',
+            'Expected Close Date': 'Date',
+            'Pre-sales Technical Lead': 'Tech Owner',
+            'Type': 'Hunting /farming',
+            'KritiKal Focus Areas': 'Focus'
         })
         
-        display_df['Amount (In Lacs)'] = display_df['Amount (In Lacs)'].apply(lambda x: int(x/100000) if pd.notnull(x) else 0)
-        display_df['Probability'] = display_df['Probability'].apply(lambda x: f"{x}%")
-        display_df['Weighted Revenue (In Lacs)'] = display_df.apply(
-            lambda row: int((row['Amount (In Lacs)']) * float(str(row['Probability']).rstrip('%'))/100) if pd.notnull(row['Amount (In Lacs)']) else 0, 
-            axis=1
-        )
-        
-        display_df['Date'] = pd.to_datetime(display_df['Date']).dt.strftime('%d-%b-%Y')
+        # Whole lakhs and whole percentages, from the columns parsed at ingest
+        display_df['Amount (In Lacs)'] = (display_df['Amount (In Lacs)'] / 100000).fillna(0).astype(int)
+        display_df['Probability'] = np.trunc(filtered_df['Probability_Num']).astype(int)
+        display_df['Weighted Revenue (In Lacs)'] = (
+            display_df['Amount (In Lacs)'] * display_df['Probability'] / 100
+        ).astype(int)
         display_df = display_df.sort_values('Amount (In Lacs)', ascending=False)
         
         display_df.index = range(1, len(display_df) + 1)
@@ -616,12 +442,14 @@ def show_sales_team_view(st):
                     format="₹%d L",
                     help="Weighted Revenue in Lakhs"
                 ),
-                'Probability': st.column_config.TextColumn(
+                'Probability': st.column_config.NumberColumn(
                     'Probability',
+                    format="%d%%",
                     help="Probability of winning the deal"
                 ),
-                'Date': st.column_config.TextColumn(
+                'Date': st.column_config.DateColumn(
                     'Date',
+                    format="DD-MMM-YYYY",
                     help="Expected closing date"
                 )
             }
@@ -630,16 +458,16 @@ def show_sales_team_view(st):
         # Practice distribution
         if len(filtered_df['Practice'].unique()) > 0:
             st.subheader("Practice Distribution")
-            practice_dist = filtered_df.groupby(['Sales Team Member', 'Practice'])['Deal Value'].sum().reset_index()
-            fig2 = px.bar(practice_dist, x='Sales Team Member', y='Deal Value',
+            practice_dist = filtered_df.groupby(['Sales Owner', 'Practice'])['Amount'].sum().reset_index()
+            fig2 = px.bar(practice_dist, x='Sales Owner', y='Amount',
                          color='Practice', title='Practice Distribution by Team Member')
             st.plotly_chart(fig2)
         
         # Practice metrics
         st.subheader("Practice Performance")
         practice_metrics = filtered_df.groupby('Practice').agg({
-            'Deal Value': ['sum', 'count'],
-            'Status': lambda x: (x == 'Closed Won').sum()
+            'Amount': ['sum', 'count'],
+            'Is_Won': 'sum'
         }).reset_index()
         
         practice_metrics.columns = ['Practice', 'Total Pipeline', 'Total Deals', 'Closed Won']
@@ -663,9 +491,11 @@ def show_sales_team_view(st):
         
         # Practice trend
         st.subheader("Practice Pipeline Trend")
-        practice_trend = filtered_df.groupby(['Practice', filtered_df['Date'].dt.to_period('M')])['Deal Value'].sum().reset_index()
-        practice_trend['Date'] = practice_trend['Date'].astype(str)
-        fig4 = px.line(practice_trend, x='Date', y='Deal Value',
+        practice_trend = filtered_df.groupby(
+            ['Practice', filtered_df['Expected Close Date'].dt.to_period('M')]
+        )['Amount'].sum().reset_index()
+        practice_trend['Expected Close Date'] = practice_trend['Expected Close Date'].astype(str)
+        fig4 = px.line(practice_trend, x='Expected Close Date', y='Amount',
                        color='Practice', title='Practice-wise Pipeline Trend')
         st.plotly_chart(fig4)
     else:
@@ -673,7 +503,8 @@ def show_sales_team_view(st):
 
 def show_detailed_data_view(st):
     """Display the detailed data view with search and filtering options"""
-    if 'df_current' not in st.session_state or 'df_previous' not in st.session_state:
+    dataset = row_security.session_dataset()
+    if dataset is None:
         st.warning("Please upload data first.")
         return
 
@@ -683,10 +514,10 @@ def show_detailed_data_view(st):
         horizontal=True
     )
 
-    df = st.session_state.df_current if dataset_choice == "Current Week" else st.session_state.df_previous
+    name = 'current' if dataset_choice == "Current Week" else 'previous'
     
-    # Ensure Date column is datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    # Dates were parsed at load time; show the sheet columns without the derived fields
+    df = dataset.source(name)
     
     # Search and filters
     st.sidebar.header("Search & Filters")
@@ -695,66 +526,36 @@ def show_detailed_data_view(st):
     search_term = st.sidebar.text_input("🔍 Search in all columns")
     
     # Practice filter
-    practices = sorted(df['Practice'].unique())
+    practices = dataset.options('Practice')
     selected_practices = st.sidebar.multiselect("🏢 Select Practices", practices)
     
     # Financial Year and Month filter
     st.sidebar.subheader("📅 Financial Year & Month")
     
-    # Get unique years from the data
-    years = sorted(df['Date'].dt.year.unique())
-    
-    # Create financial year options (e.g., 2023-24)
-    financial_years = [f"{year}-{str(year+1)[-2:]}" for year in years]
-    selected_fy = st.sidebar.selectbox("Select Financial Year", ["All Years"] + financial_years)
+    # Financial years present in the data (e.g. FY 2023-24)
+    selected_fy = st.sidebar.selectbox(
+        "Select Financial Year", ["All Years"] + dataset.options('Fiscal_Year'),
+        format_func=lambda year: year if year == "All Years" else fiscal.year_label(year)
+    )
     
     # Month filter
-    months = [
-        "April", "May", "June", "July", "August", "September",
-        "October", "November", "December", "January", "February", "March"
-    ]
-    selected_months = st.sidebar.multiselect("Select Months", months)
+    selected_months = st.sidebar.multiselect("Select Months", fiscal.MONTHS)
     
     # Status filter
-    statuses = sorted(df['Status'].unique())
+    statuses = dataset.options(dataset.status_column)
     selected_statuses = st.sidebar.multiselect("🎯 Select Status", statuses)
     
-    # Apply filters
-    filtered_df = df.copy()
-    
-    # Apply search filter
-    if search_term:
-        mask = filtered_df.astype(str).apply(lambda x: x.str.contains(search_term, case=False)).any(axis=1)
-        filtered_df = filtered_df[mask]
-    
-    # Apply practice filter
+    # Apply filters on the processed frame, then take the matching sheet rows
+    spec = filter_spec.FilterSpec().search(search_term, list(df.columns))
     if selected_practices:
-        filtered_df = filtered_df[filtered_df['Practice'].isin(selected_practices)]
-    
-    # Apply financial year filter
+        spec.isin('Practice', selected_practices)
     if selected_fy != "All Years":
-        start_year = int(selected_fy.split('-')[0])
-        # For financial year April-March
-        start_date = pd.Timestamp(f"{start_year}-04-01")
-        end_date = pd.Timestamp(f"{start_year + 1}-03-31")
-        filtered_df = filtered_df[
-            (filtered_df['Date'] >= start_date) & 
-            (filtered_df['Date'] <= end_date)
-        ]
-    
-    # Apply month filter
+        spec.fiscal_year(selected_fy)
     if selected_months:
-        month_map = {
-            "January": 1, "February": 2, "March": 3, "April": 4,
-            "May": 5, "June": 6, "July": 7, "August": 8,
-            "September": 9, "October": 10, "November": 11, "December": 12
-        }
-        month_numbers = [month_map[month] for month in selected_months]
-        filtered_df = filtered_df[filtered_df['Date'].dt.month.isin(month_numbers)]
-    
-    # Apply status filter
+        spec.isin('Fiscal_Month', [fiscal.month_index(month) for month in selected_months])
     if selected_statuses:
-        filtered_df = filtered_df[filtered_df['Status'].isin(selected_statuses)]
+        spec.isin(dataset.status_column, selected_statuses)
+    filtered_df = df.take(spec.positions(dataset.frames[name], dataset.catalog(name)))
     
     # Display filtered data count
     total_records = len(filtered_df)
@@ -763,8 +564,8 @@ def show_detailed_data_view(st):
     if total_records > 0:
         # Display detailed data
         st.dataframe(filtered_df.style.format({
-            'Deal Value': '${:,.2f}',
-            'Date': lambda x: x.strftime('%Y-%m-%d')
+            'Amount': '${:,.2f}',
+            'Expected Close Date': lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else ''
         }))
         
         # Export options
@@ -816,12 +617,16 @@ def main():
         # Logout button
         if st.sidebar.button("Logout"):
             st.session_state.authenticated = False
+            st.session_state.username = None
             st.session_state.current_view = 'login'
             st.rerun()
         
         # Display selected view
+        dataset = row_security.session_dataset()
         if st.session_state.current_view == 'data_input':
             show_data_input_view(st)
+        elif dataset is not None and not row_security.has_rows(dataset):
+            st.info("None of the deals in this upload are visible to your account.")
         elif st.session_state.current_view == 'overview':
             show_overview_view(st)
         elif st.session_state.current_view == 'sales_team':